@@ -12,13 +12,18 @@ from .builder import (
     dict_from_ref,
     fill_refs,
 )
+from .codecs import register_codec
+from .dedup import DeduplicationStore
 from .events import Event
 from .events.handler import EventsHandler
 from .exceptions import (
     ChannelOperationNotFoundError,
     GCloudPubSubConsumerDisconnectError,
+    GCloudPubSubInvalidConsumerModeError,
     GCloudPubSubPublishTimeoutError,
+    GCloudPubSubReservedAttributeError,
     InvalidChannelError,
+    KafkaInvalidCommitModeError,
     OperationIdNotFoundError,
     ReferenceNotFoundError,
     UrlOrModuleRequiredError,
@@ -69,4 +74,9 @@ __all__ = [
     'Event',
     'GCloudPubSubPublishTimeoutError',
     'GCloudPubSubConsumerDisconnectError',
+    'GCloudPubSubInvalidConsumerModeError',
+    'GCloudPubSubReservedAttributeError',
+    'KafkaInvalidCommitModeError',
+    'DeduplicationStore',
+    'register_codec',
 ]
@@ -1,6 +1,7 @@
 import asynctest
 import orjson
 import pytest
+from broadcaster._base import Unsubscribed
 
 import asyncapi.builder
 
@@ -93,6 +94,8 @@ def fake_events_handler(
     events_handler.publish = asynctest.CoroutineMock()
     events_handler.connect = asynctest.CoroutineMock()
     events_handler.disconnect = asynctest.CoroutineMock()
+    events_handler.partition_lanes = False
+    events_handler.direct_dispatch = False
     events_handler.subscribe.return_value = async_iterator(
         [mocker.MagicMock(message=json_message)]
     )
@@ -137,6 +140,15 @@ class AsyncIterator:
         except StopIteration:
             raise StopAsyncIteration
 
+    async def get(self):
+        try:
+            return next(self.iter)
+        except StopIteration:
+            raise Unsubscribed
+
+    async def get_many(self, max_size):
+        return [await self.get()]
+
     async def __aenter__(self):
         return self
 
@@ -1,7 +1,19 @@
+import asyncio
+import concurrent.futures
+import copy
+import gzip
+import threading
+from types import SimpleNamespace
+from typing import Any, List
+
 import asynctest
+import orjson
 import pytest
+from aiokafka import TopicPartition
 
 import asyncapi.exceptions
+from asyncapi.events.backends.kafka import KafkaBackend
+from asyncapi.executors import process_operation
 
 
 @pytest.fixture
@@ -79,7 +91,7 @@ async def test_should_publish_message(
     await fake_api.publish('fake', fake_publish_message)
 
     assert fake_events_handler.publish.call_args_list == [
-        mocker.call(channel='fake', message=json_message.decode())
+        mocker.call(channel='fake', message=json_message)
     ]
 
 
@@ -129,13 +141,13 @@ async def test_should_not_listen_for_invalid_message(
     fake_operation = asynctest.CoroutineMock()
     fake_api.operations[('fake', 'fake_operation')] = fake_operation
     fake_events_handler.subscribe.return_value = async_iterator(
-        [mocker.MagicMock(message=json_invalid_message)]
+        [mocker.MagicMock(message=json_invalid_message, context={})]
     )
 
     await fake_api.listen('fake')
 
     assert fake_api.logger.exception.call_args_list == [
-        mocker.call(f'message={json_invalid_message}')
+        mocker.call(f'message={json_invalid_message.decode()}')
     ]
     assert not fake_operation.called
 
@@ -168,3 +180,922 @@ async def test_should_not_listen_for_operation_id_error(
         await fake_api_no_operation_id.listen('fake')
 
     assert exc_info.value.args == ('fake',)
+
+
+@pytest.mark.asyncio
+async def test_should_listen_messages_concurrently(
+    fake_api, fake_events_handler, mocker, async_iterator, json_message
+):
+    running = []
+    max_running = []
+
+    async def fake_operation(message):
+        running.append(message)
+        max_running.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(message)
+
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    fake_api.operations_concurrency = 3
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [mocker.MagicMock(message=json_message) for _ in range(5)]
+    )
+
+    await fake_api.listen('fake')
+
+    assert len(max_running) == 5
+    assert max(max_running) == 3
+    assert not running
+
+
+def test_should_build_api_with_channels_concurrency():
+    api = asyncapi.build_api('fake', channels_concurrency='fake=4')
+
+    assert api.channel_concurrency('fake') == 4
+
+
+@pytest.mark.parametrize(
+    'channels_concurrency', ['fake', 'fake=x', 'fake=4;other']
+)
+def test_should_not_build_api_with_invalid_channels_concurrency(
+    channels_concurrency,
+):
+    with pytest.raises(
+        asyncapi.exceptions.InvalidChannelsConcurrencyError
+    ) as error:
+        asyncapi.build_api('fake', channels_concurrency=channels_concurrency)
+
+    assert error.value.args == (channels_concurrency.split(';')[-1],)
+
+
+def test_should_build_api_with_concurrency_server_binding():
+    api = asyncapi.build_api(
+        'fake', server_bindings='kafka:operations_concurrency=5'
+    )
+
+    assert api.channel_concurrency('fake') == 5
+
+
+def test_should_build_api_with_concurrency_extension(spec_dict):
+    spec_dict['channels']['fake']['subscribe']['x-concurrency'] = 2
+    api = asyncapi.build_api('fake')
+
+    assert api.channel_concurrency('fake') == 2
+
+
+@pytest.mark.asyncio
+async def test_should_listen_messages_batches(
+    spec_dict, fake_events_handler, mocker, async_iterator, json_message
+):
+    spec_dict['channels']['fake']['subscribe']['x-batch-size'] = 2
+    fake_api = asyncapi.build_api('fake', module_name='asyncapi._tests')
+    fake_message = fake_api.spec.channels['fake'].subscribe.message.payload(1)
+    fake_operation = asynctest.CoroutineMock()
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [mocker.MagicMock(message=json_message) for _ in range(3)]
+    )
+
+    await fake_api.listen('fake')
+
+    assert fake_operation.call_args_list == [
+        mocker.call([fake_message, fake_message]),
+        mocker.call([fake_message]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_should_listen_messages_batches_for_list_operation(
+    fake_api, fake_events_handler, mocker, async_iterator, json_message
+):
+    received = []
+    acks = [asynctest.CoroutineMock() for _ in range(3)]
+
+    async def fake_operation(message: List[Any], ack_func: Any) -> None:
+        received.append(message)
+        await ack_func()
+
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [
+            mocker.MagicMock(message=json_message, context={'ack_func': ack})
+            for ack in acks
+        ]
+    )
+
+    await fake_api.listen('fake')
+
+    assert len(received) == 1
+    assert len(received[0]) == 3
+    assert all(ack.called for ack in acks)
+
+
+@pytest.mark.asyncio
+async def test_should_build_dispatchers_on_connect(
+    fake_api, fake_events_handler
+):
+    await fake_api.connect()
+
+    dispatcher = fake_api.dispatchers['fake']
+
+    assert fake_events_handler.connect.called
+    assert dispatcher.operation is fake_api.operations[
+        ('fake', 'fake_operation')
+    ]
+    assert dispatcher.error_channel == 'fake'
+    assert dispatcher.decoder(b'{"faked":1}').faked == 1
+
+    with pytest.raises(TypeError):
+        fake_api.dispatchers['fake'] = dispatcher
+
+
+@pytest.mark.asyncio
+async def test_should_listen_memoryview_message(
+    fake_api, fake_events_handler, mocker, async_iterator, json_message
+):
+    fake_operation = asynctest.CoroutineMock()
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [mocker.MagicMock(message=memoryview(json_message))]
+    )
+
+    await fake_api.listen('fake')
+
+    assert fake_operation.call_args_list[0][0][0].faked == 1
+
+
+@pytest.mark.asyncio
+async def test_should_listen_keyed_messages_in_order(
+    spec_dict, fake_events_handler, mocker, async_iterator
+):
+    spec_dict['channels']['fake']['subscribe']['x-ordering-key'] = 'faked'
+    spec_dict['channels']['fake']['subscribe']['x-concurrency'] = 2
+    spec_dict['components']['schemas']['FakePayload']['properties'][
+        'seq'
+    ] = {'type': 'integer'}
+    fake_api = asyncapi.build_api('fake', module_name='asyncapi._tests')
+    processed = []
+
+    async def fake_operation(message):
+        await asyncio.sleep(0.001 * (5 - message.seq))
+        processed.append((message.faked, message.seq))
+
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [
+            mocker.MagicMock(
+                message=orjson.dumps({'faked': seq % 2, 'seq': seq})
+            )
+            for seq in range(6)
+        ]
+    )
+
+    await fake_api.listen('fake')
+
+    assert [seq for key, seq in processed if key == 0] == [0, 2, 4]
+    assert [seq for key, seq in processed if key == 1] == [1, 3, 5]
+    assert fake_api.lanes_stats('fake') is None
+
+
+@pytest.mark.asyncio
+async def test_should_listen_keyed_messages_by_header(
+    spec_dict, fake_events_handler, async_iterator, json_message
+):
+    spec_dict['channels']['fake']['subscribe']['x-ordering-header'] = 'user'
+    fake_api = asyncapi.build_api('fake', module_name='asyncapi._tests')
+    fake_operation = asynctest.CoroutineMock()
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [
+            asyncapi.Event('fake', json_message, headers={'user': 'user-1'}),
+            asyncapi.Event('fake', json_message, headers={'user': 'user-2'}),
+        ]
+    )
+
+    await fake_api.listen('fake')
+
+    assert fake_operation.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_should_listen_partitions_in_lanes(
+    fake_api, fake_events_handler, async_iterator, json_message
+):
+    fake_events_handler.partition_lanes = True
+    processed = []
+
+    async def fake_operation(message):
+        processed.append(message.faked)
+
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [
+            asyncapi.Event('fake', json_message, partition=partition)
+            for partition in (0, 1, 0)
+        ]
+    )
+
+    await fake_api.listen('fake')
+
+    assert processed == [1, 1, 1]
+    assert fake_events_handler.add_revoke_callback.call_count == 1
+    assert (
+        fake_events_handler.remove_revoke_callback.call_args
+        == fake_events_handler.add_revoke_callback.call_args
+    )
+    assert (
+        fake_events_handler.remove_assign_callback.call_args
+        == fake_events_handler.add_assign_callback.call_args
+    )
+    assert fake_api.lanes_stats('fake') is None
+
+
+@pytest.mark.asyncio
+async def test_should_listen_messages_in_thread_pool(
+    spec_dict, fake_events_handler, mocker, async_iterator, json_message
+):
+    spec_dict['channels']['fake']['subscribe']['x-execution-mode'] = 'thread'
+    fake_api = asyncapi.build_api('fake', module_name='asyncapi._tests')
+    ack_func = asynctest.CoroutineMock()
+    threads = []
+
+    def fake_operation(message):
+        threads.append(threading.current_thread())
+        assert not ack_func.called
+
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [
+            mocker.MagicMock(
+                message=json_message, context={'ack_func': ack_func}
+            )
+        ]
+    )
+
+    await fake_api.listen('fake')
+    await fake_api.disconnect()
+
+    assert threads
+    assert threads[0] is not threading.main_thread()
+    assert ack_func.called
+    assert not fake_api.executors
+
+
+@pytest.mark.asyncio
+async def test_should_listen_messages_in_process_pool(
+    spec_dict, fake_events_handler, async_iterator, json_message
+):
+    spec_dict['channels']['fake']['subscribe']['x-execution-mode'] = 'process'
+    fake_api = asyncapi.build_api(
+        'fake',
+        module_name='asyncapi._tests',
+        server_bindings='kafka:process_pool_max_workers=1',
+    )
+    fake_api.logger = asynctest.MagicMock()
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [asyncapi.Event('fake', json_message)]
+    )
+
+    await fake_api.listen('fake')
+
+    assert isinstance(
+        fake_api.executors['process'], concurrent.futures.ProcessPoolExecutor
+    )
+    assert not fake_api.logger.exception.called
+
+    await fake_api.disconnect()
+
+
+def test_should_decode_process_pool_message_with_spec_payload_type():
+    payloads = []
+
+    def fake_operation(message: bytes) -> None:
+        payloads.append(message)
+
+    process_operation(
+        fake_operation,
+        b'{"faked":1}',
+        {},
+        payload_spec=(
+            'FakeProcessPayload',
+            {'type': 'object', 'properties': {'faked': {'type': 'integer'}}},
+            'compiled',
+        ),
+    )
+
+    assert type(payloads[0]).__name__ == 'FakeProcessPayload'
+    assert payloads[0].faked == 1
+
+
+@pytest.mark.asyncio
+async def test_should_not_retry_undecodable_message_in_process_pool(
+    spec_dict, fake_events_handler, async_iterator, json_invalid_message
+):
+    subscribe = spec_dict['channels']['fake']['subscribe']
+    subscribe['x-execution-mode'] = 'process'
+    subscribe['x-retry-max-attempts'] = 3
+    subscribe['x-dead-letter-channel'] = 'dlq'
+    fake_api = asyncapi.build_api(
+        'fake',
+        module_name='asyncapi._tests',
+        server_bindings='kafka:process_pool_max_workers=1',
+    )
+    fake_api.logger = asynctest.MagicMock()
+    ack_func = asynctest.CoroutineMock()
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [
+            asyncapi.Event(
+                'fake', json_invalid_message, context={'ack_func': ack_func}
+            )
+        ]
+    )
+
+    await fake_api.listen('fake')
+    await fake_api.disconnect()
+
+    assert fake_api.logger.exception.call_count == 1
+    assert ack_func.call_count == 1
+    assert not fake_events_handler.publish.called
+    assert fake_api.retry_scheduler is None
+
+
+def test_should_not_build_dispatcher_for_invalid_execution_mode(spec_dict):
+    spec_dict['channels']['fake']['subscribe']['x-execution-mode'] = 'fake'
+    fake_api = asyncapi.build_api('fake', module_name='asyncapi._tests')
+
+    with pytest.raises(asyncapi.exceptions.InvalidExecutionModeError):
+        fake_api.build_dispatcher('fake')
+
+
+@pytest.mark.asyncio
+async def test_should_retry_failed_message_with_backoff(
+    spec_dict, fake_events_handler, mocker, async_iterator, json_message
+):
+    spec_dict['channels']['fake']['subscribe']['x-retry-max-attempts'] = 3
+    spec_dict['channels']['fake']['subscribe']['x-retry-backoff-ms'] = 1
+    fake_api = asyncapi.build_api('fake', module_name='asyncapi._tests')
+    fake_api.logger = mocker.MagicMock()
+    fake_operation = asynctest.CoroutineMock(
+        side_effect=[Exception(), Exception(), None]
+    )
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [mocker.MagicMock(message=json_message)]
+    )
+
+    await fake_api.listen('fake')
+    await asyncio.sleep(0.05)
+    await fake_api.disconnect()
+
+    assert fake_operation.call_count == 3
+    assert not fake_events_handler.publish.called
+
+
+@pytest.mark.asyncio
+async def test_should_dead_letter_message_after_max_attempts(
+    spec_dict, fake_events_handler, mocker, async_iterator, json_message
+):
+    spec_dict['channels']['fake']['subscribe']['x-dead-letter-channel'] = 'dlq'
+    fake_api = asyncapi.build_api(
+        'fake',
+        module_name='asyncapi._tests',
+        server_bindings='kafka:retry_max_attempts=2;retry_backoff_ms=1',
+    )
+    fake_api.logger = mocker.MagicMock()
+    fake_operation = asynctest.CoroutineMock(side_effect=Exception())
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    ack_func = asynctest.CoroutineMock()
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [asyncapi.Event('fake', json_message, context={'ack_func': ack_func})]
+    )
+
+    await fake_api.listen('fake')
+    await asyncio.sleep(0.05)
+    await fake_api.disconnect()
+
+    assert fake_operation.call_count == 2
+    assert fake_events_handler.publish.call_args_list == [
+        mocker.call(
+            channel='dlq',
+            message=json_message,
+            headers={'retry-attempt': '2'},
+        )
+    ]
+    assert ack_func.called
+
+
+@pytest.mark.asyncio
+async def test_should_dead_letter_pending_retries_on_disconnect(
+    spec_dict, fake_events_handler, mocker, async_iterator, json_message
+):
+    subscribe = spec_dict['channels']['fake']['subscribe']
+    subscribe['x-dead-letter-channel'] = 'dlq'
+    subscribe['x-concurrency'] = 2
+    subscribe['x-retry-max-attempts'] = 3
+    fake_api = asyncapi.build_api('fake', module_name='asyncapi._tests')
+    mocker.patch('random.uniform', return_value=100)
+    fake_api.logger = mocker.MagicMock()
+    fake_operation = asynctest.CoroutineMock(side_effect=Exception())
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [asyncapi.Event('fake', json_message)]
+    )
+
+    await fake_api.listen('fake')
+    await fake_api.disconnect()
+
+    assert fake_operation.call_count == 1
+    assert fake_events_handler.publish.call_args_list == [
+        mocker.call(
+            channel='dlq',
+            message=json_message,
+            headers={'retry-attempt': '1'},
+        )
+    ]
+
+
+@pytest.mark.asyncio
+async def test_should_retry_ordered_messages_in_place(
+    spec_dict, fake_events_handler, mocker, async_iterator
+):
+    subscribe = spec_dict['channels']['fake']['subscribe']
+    subscribe['x-ordering-key'] = 'faked'
+    subscribe['x-retry-max-attempts'] = 2
+    subscribe['x-retry-backoff-ms'] = 1
+    fake_api = asyncapi.build_api('fake', module_name='asyncapi._tests')
+    fake_api.logger = mocker.MagicMock()
+    processed = []
+
+    async def fake_operation(payload):
+        processed.append(payload.faked)
+
+        if len(processed) == 1:
+            raise Exception()
+
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [
+            asyncapi.Event('fake', b'{"faked":1}'),
+            asyncapi.Event('fake', b'{"faked":2}'),
+        ]
+    )
+
+    await fake_api.listen('fake')
+
+    assert processed == [1, 1, 2]
+    assert fake_api.retry_scheduler is None
+
+
+@pytest.mark.asyncio
+async def test_should_drop_republished_message_after_max_attempts(
+    spec_dict, fake_events_handler, mocker, async_iterator, json_message
+):
+    spec_dict['channels']['fake']['subscribe']['x-retry-max-attempts'] = 3
+    fake_api = asyncapi.build_api('fake', module_name='asyncapi._tests')
+    fake_api.republish_error_messages = True
+    fake_api.logger = mocker.MagicMock()
+    fake_operation = asynctest.CoroutineMock(side_effect=Exception())
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    ack_func = asynctest.CoroutineMock()
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [
+            asyncapi.Event(
+                'fake',
+                json_message,
+                context={'ack_func': ack_func},
+                headers={'retry-attempt': '3'},
+            )
+        ]
+    )
+
+    await fake_api.listen('fake')
+
+    assert not fake_operation.called
+    assert not fake_events_handler.publish.called
+    assert ack_func.called
+
+
+@pytest.mark.asyncio
+async def test_should_continue_attempts_of_republished_message(
+    spec_dict, fake_events_handler, mocker, async_iterator, json_message
+):
+    subscribe = spec_dict['channels']['fake']['subscribe']
+    subscribe['x-dead-letter-channel'] = 'dlq'
+    subscribe['x-retry-max-attempts'] = 3
+    subscribe['x-retry-backoff-ms'] = 1
+    fake_api = asyncapi.build_api('fake', module_name='asyncapi._tests')
+    fake_api.logger = mocker.MagicMock()
+    fake_operation = asynctest.CoroutineMock(side_effect=Exception())
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [
+            asyncapi.Event(
+                'fake', json_message, headers={'retry-attempt': '2'}
+            )
+        ]
+    )
+
+    await fake_api.listen('fake')
+
+    assert fake_operation.call_count == 1
+    assert fake_events_handler.publish.call_args_list == [
+        mocker.call(
+            channel='dlq',
+            message=json_message,
+            headers={'retry-attempt': '3'},
+        )
+    ]
+
+
+@pytest.mark.asyncio
+async def test_should_skip_duplicated_messages_by_id(
+    spec_dict, fake_events_handler, async_iterator, json_message
+):
+    spec_dict['channels']['fake']['subscribe']['x-deduplication'] = True
+    fake_api = asyncapi.build_api('fake', module_name='asyncapi._tests')
+    fake_operation = asynctest.CoroutineMock()
+    ack_func = asynctest.CoroutineMock()
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [
+            asyncapi.Event('fake', json_message, id='1'),
+            asyncapi.Event(
+                'fake', json_message, context={'ack_func': ack_func}, id='1'
+            ),
+            asyncapi.Event('fake', json_message, id='2'),
+        ]
+    )
+
+    await fake_api.listen('fake')
+
+    stats = fake_api.deduplication_stats()
+
+    assert fake_operation.call_count == 2
+    assert ack_func.called
+    assert (stats.hits, stats.misses) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_should_skip_duplicated_messages_by_payload_field(
+    spec_dict, fake_events_handler, async_iterator, json_message
+):
+    spec_dict['channels']['fake']['subscribe']['x-deduplication-key'] = 'faked'
+    fake_api = asyncapi.build_api('fake', module_name='asyncapi._tests')
+    fake_operation = asynctest.CoroutineMock()
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [
+            asyncapi.Event('fake', json_message, id='1'),
+            asyncapi.Event('fake', json_message, id='2'),
+        ]
+    )
+
+    await fake_api.listen('fake')
+
+    assert fake_operation.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_should_listen_message_with_compiled_payload_engine(
+    spec_dict, fake_events_handler, async_iterator, json_message
+):
+    spec_dict['x-payload-engine'] = 'compiled'
+    fake_api = asyncapi.build_api('fake', module_name='asyncapi._tests')
+    fake_operation = asynctest.CoroutineMock()
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [asyncapi.Event('fake', json_message)]
+    )
+
+    await fake_api.listen('fake')
+
+    payload = fake_operation.call_args_list[0][0][0]
+
+    assert payload.faked == 1
+    assert payload.__slots__ == ('faked',)
+
+
+def test_should_not_build_api_for_invalid_payload_engine():
+    with pytest.raises(asyncapi.exceptions.InvalidPayloadEngineError):
+        asyncapi.build_api('fake', payload_engine='fake')
+
+
+@pytest.mark.asyncio
+async def test_should_listen_and_publish_msgpack_messages(
+    spec_dict, fake_events_handler, mocker, async_iterator
+):
+    msgpack = pytest.importorskip('msgpack')
+    spec_dict['defaultContentType'] = 'application/msgpack'
+    spec_dict['components']['messages']['FakeMessage'].pop('contentType')
+    fake_api = asyncapi.build_api('fake', module_name='asyncapi._tests')
+    fake_operation = asynctest.CoroutineMock()
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [asyncapi.Event('fake', msgpack.packb({'faked': 1}))]
+    )
+
+    await fake_api.listen('fake')
+    await fake_api.publish('fake', {'faked': 1})
+
+    assert fake_operation.call_args_list[0][0][0].faked == 1
+    assert fake_events_handler.publish.call_args_list == [
+        mocker.call(channel='fake', message=msgpack.packb({'faked': 1}))
+    ]
+
+
+@pytest.mark.asyncio
+async def test_should_ack_malformed_msgpack_message_without_retry(
+    spec_dict, fake_events_handler, async_iterator
+):
+    pytest.importorskip('msgpack')
+    spec_dict['defaultContentType'] = 'application/msgpack'
+    spec_dict['components']['messages']['FakeMessage'].pop('contentType')
+    spec_dict['channels']['fake']['subscribe']['x-retry-max-attempts'] = 3
+    fake_api = asyncapi.build_api(
+        'fake', module_name='asyncapi._tests', republish_errors=True
+    )
+    fake_api.logger = asynctest.MagicMock()
+    fake_operation = asynctest.CoroutineMock()
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    ack_func = asynctest.CoroutineMock()
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [asyncapi.Event('fake', b'\xc1', context={'ack_func': ack_func})]
+    )
+
+    await fake_api.listen('fake')
+
+    assert not fake_operation.called
+    assert not fake_events_handler.publish.called
+    assert ack_func.call_count == 1
+    assert fake_api.retry_scheduler is None
+
+
+def test_should_not_build_api_for_invalid_content_type(spec_dict):
+    spec_dict['defaultContentType'] = 'application/invalid'
+
+    with pytest.raises(asyncapi.exceptions.InvalidContentTypeError):
+        asyncapi.build_api('fake')
+
+
+@pytest.mark.asyncio
+async def test_should_publish_compressed_message_above_threshold(
+    spec_dict, fake_events_handler, mocker, json_message
+):
+    spec_dict['channels']['fake']['bindings'] = {
+        'kafka': {
+            'payload_compression': 'gzip',
+            'payload_compression_threshold': len(json_message) + 1,
+        }
+    }
+    fake_api = asyncapi.build_api('fake', module_name='asyncapi._tests')
+
+    await fake_api.publish('fake', {'faked': 10})
+    await fake_api.publish('fake', {'faked': 1})
+
+    (compressed_call, plain_call) = fake_events_handler.publish.call_args_list
+
+    assert gzip.decompress(compressed_call[1]['message']) == b'{"faked":10}'
+    assert compressed_call[1]['headers'] == {'content-encoding': 'gzip'}
+    assert plain_call == mocker.call(channel='fake', message=json_message)
+
+
+@pytest.mark.asyncio
+async def test_should_publish_many_with_per_message_results(
+    spec_dict, fake_events_handler, json_message, mocker
+):
+    fake_api = asyncapi.build_api('fake', module_name='asyncapi._tests')
+    fake_events_handler.publish_many = asynctest.CoroutineMock(
+        return_value=[None]
+    )
+
+    results = await fake_api.publish_many('fake', [{'faked': 1}, 'invalid'])
+
+    assert fake_events_handler.publish_many.call_args_list == [
+        mocker.call('fake', [(json_message, None, None)])
+    ]
+    assert results[0].error is None
+    assert isinstance(
+        results[1].error, asyncapi.exceptions.InvalidMessageError
+    )
+
+
+@pytest.mark.asyncio
+async def test_should_publish_many_channels_in_one_batch_per_channel(
+    spec_dict, fake_events_handler, json_message, mocker
+):
+    spec_dict['channels']['fake2'] = copy.deepcopy(
+        spec_dict['channels']['fake']
+    )
+    fake_api = asyncapi.build_api('fake', module_name='asyncapi._tests')
+    fake_events_handler.publish_many = asynctest.CoroutineMock(
+        side_effect=[[None, None], RuntimeError('fake')]
+    )
+
+    results = await fake_api.publish_many_channels(
+        [
+            ('fake', {'faked': 1}),
+            ('fake2', {'faked': 1}),
+            ('fake', {'faked': 1}),
+            ('invalid', {'faked': 1}),
+        ]
+    )
+
+    assert fake_events_handler.publish_many.call_args_list == [
+        mocker.call(
+            'fake', [(json_message, None, None), (json_message, None, None)]
+        ),
+        mocker.call('fake2', [(json_message, None, None)]),
+    ]
+    assert [result.channel_id for result in results] == [
+        'fake',
+        'fake2',
+        'fake',
+        'invalid',
+    ]
+    assert results[0].error is None
+    assert isinstance(results[1].error, RuntimeError)
+    assert results[2].error is None
+    assert isinstance(
+        results[3].error, asyncapi.exceptions.InvalidChannelError
+    )
+
+
+@pytest.mark.asyncio
+async def test_should_nack_failed_message_without_retries(
+    fake_api, fake_events_handler, async_iterator
+):
+    nack_func = asynctest.CoroutineMock()
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [asyncapi.Event('fake', b'{"faked":1}', nack_func=nack_func)]
+    )
+    fake_api.operations[('fake', 'fake_operation')] = asynctest.CoroutineMock(
+        side_effect=RuntimeError()
+    )
+
+    await fake_api.listen('fake')
+
+    assert nack_func.called
+
+
+@pytest.mark.asyncio
+async def test_should_ack_undecodable_message(
+    fake_api, fake_events_handler, async_iterator, json_invalid_message
+):
+    ack_func = asynctest.CoroutineMock()
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [
+            asyncapi.Event(
+                'fake', json_invalid_message, context={'ack_func': ack_func}
+            )
+        ]
+    )
+    fake_api.operations[('fake', 'fake_operation')] = asynctest.CoroutineMock()
+
+    await fake_api.listen('fake')
+
+    assert ack_func.called
+
+
+@pytest.mark.asyncio
+async def test_should_not_commit_dropped_message_without_nack(
+    fake_api, fake_events_handler, async_iterator
+):
+    backend = KafkaBackend(
+        'kafka://fake:9092',
+        bindings={
+            'group_id': 'fake-group',
+            'consumer_commit_mode': 'at-least-once',
+        },
+    )
+    event = backend._record_event(
+        SimpleNamespace(
+            topic='fake',
+            partition=0,
+            offset=5,
+            key=None,
+            value=b'{"faked":1}',
+            headers=None,
+        )
+    )
+    fake_events_handler.subscribe.return_value = async_iterator([event])
+    fake_api.operations[('fake', 'fake_operation')] = asynctest.CoroutineMock(
+        side_effect=RuntimeError()
+    )
+
+    await fake_api.listen('fake')
+
+    assert backend._offsets[TopicPartition('fake', 0)].uncommitted() == 5
+
+
+@pytest.mark.asyncio
+async def test_should_publish_partition_key_from_payload_field(
+    spec_dict, fake_events_handler, json_message, mocker
+):
+    spec_dict['channels']['fake']['publish']['x-partition-key'] = 'faked'
+    fake_api = asyncapi.build_api('fake', module_name='asyncapi._tests')
+
+    await fake_api.publish('fake', {'faked': 1})
+    await fake_api.publish(
+        'fake', {'faked': 1}, key='fake-key', headers={'fake': 'header'}
+    )
+
+    assert fake_events_handler.publish.call_args_list == [
+        mocker.call(channel='fake', message=json_message, key='1'),
+        mocker.call(
+            channel='fake',
+            message=json_message,
+            headers={'fake': 'header'},
+            key='fake-key',
+        ),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_should_merge_headers_with_compression_header(
+    spec_dict, fake_events_handler
+):
+    spec_dict['channels']['fake']['bindings'] = {
+        'kafka': {
+            'payload_compression': 'gzip',
+            'payload_compression_threshold': 0,
+        }
+    }
+    fake_api = asyncapi.build_api('fake', module_name='asyncapi._tests')
+
+    await fake_api.publish('fake', {'faked': 1}, headers={'fake': 'header'})
+
+    assert fake_events_handler.publish.call_args[1]['headers'] == {
+        'fake': 'header',
+        'content-encoding': 'gzip',
+    }
+
+
+@pytest.mark.asyncio
+async def test_should_set_headers_and_key_on_operation_context(
+    spec_dict, fake_events_handler, async_iterator, json_message
+):
+    spec_dict['channels']['fake']['subscribe']['x-context-headers'] = True
+    spec_dict['channels']['fake']['subscribe']['x-context-key'] = True
+    fake_api = asyncapi.build_api('fake', module_name='asyncapi._tests')
+    received = []
+
+    async def fake_operation(message, headers, key):
+        received.append((message.faked, headers, key))
+
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [
+            asyncapi.Event(
+                'fake', json_message, headers={'fake': 'header'}, key='1'
+            )
+        ]
+    )
+
+    await fake_api.listen('fake')
+
+    assert received == [(1, {'fake': 'header'}, '1')]
+
+
+@pytest.mark.asyncio
+async def test_should_not_set_headers_and_key_without_extensions(
+    fake_api, fake_events_handler, async_iterator, json_message
+):
+    received = []
+
+    async def fake_operation(message, headers=None, key=None):
+        received.append((message.faked, headers, key))
+
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [
+            asyncapi.Event(
+                'fake', json_message, headers={'fake': 'header'}, key='1'
+            )
+        ]
+    )
+
+    await fake_api.listen('fake')
+
+    assert received == [(1, None, None)]
+
+
+@pytest.mark.asyncio
+async def test_should_listen_with_direct_dispatch(
+    spec_dict, fake_events_handler, json_message
+):
+    spec_dict['channels']['fake']['subscribe']['x-concurrency'] = 2
+    fake_api = asyncapi.build_api('fake', module_name='asyncapi._tests')
+    fake_operation = asynctest.CoroutineMock()
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+    fake_events_handler.direct_dispatch = True
+
+    async def dispatch(channel, dispatcher):
+        for _ in range(3):
+            await dispatcher(asyncapi.Event(channel, json_message))
+
+    fake_events_handler.dispatch = dispatch
+
+    await fake_api.listen('fake')
+
+    assert fake_operation.call_count == 3
+    assert not fake_events_handler.subscribe.called
@@ -1,7 +1,12 @@
+import copy
+from typing import List
+
 import asynctest
 import pytest
 
+import asyncapi._tests
 import asyncapi.exceptions
+from asyncapi._tests import FakeMessage
 
 
 @pytest.fixture
@@ -30,6 +35,31 @@ async def test_should_build_api_with_servers_bindings(
     ]
 
 
+@pytest.mark.asyncio
+async def test_should_listen_message_with_compiled_payload_engine(
+    fake_events_handler, mocker
+):
+    mocker.patch.object(
+        asyncapi._tests, 'spec', copy.deepcopy(asyncapi._tests.spec)
+    )
+    fake_api = asyncapi.build_api_auto_spec(
+        'asyncapi._tests', payload_engine='compiled'
+    )
+    fake_operation = asynctest.CoroutineMock()
+    fake_api.operations[('fake', 'fake_operation')] = fake_operation
+
+    await fake_api.listen('fake')
+
+    payload = fake_operation.call_args_list[0][0][0]
+    assert payload.faked == 1
+    assert hasattr(type(payload), '__decode__')
+
+
+def test_should_not_build_api_for_invalid_payload_engine():
+    with pytest.raises(asyncapi.exceptions.InvalidPayloadEngineError):
+        asyncapi.build_api_auto_spec('asyncapi._tests', payload_engine='fake')
+
+
 @pytest.mark.asyncio
 async def test_should_publish_message(
     fake_api, fake_events_handler, fake_message, mocker, json_message
@@ -37,7 +67,7 @@ async def test_should_publish_message(
     await fake_api.publish('fake', fake_message)
 
     assert fake_events_handler.publish.call_args_list == [
-        mocker.call(channel='fake', message=json_message.decode())
+        mocker.call(channel='fake', message=json_message)
     ]
 
 
@@ -69,3 +99,83 @@ async def test_should_not_listen_for_invalid_channel(fake_api):
         await fake_api.listen('faked')
 
     assert exc_info.value.args == ('faked',)
+
+
+def test_should_build_batch_subscribe_operation():
+    spec = asyncapi.AutoSpec('Fake API', development='kafka://fake.fake')
+
+    @spec.subscribe(channel_name='fake', batch_size=10, linger_ms=50)
+    async def fake_operation(message: List[FakeMessage]) -> None:
+        ...
+
+    operation = spec.channels['fake'].subscribe
+
+    assert operation.message.payload is FakeMessage
+    assert operation.extensions == {
+        'x-batch-size': 10,
+        'x-batch-linger-ms': 50,
+    }
+
+
+def test_should_build_partition_key_publish_operation():
+    spec = asyncapi.AutoSpec('Fake API', development='kafka://fake.fake')
+
+    @spec.subscribe(channel_name='fake', partition_key='id')
+    async def fake_operation(message: FakeMessage) -> None:
+        ...
+
+    assert spec.channels['fake'].publish.extensions == {
+        'x-partition-key': 'id'
+    }
+    assert spec.channels['fake'].subscribe.extensions is None
+
+
+def test_should_build_context_subscribe_extensions():
+    spec = asyncapi.AutoSpec('Fake API', development='kafka://fake.fake')
+
+    @spec.subscribe(
+        channel_name='fake', context_headers=True, context_key=True
+    )
+    async def fake_operation(message: FakeMessage, headers, key) -> None:
+        ...
+
+    assert spec.channels['fake'].subscribe.extensions == {
+        'x-context-headers': True,
+        'x-context-key': True,
+    }
+
+
+@pytest.mark.asyncio
+async def test_should_republish_failed_batch(
+    fake_events_handler, mocker, async_iterator, json_message
+):
+    fake_api = asyncapi.build_api_auto_spec(
+        'asyncapi._tests', republish_errors=True
+    )
+    fake_api.logger = mocker.MagicMock()
+    fake_api.operations[
+        ('fake', 'fake_operation')
+    ] = asynctest.CoroutineMock(side_effect=ValueError)
+    mocker.patch.object(
+        fake_api.spec.channels['fake'].subscribe,
+        'extensions',
+        {'x-batch-size': 2},
+    )
+    fake_events_handler.subscribe.return_value = async_iterator(
+        [mocker.MagicMock(message=json_message) for _ in range(2)]
+    )
+
+    await fake_api.listen('fake')
+
+    assert fake_events_handler.publish.call_args_list == [
+        mocker.call(
+            channel='fake',
+            message=json_message,
+            headers={'retry-attempt': '1'},
+        ),
+        mocker.call(
+            channel='fake',
+            message=json_message,
+            headers={'retry-attempt': '1'},
+        ),
+    ]
@@ -1,12 +1,12 @@
 import pytest
 
 import asyncapi
-import asyncapi.builder
+import asyncapi.payloads
 
 
 @pytest.fixture(autouse=True)
 def fake_jsonschema_asdataclass(mocker):
-    return mocker.patch.object(asyncapi.builder, 'jsonschema_asdataclass')
+    return mocker.patch.object(asyncapi.payloads, 'jsonschema_asdataclass')
 
 
 @pytest.fixture
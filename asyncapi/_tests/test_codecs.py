@@ -0,0 +1,47 @@
+import pytest
+
+from asyncapi import register_codec
+from asyncapi.codecs import (
+    CBOR_CONTENT_TYPE,
+    MSGPACK_CONTENT_TYPE,
+    content_types,
+    get_codec,
+)
+from asyncapi.exceptions import InvalidContentTypeError, PayloadDecodeError
+
+
+@pytest.mark.parametrize(
+    'content_type',
+    ['application/json', MSGPACK_CONTENT_TYPE, CBOR_CONTENT_TYPE],
+)
+def test_should_roundtrip_builtin_codecs(content_type):
+    codec = get_codec(content_type)
+
+    assert codec.loads(codec.dumps({'faked': 1})) == {'faked': 1}
+
+
+@pytest.mark.parametrize(
+    'content_type,message',
+    [
+        ('application/json', b'{'),
+        (MSGPACK_CONTENT_TYPE, b'\xc1'),
+        (CBOR_CONTENT_TYPE, b'\x1c'),
+    ],
+)
+def test_should_raise_payload_decode_error_on_malformed_message(
+    content_type, message
+):
+    with pytest.raises(PayloadDecodeError):
+        get_codec(content_type).loads(message)
+
+
+def test_should_register_codec():
+    register_codec('text/fake', loads=bytes.decode, dumps=str.encode)
+
+    assert 'text/fake' in content_types()
+    assert get_codec('text/fake').dumps('fake') == b'fake'
+
+
+def test_should_not_get_invalid_codec():
+    with pytest.raises(InvalidContentTypeError):
+        get_codec('application/invalid')
@@ -0,0 +1,32 @@
+import pytest
+
+from asyncapi.compression import compressions, get_compressor
+from asyncapi.exceptions import (
+    DecompressedSizeExceededError,
+    InvalidCompressionError,
+)
+
+
+@pytest.mark.parametrize('name', compressions())
+def test_should_roundtrip_compressors(name):
+    compressor = get_compressor(name)
+    message = b'{"faked":1}' * 100
+
+    compressed = compressor.compress(message)
+
+    assert len(compressed) < len(message)
+    assert compressor.decompress(memoryview(compressed), 1100) == message
+
+
+@pytest.mark.parametrize('name', compressions())
+def test_should_limit_decompressed_size(name):
+    compressor = get_compressor(name)
+    compressed = compressor.compress(b'{"faked":1}' * 100)
+
+    with pytest.raises(DecompressedSizeExceededError):
+        compressor.decompress(compressed, 1099)
+
+
+def test_should_not_get_invalid_compressor():
+    with pytest.raises(InvalidCompressionError):
+        get_compressor('fake')
@@ -0,0 +1,65 @@
+import pytest
+
+from asyncapi.dedup import (
+    DeduplicationStore,
+    Deduplicator,
+    LRUDeduplicationStore,
+)
+
+
+@pytest.mark.asyncio
+async def test_should_detect_duplicated_keys():
+    deduplicator = Deduplicator(LRUDeduplicationStore(max_size=10, ttl=60))
+
+    assert await deduplicator.add('fake-1')
+    assert not await deduplicator.add('fake-1')
+    assert await deduplicator.add('fake-2')
+
+    stats = deduplicator.stats()
+
+    assert (stats.hits, stats.misses, stats.size) == (1, 2, 2)
+
+
+@pytest.mark.asyncio
+async def test_should_evict_least_recently_used_keys():
+    store = LRUDeduplicationStore(max_size=2, ttl=60)
+
+    await store.add('fake-1')
+    await store.add('fake-2')
+    await store.add('fake-1')
+    await store.add('fake-3')
+
+    assert len(store) == 2
+    assert not await store.add('fake-1')
+    assert await store.add('fake-2')
+
+
+@pytest.mark.asyncio
+async def test_should_expire_keys_after_ttl(mocker):
+    monotonic = mocker.patch('asyncapi.dedup.time.monotonic', return_value=0)
+    store = LRUDeduplicationStore(max_size=10, ttl=60)
+
+    await store.add('fake-1')
+    monotonic.return_value = 61
+
+    assert await store.add('fake-1')
+    assert len(store) == 1
+
+
+@pytest.mark.asyncio
+async def test_should_discard_key():
+    store = LRUDeduplicationStore(max_size=10, ttl=60)
+
+    await store.add('fake-1')
+    await store.discard('fake-1')
+
+    assert await store.add('fake-1')
+
+
+def test_should_require_store_methods():
+    class FakeStore(DeduplicationStore):
+        async def add(self, key):
+            return True
+
+    with pytest.raises(TypeError):
+        FakeStore()
@@ -0,0 +1,180 @@
+import asyncio
+import functools
+
+import pytest
+
+from asyncapi.lanes import Lanes, PartitionLanes
+
+
+@pytest.mark.asyncio
+async def test_should_process_same_key_in_order():
+    lanes = Lanes(size=4, depth=10)
+    processed = []
+
+    def job(key, seq, delay):
+        async def run():
+            await asyncio.sleep(delay)
+            processed.append((key, seq))
+
+        return run
+
+    lanes.start()
+
+    for seq in range(5):
+        await lanes.put('user-1', job('user-1', seq, 0.005 * (5 - seq)))
+        await lanes.put('user-2', job('user-2', seq, 0))
+
+    await lanes.close()
+
+    assert [seq for key, seq in processed if key == 'user-1'] == list(
+        range(5)
+    )
+    assert [seq for key, seq in processed if key == 'user-2'] == list(
+        range(5)
+    )
+
+
+def test_should_select_same_lane_for_same_key():
+    lanes = Lanes(size=8, depth=1)
+
+    assert lanes.lane_index('user-1') == lanes.lane_index('user-1')
+    assert lanes.lane_index(10) == lanes.lane_index('10')
+
+
+@pytest.mark.asyncio
+async def test_should_expose_lanes_stats():
+    lanes = Lanes(size=2, depth=3)
+    blocker = asyncio.Event()
+
+    async def job():
+        await blocker.wait()
+
+    lanes.start()
+    index = lanes.lane_index('user-1')
+
+    for _ in range(3):
+        await lanes.put('user-1', job)
+
+    await asyncio.sleep(0)
+    stats = lanes.stats()
+    blocker.set()
+    await lanes.close()
+
+    assert stats.lanes == 2
+    assert stats.depth == 3
+    assert stats.occupancy[index] == 2
+    assert stats.max_occupancy[index] == 3
+    assert lanes.stats().processed[index] == 3
+
+
+@pytest.mark.asyncio
+async def test_should_process_partitions_concurrently_in_order():
+    lanes = PartitionLanes(10, lambda partition: ..., lambda partition: ...)
+    blocker = asyncio.Event()
+    processed = []
+
+    def job(partition, seq):
+        async def run():
+            if partition == 0:
+                await blocker.wait()
+
+            processed.append((partition, seq))
+
+        return run
+
+    for seq in range(3):
+        await lanes.put(0, job(0, seq))
+        await lanes.put(1, job(1, seq))
+
+    await asyncio.sleep(0.01)
+
+    assert processed == [(1, 0), (1, 1), (1, 2)]
+
+    blocker.set()
+    await lanes.close()
+
+    assert [seq for partition, seq in processed if partition == 0] == [
+        0,
+        1,
+        2,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_should_pause_backed_up_partition():
+    paused = []
+    resumed = []
+    lanes = PartitionLanes(4, paused.append, resumed.append)
+    blocker = asyncio.Event()
+
+    async def job():
+        await blocker.wait()
+
+    for _ in range(5):
+        await lanes.put('p0', job)
+
+    await asyncio.sleep(0)
+
+    assert paused == ['p0']
+    assert not resumed
+    assert lanes.stats().max_occupancy == [5]
+
+    blocker.set()
+    await lanes.close()
+
+    assert resumed == ['p0']
+    assert lanes.stats().lanes == 0
+
+
+@pytest.mark.asyncio
+async def test_should_tear_down_revoked_partition_lane():
+    lanes = PartitionLanes(10, lambda partition: ..., lambda partition: ...)
+    processed = []
+
+    async def job():
+        processed.append(1)
+
+    await lanes.put('p0', job)
+    await lanes.put('p1', job)
+    await asyncio.sleep(0.01)
+    await lanes.revoke(['p0'])
+
+    assert lanes.stats().lanes == 1
+    assert processed == [1, 1]
+
+    await lanes.put('p0', job)
+    await asyncio.sleep(0.01)
+
+    assert lanes.stats().lanes == 1
+    assert processed == [1, 1]
+
+    lanes.assign(['p0'])
+    await lanes.put('p0', job)
+    await lanes.close()
+
+    assert processed == [1, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_should_drop_queued_jobs_and_wait_running_job_on_revoke():
+    lanes = PartitionLanes(10, lambda partition: ..., lambda partition: ...)
+    blocker = asyncio.Event()
+    processed = []
+
+    async def job(name):
+        await blocker.wait()
+        processed.append(name)
+
+    await lanes.put('p0', functools.partial(job, 'running'))
+    await lanes.put('p0', functools.partial(job, 'queued'))
+    await asyncio.sleep(0)
+
+    revoke = asyncio.create_task(lanes.revoke(['p0']))
+    await asyncio.sleep(0.01)
+
+    assert not revoke.done()
+
+    blocker.set()
+    await revoke
+
+    assert processed == ['running']
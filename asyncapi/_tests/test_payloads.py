@@ -0,0 +1,137 @@
+import dataclasses
+
+import orjson
+import pytest
+from jsondaora import DeserializationError, dataclass_asjson
+
+from asyncapi.payloads import compiled_asdataclass
+
+
+@pytest.fixture
+def schema():
+    return {
+        'type': 'object',
+        'properties': {
+            'id': {'type': 'integer'},
+            'name': {'type': 'string', 'default': 'fake'},
+            'scores': {'type': 'array', 'items': {'type': 'number'}},
+            'address': {
+                'type': 'object',
+                'properties': {'street': {'type': 'string'}},
+            },
+        },
+        'required': ['id'],
+    }
+
+
+def test_should_compile_slots_dataclass(schema):
+    type_ = compiled_asdataclass('FakePayload', schema)
+
+    assert dataclasses.is_dataclass(type_)
+    assert type_.__slots__ == ('id', 'name', 'scores', 'address')
+    assert compiled_asdataclass('FakePayload', dict(schema)) is type_
+
+
+def test_should_decode_payload(schema):
+    type_ = compiled_asdataclass('FakePayload', schema)
+    message = b'{"id":"1","scores":[1,2.5],"address":{"street":"fake"}}'
+
+    payload = type_.__decode__(orjson.loads(message))
+
+    assert payload.id == 1
+    assert payload.name == 'fake'
+    assert payload.scores == [1.0, 2.5]
+    assert payload.address.street == 'fake'
+    assert orjson.loads(dataclass_asjson(payload)) == {
+        'id': 1,
+        'name': 'fake',
+        'scores': [1.0, 2.5],
+        'address': {'street': 'fake'},
+    }
+
+
+@pytest.mark.parametrize(
+    'data',
+    [{}, {'id': 'fake'}, {'id': 1, 'name': 1}, {'id': 1, 'scores': 1}, []],
+)
+def test_should_not_decode_invalid_payload(schema, data):
+    type_ = compiled_asdataclass('FakePayload', schema)
+
+    with pytest.raises(DeserializationError):
+        type_.__decode__(data)
+
+
+def test_should_decode_payload_with_non_identifier_properties():
+    type_ = compiled_asdataclass(
+        'FakePayload',
+        {
+            'type': 'object',
+            'properties': {
+                'user-id': {'type': 'integer'},
+                'from': {'type': 'string'},
+                'data': {'type': 'string'},
+                'cls': {'type': 'string'},
+            },
+        },
+    )
+
+    payload = type_.__decode__(
+        {'user-id': '1', 'from': 'a', 'data': 'b', 'cls': 'c'}
+    )
+
+    assert getattr(payload, 'user-id') == 1
+    assert getattr(payload, 'from') == 'a'
+    assert payload.data == 'b'
+    assert payload.cls == 'c'
+    assert orjson.loads(dataclass_asjson(payload)) == {
+        'user-id': 1,
+        'from': 'a',
+        'data': 'b',
+        'cls': 'c',
+    }
+
+
+def test_should_not_execute_property_names():
+    type_ = compiled_asdataclass(
+        'FakePayload',
+        {
+            'type': 'object',
+            'properties': {'x=__import__("os").abort()': {'type': 'string'}},
+        },
+    )
+
+    payload = type_.__decode__({})
+
+    assert getattr(payload, 'x=__import__("os").abort()') is None
+
+
+def test_should_not_share_mutable_defaults():
+    type_ = compiled_asdataclass(
+        'FakePayload',
+        {
+            'type': 'object',
+            'properties': {
+                'tags': {'type': 'array', 'default': []},
+            },
+        },
+    )
+
+    first = type_.__decode__({})
+    first.tags.append('fake')
+
+    assert type_.__decode__({}).tags == []
+    assert type_().tags == []
+
+
+def test_should_init_compiled_payload(schema):
+    type_ = compiled_asdataclass('FakePayload', schema)
+
+    payload = type_(1, scores=[1.0])
+
+    assert payload == type_(id=1, name='fake', scores=[1.0], address=None)
+    assert repr(payload) == (
+        "FakePayload(id=1, name='fake', scores=[1.0], address=None)"
+    )
+
+    with pytest.raises(TypeError):
+        type_(1, id=1)
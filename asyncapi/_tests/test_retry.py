@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from asyncapi.retry import RetryPolicy, RetryScheduler
+
+
+def test_should_bound_retry_delay_with_exponential_backoff():
+    policy = RetryPolicy(max_attempts=10, backoff=0.1, max_backoff=1)
+
+    assert all(0 <= policy.delay(1) <= 0.1 for _ in range(100))
+    assert all(0 <= policy.delay(3) <= 0.4 for _ in range(100))
+    assert all(0 <= policy.delay(9) <= 1 for _ in range(100))
+
+
+@pytest.mark.asyncio
+async def test_should_run_retries_by_due_time():
+    scheduler = RetryScheduler()
+    processed = []
+
+    def job(name):
+        async def run():
+            processed.append(name)
+
+        return run
+
+    scheduler.start()
+    scheduler.schedule(0.02, job('late'))
+    scheduler.schedule(0.001, job('early'))
+
+    await asyncio.sleep(0.05)
+    await scheduler.close()
+
+    assert processed == ['early', 'late']
+
+
+@pytest.mark.asyncio
+async def test_should_drop_pending_retries_on_close():
+    scheduler = RetryScheduler()
+
+    async def job():
+        ...
+
+    scheduler.start()
+    scheduler.schedule(10, job)
+
+    assert len(scheduler) == 1
+
+    await scheduler.close()
+
+    assert len(scheduler) == 0
+
+
+@pytest.mark.asyncio
+async def test_should_run_pending_retries_fallback_on_close():
+    scheduler = RetryScheduler()
+    processed = []
+
+    async def job():
+        processed.append('job')
+
+    async def fallback():
+        processed.append('fallback')
+
+    scheduler.start()
+    scheduler.schedule(10, job, fallback)
+
+    await scheduler.close()
+
+    assert processed == ['fallback']
+    assert len(scheduler) == 0
@@ -1,5 +1,8 @@
+import copy
+
 import pytest
 
+import asyncapi._tests
 import asyncapi.subscriber
 from asyncapi import UrlOrModuleRequiredError
 
@@ -29,6 +32,8 @@ async def test_should_run_subscriber_for_spec(fake_loop):
         channels_subscribes=None,
         workers=2,
         republish_errors_channels=None,
+        channels_concurrency=None,
+        payload_engine=None,
     )
     await fake_loop.create_task.call_args_list[0][0][0]
 
@@ -46,12 +51,41 @@ async def test_should_run_subscriber_for_auto_spec(fake_loop):
         workers=2,
         channels_subscribes=None,
         republish_errors_channels=None,
+        channels_concurrency=None,
+        payload_engine=None,
     )
     await fake_loop.create_task.call_args_list[0][0][0]
 
     assert fake_loop.run_forever.called
 
 
+@pytest.mark.asyncio
+async def test_should_run_subscriber_for_auto_spec_with_payload_engine(
+    fake_loop, mocker
+):
+    mocker.patch.object(
+        asyncapi._tests, 'spec', copy.deepcopy(asyncapi._tests.spec)
+    )
+    build_api_auto_spec = mocker.spy(
+        asyncapi.subscriber, 'build_api_auto_spec'
+    )
+    asyncapi.subscriber.main(
+        api_module='asyncapi._tests',
+        channel='fake',
+        server_bindings=None,
+        url=None,
+        server=None,
+        workers=1,
+        channels_subscribes=None,
+        republish_errors_channels=None,
+        channels_concurrency=None,
+        payload_engine='compiled',
+    )
+    await fake_loop.create_task.call_args_list[0][0][0]
+
+    assert build_api_auto_spec.call_args[1]['payload_engine'] == 'compiled'
+
+
 def test_should_raise_url_or_module_required_error():
     with pytest.raises(UrlOrModuleRequiredError):
         asyncapi.subscriber.main(
@@ -63,4 +97,6 @@ def test_should_raise_url_or_module_required_error():
             workers=2,
             channels_subscribes=None,
             republish_errors_channels=None,
+            channels_concurrency=None,
+            payload_engine=None,
         )
@@ -1,9 +1,30 @@
 import asyncio
+import concurrent.futures
+import contextlib
 import dataclasses
+import functools
 import logging
-from typing import Any, Callable, Dict, Optional, Tuple, Type
+from types import MappingProxyType
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    get_origin,
+)
 
-import orjson
+from broadcaster import Event
+from broadcaster._base import Unsubscribed
 from jsondaora import (
     DeserializationError,
     asdataclass,
@@ -11,18 +32,84 @@ from jsondaora import (
     typed_dict_asjson,
 )
 
+from .codecs import JSON_CODEC, get_codec
+from .compression import CONTENT_ENCODING_HEADER, get_compressor
+from .dedup import (
+    DeduplicationStats,
+    DeduplicationStore,
+    Deduplicator,
+    LRUDeduplicationStore,
+)
+from .dispatch import (
+    ChannelDispatcher,
+    build_codec_encoder,
+    build_decoder,
+    build_encoder,
+    build_json_encoder,
+    operation_message_type,
+    payload_field,
+)
+from .events import PublishManyHint, message_bytes, message_preview
 from .events.handler import EventsHandler
 from .exceptions import (
     ChannelOperationNotFoundError,
     ChannelPublishNotFoundError,
     InvalidChannelError,
+    InvalidExecutionModeError,
     InvalidMessageError,
     OperationIdNotFoundError,
+    PayloadDecodeError,
+)
+from .executors import (
+    EXECUTION_MODES,
+    INLINE_EXECUTION,
+    PROCESS_EXECUTION,
+    process_operation,
+)
+from .lanes import Lanes, LanesStats, PartitionLanes
+from .retry import ATTEMPT_HEADER, RetryPolicy, RetryScheduler
+from .specification_v2_0_0 import (
+    BATCH_LINGER_MS_EXTENSION,
+    BATCH_SIZE_EXTENSION,
+    CONCURRENCY_EXTENSION,
+    CONTEXT_HEADERS_EXTENSION,
+    CONTEXT_KEY_EXTENSION,
+    DEAD_LETTER_CHANNEL_EXTENSION,
+    DEDUPLICATION_EXTENSION,
+    DEDUPLICATION_KEY_EXTENSION,
+    EXECUTION_MODE_EXTENSION,
+    ORDERING_HEADER_EXTENSION,
+    ORDERING_KEY_EXTENSION,
+    ORDERING_LANE_DEPTH_EXTENSION,
+    PARTITION_KEY_EXTENSION,
+    RETRY_BACKOFF_MS_EXTENSION,
+    RETRY_MAX_ATTEMPTS_EXTENSION,
+    RETRY_MAX_BACKOFF_MS_EXTENSION,
+    Operation,
+    Specification,
 )
-from .specification_v2_0_0 import Operation, Specification
 
 
 OperationsTypeHint = Dict[Tuple[str, str], Callable[..., Any]]
+OperationJobHint = Callable[[], Coroutine[Any, Any, None]]
+OperationSubmitHint = Callable[
+    [OperationJobHint], Coroutine[Any, Any, None]
+]
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_BATCH_LINGER_MS = 100
+DEFAULT_LANE_DEPTH = 100
+DEFAULT_RETRY_BACKOFF_MS = 100
+DEFAULT_RETRY_MAX_BACKOFF_MS = 30000
+DEFAULT_DEDUPLICATION_MAX_SIZE = 10000
+DEFAULT_DEDUPLICATION_TTL = 3600
+DEFAULT_COMPRESSION_THRESHOLD = 1024
+
+
+@dataclasses.dataclass
+class PublishResult:
+    channel_id: str
+    message: Any
+    error: Optional[BaseException] = None
 
 
 @dataclasses.dataclass
@@ -34,26 +121,179 @@ class AsyncApi:
     republish_error_messages_channels: Optional[Dict[str, str]] = None
     logger: logging.Logger = logging.getLogger(__name__)
     operation_timeout: Optional[int] = None
+    operations_concurrency: int = 1
+    channels_concurrency: Optional[Dict[str, int]] = None
+    dispatchers: Mapping[str, ChannelDispatcher] = dataclasses.field(
+        default_factory=lambda: MappingProxyType({}), init=False, repr=False
+    )
+    channels_lanes: Dict[
+        str, Union[Lanes, PartitionLanes]
+    ] = dataclasses.field(default_factory=dict, init=False, repr=False)
+    thread_pool_max_workers: Optional[int] = None
+    process_pool_max_workers: Optional[int] = None
+    executors: Dict[str, concurrent.futures.Executor] = dataclasses.field(
+        default_factory=dict, init=False, repr=False
+    )
+    retry_max_attempts: int = 0
+    retry_backoff_ms: int = DEFAULT_RETRY_BACKOFF_MS
+    retry_max_backoff_ms: int = DEFAULT_RETRY_MAX_BACKOFF_MS
+    retry_scheduler: Optional[RetryScheduler] = dataclasses.field(
+        default=None, init=False, repr=False
+    )
+    deduplication_max_size: int = DEFAULT_DEDUPLICATION_MAX_SIZE
+    deduplication_ttl: int = DEFAULT_DEDUPLICATION_TTL
+    deduplication_store: Optional[DeduplicationStore] = None
+    deduplicator: Optional[Deduplicator] = dataclasses.field(
+        default=None, init=False, repr=False
+    )
+    payload_compression: Optional[str] = None
+    payload_compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD
 
     async def publish_json(
-        self, channel_id: str, message: Dict[str, Any]
+        self,
+        channel_id: str,
+        message: Dict[str, Any],
+        key: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
     ) -> None:
-        await self.events_handler.publish(
-            channel=channel_id,
-            message=self.parse_message(
-                channel_id, self.payload(channel_id, **message)
-            ).decode(),
+        dispatcher = self.dispatcher(channel_id)
+
+        if dispatcher.json_encoder is None:
+            raise ChannelPublishNotFoundError(channel_id)
+
+        await self.publish_message(
+            dispatcher,
+            dispatcher.json_encoder(message),
+            message_key(dispatcher, message) if key is None else key,
+            headers,
+        )
+
+    async def publish(
+        self,
+        channel_id: str,
+        message: Any,
+        key: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        dispatcher = self.dispatcher(channel_id)
+        await self.publish_message(
+            dispatcher,
+            self.encode_message(dispatcher, message),
+            message_key(dispatcher, message) if key is None else key,
+            headers,
         )
 
-    async def publish(self, channel_id: str, message: Any) -> None:
-        if isinstance(message, dict):
-            return await self.publish_json(channel_id, message)
+    async def publish_message(
+        self,
+        dispatcher: ChannelDispatcher,
+        message: Any,
+        key: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        message, headers = self.compress_message(dispatcher, message, headers)
+        kwargs: Dict[str, Any] = {}
+
+        if headers:
+            kwargs['headers'] = headers
+
+        if key is not None:
+            kwargs['key'] = key
 
         await self.events_handler.publish(
-            channel=channel_id,
-            message=self.parse_message(channel_id, message).decode(),
+            channel=dispatcher.channel_id, message=message, **kwargs
         )
 
+    async def publish_many(
+        self, channel_id: str, messages: Iterable[Any]
+    ) -> List[PublishResult]:
+        return await self.publish_many_channels(
+            (channel_id, message) for message in messages
+        )
+
+    async def publish_many_channels(
+        self, messages: Iterable[Tuple[str, Any]]
+    ) -> List[PublishResult]:
+        results: List[PublishResult] = []
+        batches: Dict[str, List[Tuple[PublishResult, PublishManyHint]]] = {}
+        dispatchers: Dict[str, ChannelDispatcher] = {}
+
+        for channel_id, message in messages:
+            result = PublishResult(channel_id, message)
+            results.append(result)
+
+            try:
+                dispatcher = dispatchers.get(channel_id)
+
+                if dispatcher is None:
+                    dispatcher = dispatchers[channel_id] = self.dispatcher(
+                        channel_id
+                    )
+
+                payload, headers = self.compress_message(
+                    dispatcher, self.encode_message(dispatcher, message)
+                )
+                key = message_key(dispatcher, message)
+
+            except Exception as error:
+                result.error = error
+
+            else:
+                batches.setdefault(channel_id, []).append(
+                    (result, (payload, headers, key))
+                )
+
+        batches_errors = await asyncio.gather(
+            *(
+                self.events_handler.publish_many(
+                    channel_id, [published for _, published in batch]
+                )
+                for channel_id, batch in batches.items()
+            ),
+            return_exceptions=True,
+        )
+
+        for batch, errors in zip(batches.values(), batches_errors):
+            if isinstance(errors, BaseException):
+                errors = [errors] * len(batch)
+
+            for (result, _), publish_error in zip(batch, errors):
+                result.error = publish_error
+
+        return results
+
+    def encode_message(
+        self, dispatcher: ChannelDispatcher, message: Any
+    ) -> Any:
+        encoder = (
+            dispatcher.json_encoder
+            if isinstance(message, dict)
+            else dispatcher.encoder
+        )
+
+        if encoder is None:
+            raise ChannelPublishNotFoundError(dispatcher.channel_id)
+
+        return encoder(message)
+
+    def compress_message(
+        self,
+        dispatcher: ChannelDispatcher,
+        message: Any,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[Any, Optional[Dict[str, str]]]:
+        compressor = dispatcher.compressor
+
+        if (
+            compressor is not None
+            and len(message) >= dispatcher.compression_threshold
+        ):
+            return (
+                compressor.compress(message_bytes(message)),
+                {**(headers or {}), CONTENT_ENCODING_HEADER: compressor.name},
+            )
+
+        return message, headers
+
     async def __aenter__(self) -> 'AsyncApi':
         await self.connect()
         return self
@@ -62,10 +302,140 @@ class AsyncApi:
         await self.disconnect()
 
     async def connect(self) -> None:
+        self.dispatchers = MappingProxyType(
+            {
+                channel_id: self.build_dispatcher(channel_id)
+                for channel_id in self.spec.channels
+            }
+        )
         await self.events_handler.connect()
 
     async def disconnect(self) -> None:
+        if self.retry_scheduler is not None:
+            await self.retry_scheduler.close()
+            self.retry_scheduler = None
+
         await self.events_handler.disconnect()
+        loop = asyncio.get_running_loop()
+
+        for executor in self.executors.values():
+            await loop.run_in_executor(None, executor.shutdown)
+
+        self.executors.clear()
+
+    def executor(self, execution_mode: str) -> concurrent.futures.Executor:
+        executor = self.executors.get(execution_mode)
+
+        if executor is None:
+            if execution_mode == PROCESS_EXECUTION:
+                executor = concurrent.futures.ProcessPoolExecutor(
+                    self.process_pool_max_workers
+                )
+            else:
+                executor = concurrent.futures.ThreadPoolExecutor(
+                    self.thread_pool_max_workers
+                )
+
+            self.executors[execution_mode] = executor
+
+        return executor
+
+    def dispatcher(self, channel_id: str) -> ChannelDispatcher:
+        try:
+            return self.dispatchers[channel_id]
+        except KeyError:
+            return self.build_dispatcher(channel_id)
+
+    def build_dispatcher(self, channel_id: str) -> ChannelDispatcher:
+        try:
+            channel = self.spec.channels[channel_id]
+        except KeyError:
+            raise InvalidChannelError(channel_id)
+
+        operation_func = None
+        concurrency = 1
+        batch = None
+        encoder = None
+        json_encoder = None
+        extensions: Dict[str, Any] = {}
+        subscribe_type = (
+            self.subscribe_payload_type(channel_id)
+            if channel.subscribe
+            else None
+        )
+        content_type = self.message_content_type(channel.subscribe)
+
+        if channel.subscribe and channel.subscribe.operation_id:
+            operation_func = self.operations.get(
+                (channel_id, channel.subscribe.operation_id)
+            )
+            concurrency = self.channel_concurrency(channel_id)
+            extensions = channel.subscribe.extensions or {}
+
+            if operation_func:
+                batch = self.channel_batch(channel_id, operation_func)
+
+        compression, compression_threshold = self.channel_compression(
+            channel_id
+        )
+
+        if channel.publish:
+            publish_type = self.publish_payload_type(channel_id)
+            encoder = build_encoder(
+                publish_type,
+                get_codec(self.message_content_type(channel.publish)),
+            )
+            json_encoder = build_json_encoder(publish_type, encoder)
+
+        execution_mode = extensions.get(
+            EXECUTION_MODE_EXTENSION, INLINE_EXECUTION
+        )
+
+        if execution_mode not in EXECUTION_MODES:
+            raise InvalidExecutionModeError(channel_id, execution_mode)
+
+        return ChannelDispatcher(
+            channel_id=channel_id,
+            decoder=build_decoder(subscribe_type, get_codec(content_type)),
+            content_type=content_type,
+            compressor=get_compressor(compression) if compression else None,
+            compression_threshold=compression_threshold,
+            encoder=encoder,
+            json_encoder=json_encoder,
+            operation=operation_func,
+            error_channel=(
+                self.republish_error_messages_channels.get(
+                    channel_id, channel_id
+                )
+                if self.republish_error_messages_channels is not None
+                else channel_id
+            ),
+            concurrency=concurrency,
+            batch=batch,
+            ordering_key=extensions.get(ORDERING_KEY_EXTENSION),
+            ordering_header=extensions.get(ORDERING_HEADER_EXTENSION),
+            lane_depth=int(
+                extensions.get(
+                    ORDERING_LANE_DEPTH_EXTENSION, DEFAULT_LANE_DEPTH
+                )
+            ),
+            execution_mode=execution_mode,
+            retry=self.channel_retry(extensions),
+            dead_letter_channel=extensions.get(DEAD_LETTER_CHANNEL_EXTENSION),
+            deduplicate=bool(
+                extensions.get(DEDUPLICATION_EXTENSION)
+                or DEDUPLICATION_KEY_EXTENSION in extensions
+            ),
+            deduplication_key=extensions.get(DEDUPLICATION_KEY_EXTENSION),
+            partition_key=(
+                (channel.publish.extensions or {}).get(PARTITION_KEY_EXTENSION)
+                if channel.publish
+                else None
+            ),
+            operation_headers=bool(extensions.get(CONTEXT_HEADERS_EXTENSION)),
+            operation_key=bool(extensions.get(CONTEXT_KEY_EXTENSION)),
+            payload_spec=getattr(subscribe_type, '__payload_spec__', None),
+        )
 
     def payload(self, channel_id: str, **message: Any) -> Any:
         type_ = self.publish_payload_type(channel_id)
@@ -103,66 +473,725 @@ class AsyncApi:
         if operation_id is None:
             raise ChannelOperationNotFoundError(channel_id)
 
-        try:
-            operation_func = self.operations[(channel_id, operation_id)]
-        except KeyError:
+        dispatcher = self.dispatcher(channel_id)
+
+        if dispatcher.operation is None:
             raise OperationIdNotFoundError(channel_id, operation_id)
 
+        if (
+            self.events_handler.direct_dispatch
+            and dispatcher.batch is None
+            and not dispatcher.ordering_key
+            and not dispatcher.ordering_header
+            and not self.events_handler.partition_lanes
+        ):
+            return await self.listen_direct(dispatcher)
+
         async with self.events_handler.subscribe(
             channel=channel_id
         ) as subscriber:
+            if dispatcher.ordering_key or dispatcher.ordering_header:
+                return await self.listen_keyed(dispatcher, subscriber)
+
+            if dispatcher.batch is not None:
+                return await self.listen_batches(
+                    dispatcher, self.batches(subscriber, *dispatcher.batch)
+                )
+
+            if self.events_handler.partition_lanes:
+                return await self.listen_partitioned(dispatcher, subscriber)
+
+            if dispatcher.concurrency <= 1:
+                async for event in subscriber:
+                    await self.process_event(dispatcher, event)
+
+                return
+
+            async with operation_tasks(dispatcher.concurrency) as submit:
+                async for event in subscriber:
+                    await submit(
+                        functools.partial(
+                            self.process_event,
+                            dispatcher,
+                            event,
+                            submit=submit,
+                        )
+                    )
+
+    async def listen_batches(
+        self,
+        dispatcher: ChannelDispatcher,
+        batches: AsyncIterable[List[Event]],
+    ) -> None:
+        if dispatcher.concurrency <= 1:
+            async for events in batches:
+                await self.process_batch(dispatcher, events)
+
+            return
+
+        async with operation_tasks(dispatcher.concurrency) as submit:
+            async for events in batches:
+                await submit(
+                    functools.partial(
+                        self.process_batch, dispatcher, events, submit=submit
+                    )
+                )
+
+    async def listen_direct(self, dispatcher: ChannelDispatcher) -> None:
+        if dispatcher.concurrency <= 1:
+            return await self.events_handler.dispatch(
+                dispatcher.channel_id,
+                functools.partial(self.process_event, dispatcher),
+            )
+
+        async with operation_tasks(dispatcher.concurrency) as submit:
+
+            async def dispatch_event(event: Event) -> None:
+                await submit(
+                    functools.partial(
+                        self.process_event, dispatcher, event, submit=submit
+                    )
+                )
+
+            await self.events_handler.dispatch(
+                dispatcher.channel_id, dispatch_event
+            )
+
+    async def listen_keyed(
+        self, dispatcher: ChannelDispatcher, subscriber: Any
+    ) -> None:
+        lanes = Lanes(
+            dispatcher.concurrency, dispatcher.lane_depth, self.logger
+        )
+        lanes.start()
+        self.channels_lanes[dispatcher.channel_id] = lanes
+
+        try:
+            async for event in subscriber:
+                if dispatcher.ordering_header:
+                    await lanes.put(
+                        getattr(event, 'headers', {}).get(
+                            dispatcher.ordering_header
+                        ),
+                        functools.partial(
+                            self.process_event, dispatcher, event
+                        ),
+                    )
+                    continue
+
+                payload = await self.decode_event(dispatcher, event)
+
+                if payload is not None:
+                    await lanes.put(
+                        payload_field(
+                            payload, dispatcher.ordering_key  # type: ignore
+                        ),
+                        functools.partial(
+                            self.process_payload, dispatcher, event, payload
+                        ),
+                    )
+
+        finally:
+            await lanes.close()
+            self.channels_lanes.pop(dispatcher.channel_id, None)
+
+    async def listen_partitioned(
+        self, dispatcher: ChannelDispatcher, subscriber: Any
+    ) -> None:
+        lanes = PartitionLanes(
+            dispatcher.lane_depth,
+            self.events_handler.pause_partition,
+            self.events_handler.resume_partition,
+            self.logger,
+        )
+        self.channels_lanes[dispatcher.channel_id] = lanes
+        self.events_handler.add_revoke_callback(lanes.revoke)
+        self.events_handler.add_assign_callback(lanes.assign)
+
+        try:
             async for event in subscriber:
+                await lanes.put(
+                    getattr(event, 'partition', None),
+                    functools.partial(self.process_event, dispatcher, event),
+                )
+
+        finally:
+            self.events_handler.remove_revoke_callback(lanes.revoke)
+            self.events_handler.remove_assign_callback(lanes.assign)
+            await lanes.close()
+            self.channels_lanes.pop(dispatcher.channel_id, None)
+
+    def lanes_stats(self, channel_id: str) -> Optional[LanesStats]:
+        lanes = self.channels_lanes.get(channel_id)
+        return lanes.stats() if lanes else None
+
+    async def batches(
+        self, subscriber: Any, batch_size: int, linger: float
+    ) -> AsyncIterator[List[Event]]:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            try:
+                batch = await subscriber.get_many(batch_size)
+            except Unsubscribed:
+                return
+
+            deadline = loop.time() + linger
+
+            while len(batch) < batch_size:
+                timeout = deadline - loop.time()
+
+                if timeout <= 0:
+                    break
+
                 try:
-                    json_message = orjson.loads(event.message)
-                    payload = self.subscriber_payload(
-                        channel_id, **json_message
+                    batch.extend(
+                        await asyncio.wait_for(
+                            subscriber.get_many(batch_size - len(batch)),
+                            timeout,
+                        )
                     )
+                except asyncio.TimeoutError:
+                    break
+                except Unsubscribed:
+                    yield batch
+                    return
+
+            yield batch
+
+    async def process_event(
+        self,
+        dispatcher: ChannelDispatcher,
+        event: Event,
+        submit: Optional[OperationSubmitHint] = None,
+    ) -> None:
+        if dispatcher.execution_mode == PROCESS_EXECUTION:
+            return await self.process_payload(
+                dispatcher, event, event.message, submit=submit
+            )
+
+        payload = await self.decode_event(dispatcher, event)
+
+        if payload is not None:
+            await self.process_payload(
+                dispatcher, event, payload, submit=submit
+            )
+
+    async def decode_event(
+        self, dispatcher: ChannelDispatcher, event: Event
+    ) -> Any:
+        try:
+            return dispatcher.decoder(event.message)
+
+        except (PayloadDecodeError, DeserializationError):
+            self.logger.exception(
+                f'message={message_preview(event.message)}'
+            )
+
+        except Exception:
+            self.logger.exception(
+                f'message={message_preview(event.message)}'
+            )
+
+            if self.republish_error_messages:
+                await self.republish(dispatcher, event.message)
+
+        await self.ack([event])
+        return None
+
+    async def process_payload(
+        self,
+        dispatcher: ChannelDispatcher,
+        event: Event,
+        payload: Any,
+        attempt: Optional[int] = None,
+        submit: Optional[OperationSubmitHint] = None,
+    ) -> None:
+        context = operation_context(dispatcher, [event])
+
+        if attempt is None:
+            if dispatcher.deduplicate and await self.is_duplicate(
+                dispatcher, event, payload
+            ):
+                return
+
+            attempts = event_attempts(event)
+
+            if self.retries_exhausted(dispatcher, attempts):
+                return await self.drop(dispatcher, [event], attempts)
+
+            attempt = attempts + 1
+
+        try:
+            if dispatcher.execution_mode == INLINE_EXECUTION:
+                coro = dispatcher.operation(payload, **context)  # type: ignore
+            else:
+                coro = self.run_in_executor(
+                    dispatcher, payload, message_bytes(event.message), context
+                )
 
-                    coro = operation_func(
-                        payload, **getattr(event, 'context', {})
+            await self.run_operation(coro, event.message)
+
+        except PayloadDecodeError:
+            self.logger.exception(
+                f'message={message_preview(event.message)}'
+            )
+            await self.ack([event])
+
+        except Exception:
+            self.logger.exception(
+                f'message={message_preview(event.message)}'
+            )
+
+            give_up = functools.partial(
+                self.give_up, dispatcher, [event], [payload], attempt
+            )
+
+            if not await self.retry(
+                dispatcher,
+                attempt,
+                functools.partial(
+                    self.process_payload,
+                    dispatcher,
+                    event,
+                    payload,
+                    submit=submit,
+                ),
+                give_up,
+                submit,
+            ):
+                await give_up()
+
+    async def process_batch(
+        self,
+        dispatcher: ChannelDispatcher,
+        events: List[Event],
+        attempt: Optional[int] = None,
+        submit: Optional[OperationSubmitHint] = None,
+    ) -> None:
+        payloads = []
+
+        if attempt is None:
+            if dispatcher.deduplicate:
+                events = [
+                    event
+                    for event in events
+                    if not await self.is_duplicate(dispatcher, event, None)
+                ]
+
+            pending = []
+
+            for event in events:
+                attempts = event_attempts(event)
+
+                if self.retries_exhausted(dispatcher, attempts):
+                    await self.drop(dispatcher, [event], attempts)
+                else:
+                    pending.append(event)
+
+            if not pending:
+                return
+
+            events = pending
+
+            attempt = max(event_attempts(event) for event in events) + 1
+
+        context = batch_context(events)
+        context.update(operation_context(dispatcher, events, batch=True))
+
+        if dispatcher.execution_mode == PROCESS_EXECUTION:
+            payloads = [message_bytes(event.message) for event in events]
+
+        else:
+            for event in events:
+                try:
+                    payloads.append(dispatcher.decoder(event.message))
+                except (PayloadDecodeError, DeserializationError):
+                    self.logger.exception(
+                        f'message={message_preview(event.message)}'
+                    )
+
+        if not payloads:
+            await self.ack(events)
+            return
+
+        batch_message = f'batch_size={len(payloads)}'
+
+        try:
+            if dispatcher.execution_mode == INLINE_EXECUTION:
+                coro = dispatcher.operation(  # type: ignore
+                    payloads, **context
+                )
+            else:
+                coro = self.run_in_executor(
+                    dispatcher, payloads, payloads, context
+                )
+
+            await self.run_operation(coro, batch_message)
+
+        except Exception:
+            self.logger.exception(batch_message)
+
+            give_up = functools.partial(
+                self.give_up, dispatcher, events, payloads, attempt
+            )
+
+            if not await self.retry(
+                dispatcher,
+                attempt,
+                functools.partial(
+                    self.process_batch, dispatcher, events, submit=submit
+                ),
+                give_up,
+                submit,
+            ):
+                await give_up()
+
+    async def run_operation(self, coro: Any, message: Any) -> None:
+        if self.operation_timeout:
+            try:
+                while asyncio.iscoroutine(coro):
+                    coro = await asyncio.wait_for(
+                        coro, timeout=self.operation_timeout
                     )
+            except asyncio.TimeoutError:
+                self.logger.exception(
+                    f'operation timeout: {self.operation_timeout}; '
+                    f'message={message_preview(message)}'
+                )
+        else:
+            while asyncio.iscoroutine(coro):
+                coro = await coro
+
+    async def run_in_executor(
+        self,
+        dispatcher: ChannelDispatcher,
+        payload: Any,
+        message: Any,
+        context: Dict[str, Any],
+    ) -> None:
+        operation: Callable[..., Any] = dispatcher.operation  # type: ignore
+        # the ack function can't cross the process boundary, so in the thread
+        # and process modes the operations don't receive it and the message
+        # is acked here after they return. The failures are nacked by the
+        # caller, like in the inline mode.
+        context = dict(context)
+        ack_func = context.pop('ack_func', None)
+        loop = asyncio.get_running_loop()
+        executor = self.executor(dispatcher.execution_mode)
+        result: Any
+
+        if dispatcher.execution_mode == PROCESS_EXECUTION:
+            result = await loop.run_in_executor(
+                executor,
+                process_operation,
+                operation,
+                message,
+                context,
+                dispatcher.content_type,
+                dispatcher.payload_spec,
+            )
+        else:
+            result = await loop.run_in_executor(
+                executor, functools.partial(operation, payload, **context),
+            )
 
-                    if self.operation_timeout:
-                        try:
-                            while asyncio.iscoroutine(coro):
-                                coro = await asyncio.wait_for(
-                                    coro, timeout=self.operation_timeout
-                                )
-                        except asyncio.TimeoutError:
-                            self.logger.exception(
-                                f'operation timeout: {self.operation_timeout}; '
-                                f'message={event.message[:100]}'
-                            )
-                    else:
-                        while asyncio.iscoroutine(coro):
-                            coro = await coro
-
-                except (orjson.JSONDecodeError, DeserializationError):
-                    self.logger.exception(f"message={event.message[:100]}")
+        while asyncio.iscoroutine(result):
+            result = await result
 
+        if ack_func is not None:
+            await ack_func()
+
+    async def is_duplicate(
+        self, dispatcher: ChannelDispatcher, event: Event, payload: Any
+    ) -> bool:
+        key = self.deduplication_id(dispatcher, event, payload)
+
+        if key is None or await self.get_deduplicator().add(key):
+            return False
+
+        ack_func = getattr(event, 'context', {}).get('ack_func')
+
+        if ack_func is not None:
+            await ack_func()
+
+        return True
+
+    async def forget_duplicate(
+        self, dispatcher: ChannelDispatcher, event: Event, payload: Any
+    ) -> None:
+        key = self.deduplication_id(dispatcher, event, payload)
+
+        if key is not None:
+            await self.get_deduplicator().discard(key)
+
+    def deduplication_id(
+        self, dispatcher: ChannelDispatcher, event: Event, payload: Any
+    ) -> Optional[str]:
+        if dispatcher.deduplication_key is None:
+            key = getattr(event, 'id', None)
+
+        else:
+            if payload is None or isinstance(
+                payload, (bytes, bytearray, memoryview)
+            ):
+                try:
+                    payload = dispatcher.decoder(event.message)
                 except Exception:
-                    self.logger.exception(f"message={event.message[:100]}")
-
-                    if self.republish_error_messages:
-                        republish_channel = (
-                            self.republish_error_messages_channels.get(
-                                channel_id, channel_id
-                            )
-                            if self.republish_error_messages_channels
-                            is not None
-                            else channel_id
-                        )
+                    return None
+
+            key = payload_field(payload, dispatcher.deduplication_key)
+
+        return None if key is None else f'{dispatcher.channel_id}:{key}'
+
+    def get_deduplicator(self) -> Deduplicator:
+        if self.deduplicator is None:
+            self.deduplicator = Deduplicator(
+                self.deduplication_store
+                or LRUDeduplicationStore(
+                    self.deduplication_max_size, self.deduplication_ttl
+                )
+            )
+
+        return self.deduplicator
+
+    def deduplication_stats(self) -> Optional[DeduplicationStats]:
+        return self.deduplicator.stats() if self.deduplicator else None
+
+    async def retry(
+        self,
+        dispatcher: ChannelDispatcher,
+        attempt: int,
+        job: Callable[[int], Coroutine[Any, Any, None]],
+        give_up: OperationJobHint,
+        submit: Optional[OperationSubmitHint] = None,
+    ) -> bool:
+        if (
+            dispatcher.retry is None
+            or attempt >= dispatcher.retry.max_attempts
+        ):
+            return False
+
+        delay = dispatcher.retry.delay(attempt)
+        retry_job = functools.partial(job, attempt + 1)
+
+        # without a submit function the event came from an ordered path,
+        # so it is retried in place to keep its key or partition blocked
+        if submit is None:
+            await asyncio.sleep(delay)
+            await retry_job()
+            return True
+
+        if self.retry_scheduler is None:
+            self.retry_scheduler = RetryScheduler(self.logger)
+            self.retry_scheduler.start()
+
+        self.retry_scheduler.schedule(
+            delay, functools.partial(submit, retry_job), give_up
+        )
+        return True
+
+    def retries_exhausted(
+        self, dispatcher: ChannelDispatcher, attempts: int
+    ) -> bool:
+        return (
+            dispatcher.retry is not None
+            and attempts >= dispatcher.retry.max_attempts
+        )
+
+    async def drop(
+        self, dispatcher: ChannelDispatcher, events: List[Event], attempt: int
+    ) -> None:
+        if dispatcher.dead_letter_channel is not None:
+            return await self.dead_letter(dispatcher, events, [], attempt)
+
+        for event in events:
+            self.logger.warning(
+                f'retries exhausted: {attempt}; '
+                f'message={message_preview(event.message)}'
+            )
+
+        await self.ack(events)
+
+    async def give_up(
+        self,
+        dispatcher: ChannelDispatcher,
+        events: List[Event],
+        payloads: List[Any],
+        attempt: int,
+    ) -> None:
+        if dispatcher.deduplicate:
+            for event in events:
+                await self.forget_duplicate(dispatcher, event, None)
+
+        await self.dead_letter(dispatcher, events, payloads, attempt)
 
-                        try:
-                            await self.publish(republish_channel, payload)
-                        except UnboundLocalError:
-                            await self.publish_json(
-                                republish_channel, json_message
-                            )
-                        except Exception:
-                            self.logger.exception(
-                                f"message={event.message[:100]}"
-                            )
+    async def dead_letter(
+        self,
+        dispatcher: ChannelDispatcher,
+        events: List[Event],
+        payloads: List[Any],
+        attempt: int = 1,
+    ) -> None:
+        if dispatcher.dead_letter_channel is None:
+            if self.republish_error_messages:
+                for payload in payloads:
+                    await self.republish(dispatcher, payload, attempt)
+
+                await self.ack(events)
+            else:
+                await self.nack(events)
+
+            return
+
+        for event in events:
+            try:
+                await self.events_handler.publish(
+                    channel=dispatcher.dead_letter_channel,
+                    message=message_bytes(event.message),
+                    headers={ATTEMPT_HEADER: str(attempt)},
+                )
+            except Exception:
+                self.logger.exception(
+                    f'message={message_preview(event.message)}'
+                )
+            else:
+                await self.ack([event])
+
+    async def ack(self, events: List[Event]) -> None:
+        for event in events:
+            ack_func = getattr(event, 'context', {}).get('ack_func')
+
+            if ack_func is None:
+                continue
+
+            try:
+                await ack_func()
+            except Exception:
+                self.logger.exception(
+                    f'message={message_preview(event.message)}'
+                )
+
+    async def nack(self, events: List[Event]) -> None:
+        for event in events:
+            nack_func = getattr(event, 'nack_func', None)
+
+            # without a nack the message stays unacknowledged, so at-least-once
+            # backends hold its offset and redeliver it
+            if nack_func is None:
+                continue
+
+            try:
+                await nack_func()
+            except Exception:
+                self.logger.exception(
+                    f'message={message_preview(event.message)}'
+                )
+
+    async def republish(
+        self,
+        dispatcher: ChannelDispatcher,
+        payload: Any,
+        attempt: Optional[int] = None,
+    ) -> None:
+        channel_id = dispatcher.error_channel or dispatcher.channel_id
+        kwargs: Dict[str, Any] = {}
+
+        if attempt is not None:
+            kwargs['headers'] = {ATTEMPT_HEADER: str(attempt)}
+
+        try:
+            if isinstance(payload, (bytes, bytearray, memoryview)):
+                await self.events_handler.publish(
+                    channel=channel_id,
+                    message=message_bytes(payload),
+                    **kwargs,
+                )
+            else:
+                await self.publish(channel_id, payload, **kwargs)
+
+        except Exception:
+            self.logger.exception(f"message={payload}")
+
+    def channel_concurrency(self, channel_id: str) -> int:
+        if (
+            self.channels_concurrency is not None
+            and channel_id in self.channels_concurrency
+        ):
+            return self.channels_concurrency[channel_id]
+
+        extensions = self.subscribe_operation(channel_id).extensions
+
+        if extensions and CONCURRENCY_EXTENSION in extensions:
+            return int(extensions[CONCURRENCY_EXTENSION])
+
+        return self.operations_concurrency
+
+    def channel_retry(
+        self, extensions: Dict[str, Any]
+    ) -> Optional[RetryPolicy]:
+        max_attempts = int(
+            extensions.get(
+                RETRY_MAX_ATTEMPTS_EXTENSION, self.retry_max_attempts
+            )
+        )
+
+        if max_attempts <= 1:
+            return None
+
+        return RetryPolicy(
+            max_attempts=max_attempts,
+            backoff=int(
+                extensions.get(
+                    RETRY_BACKOFF_MS_EXTENSION, self.retry_backoff_ms
+                )
+            )
+            / 1000,
+            max_backoff=int(
+                extensions.get(
+                    RETRY_MAX_BACKOFF_MS_EXTENSION, self.retry_max_backoff_ms
+                )
+            )
+            / 1000,
+        )
+
+    def channel_compression(
+        self, channel_id: str
+    ) -> Tuple[Optional[str], int]:
+        compression = self.payload_compression
+        threshold = self.payload_compression_threshold
+        bindings = self.spec.channels[channel_id].bindings or {}
+
+        for binding in bindings.values():
+            if isinstance(binding, dict):
+                compression = binding.get('payload_compression', compression)
+                threshold = int(
+                    binding.get('payload_compression_threshold', threshold)
+                )
+
+        return compression, threshold
+
+    def channel_batch(
+        self, channel_id: str, operation_func: Callable[..., Any]
+    ) -> Optional[Tuple[int, float]]:
+        extensions = self.subscribe_operation(channel_id).extensions or {}
+
+        if (
+            BATCH_SIZE_EXTENSION not in extensions
+            and BATCH_LINGER_MS_EXTENSION not in extensions
+            and not is_batch_operation(operation_func)
+        ):
+            return None
+
+        return (
+            int(extensions.get(BATCH_SIZE_EXTENSION, DEFAULT_BATCH_SIZE)),
+            int(
+                extensions.get(
+                    BATCH_LINGER_MS_EXTENSION, DEFAULT_BATCH_LINGER_MS
+                )
+            )
+            / 1000,
+        )
 
     def publish_operation(self, channel_id: str) -> Operation:
         return self.operation('publish', channel_id)
@@ -187,6 +1216,12 @@ class AsyncApi:
 
     def parse_message(self, channel_id: str, message: Any) -> Any:
         type_ = self.publish_payload_type(channel_id)
+        codec = get_codec(
+            self.message_content_type(self.publish_operation(channel_id))
+        )
+
+        if codec is not JSON_CODEC:
+            return build_codec_encoder(type_, codec)(message)
 
         if type_:
             if issubclass(type_, dict):
@@ -199,6 +1234,12 @@ class AsyncApi:
 
         return message
 
+    def message_content_type(self, operation: Optional[Operation]) -> str:
+        if operation and operation.message and operation.message.content_type:
+            return operation.message.content_type
+
+        return self.spec.default_content_type
+
     def publish_payload_type(self, channel_id: str) -> Any:
         operation = self.publish_operation(channel_id)
 
@@ -218,3 +1259,94 @@ class AsyncApi:
 
 def task_callback(future: Any) -> None:
     future.result()
+
+
+def event_attempts(event: Event) -> int:
+    headers = getattr(event, 'headers', None)
+
+    if not isinstance(headers, dict):
+        return 0
+
+    try:
+        return max(int(headers.get(ATTEMPT_HEADER, 0)), 0)
+    except ValueError:
+        return 0
+
+
+def message_key(dispatcher: ChannelDispatcher, message: Any) -> Optional[str]:
+    if dispatcher.partition_key is None:
+        return None
+
+    key = payload_field(message, dispatcher.partition_key)
+    return None if key is None else str(key)
+
+
+def operation_context(
+    dispatcher: ChannelDispatcher, events: List[Event], batch: bool = False
+) -> Dict[str, Any]:
+    context = {} if batch else getattr(events[0], 'context', {})
+
+    if not dispatcher.operation_headers and not dispatcher.operation_key:
+        return context
+
+    context = dict(context)
+
+    if dispatcher.operation_headers:
+        headers = [getattr(event, 'headers', {}) for event in events]
+        context['headers'] = headers if batch else headers[0]
+
+    if dispatcher.operation_key:
+        keys = [getattr(event, 'key', None) for event in events]
+        context['key'] = keys if batch else keys[0]
+
+    return context
+
+
+def batch_context(events: List[Event]) -> Dict[str, Any]:
+    contexts = [getattr(event, 'context', {}) for event in events]
+    ack_funcs = [
+        context['ack_func'] for context in contexts if 'ack_func' in context
+    ]
+
+    if not ack_funcs:
+        return {}
+
+    async def ack_func() -> None:
+        await asyncio.gather(*(ack() for ack in ack_funcs))
+
+    return {'ack_func': ack_func}
+
+
+def is_batch_operation(operation_func: Callable[..., Any]) -> bool:
+    return get_origin(operation_message_type(operation_func)) is list
+
+
+def operation_task_callback(
+    tasks: Set['asyncio.Task[None]'],
+    semaphore: asyncio.Semaphore,
+    task: 'asyncio.Task[None]',
+) -> None:
+    tasks.discard(task)
+    semaphore.release()
+
+
+@contextlib.asynccontextmanager
+async def operation_tasks(
+    concurrency: int,
+) -> AsyncIterator[OperationSubmitHint]:
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks: Set['asyncio.Task[None]'] = set()
+
+    async def submit(job: OperationJobHint) -> None:
+        await semaphore.acquire()
+        task = asyncio.create_task(job())
+        tasks.add(task)
+        task.add_done_callback(
+            functools.partial(operation_task_callback, tasks, semaphore)
+        )
+
+    try:
+        yield submit
+    finally:
+        if tasks:
+            await asyncio.wait(tasks)
@@ -1,6 +1,8 @@
 """
 asyncapi
 """
+import copy
+import dataclasses
 import importlib
 import io
 from collections import defaultdict, deque
@@ -8,24 +10,34 @@ from typing import Any, DefaultDict, Dict, List, Optional
 
 import requests
 import yaml
-from jsondaora import jsonschema_asdataclass
 
 from .api import AsyncApi, OperationsTypeHint
+from .codecs import content_types
 from .events.handler import EventsHandler
 from .exceptions import (
     EmptyServersError,
     InvalidAsyncApiVersionError,
+    InvalidChannelsConcurrencyError,
     InvalidChannelsSubscribersError,
     InvalidContentTypeError,
+    InvalidPayloadEngineError,
     InvalidServerBindingError,
     InvalidServerBindingProtocolError,
     ReferenceNotFoundError,
     ServerNotFoundError,
 )
+from .payloads import (
+    COMPILED_ENGINE,
+    JSONDAORA_ENGINE,
+    PAYLOAD_ENGINES,
+    build_payload_type,
+)
+from .schema import type_as_jsonschema
 from .specification_v2_0_0 import (
     ASYNCAPI_PYTHON_VERSION,
     ASYNCAPI_VERSION,
     DEFAULT_CONTENT_TYPE,
+    PAYLOAD_ENGINE_EXTENSION,
     Channel,
     Components,
     Info,
@@ -46,12 +58,19 @@ def build_api(
     server_bindings: Optional[str] = None,
     channels_subscribes: Optional[str] = None,
     republish_errors_channels: Optional[str] = None,
+    channels_concurrency: Optional[str] = None,
+    payload_engine: Optional[str] = None,
 ) -> AsyncApi:
-    spec = build_spec_from_path(path)
+    spec = build_spec_from_path(path, payload_engine)
     set_api_spec_server_bindings(spec, server_bindings)
     set_api_spec_channels_subscribes(spec, channels_subscribes)
     return build_api_from_spec(
-        spec, module_name, server, republish_errors, republish_errors_channels
+        spec,
+        module_name,
+        server,
+        republish_errors,
+        republish_errors_channels,
+        channels_concurrency,
     )
 
 
@@ -62,17 +81,27 @@ def build_api_auto_spec(
     server_bindings: Optional[str] = None,
     channels_subscribes: Optional[str] = None,
     republish_errors_channels: Optional[str] = None,
+    channels_concurrency: Optional[str] = None,
+    payload_engine: Optional[str] = None,
 ) -> AsyncApi:
     spec = getattr(importlib.import_module(module_name), 'spec')
     set_api_spec_server_bindings(spec, server_bindings)
     set_api_spec_channels_subscribes(spec, channels_subscribes)
+    set_api_spec_payload_engine(spec, payload_engine)
     return build_api_from_spec(
-        spec, module_name, server, republish_errors, republish_errors_channels
+        spec,
+        module_name,
+        server,
+        republish_errors,
+        republish_errors_channels,
+        channels_concurrency,
     )
 
 
-def build_spec_from_path(path: str) -> Specification:
-    return build_spec(load_spec_dict(path))
+def build_spec_from_path(
+    path: str, payload_engine: Optional[str] = None
+) -> Specification:
+    return build_spec(load_spec_dict(path), payload_engine)
 
 
 def set_api_spec_server_bindings(
@@ -120,6 +149,36 @@ def set_api_spec_server_bindings(
                         server.bindings = {protocol: binding}
 
 
+def set_api_spec_payload_engine(
+    spec: Specification, payload_engine: Optional[str]
+) -> None:
+    if payload_engine is None:
+        return
+
+    validate_payload_engine(payload_engine)
+
+    if payload_engine != COMPILED_ENGINE:
+        return
+
+    for channel in spec.channels.values():
+        operation = channel.subscribe
+
+        if (
+            operation is None
+            or operation.message is None
+            or not dataclasses.is_dataclass(operation.message.payload)
+        ):
+            continue
+
+        message = copy.copy(operation.message)
+        message.payload = build_payload_type(
+            message.payload.__name__,  # type: ignore
+            type_as_jsonschema(message.payload),  # type: ignore
+            payload_engine,
+        )
+        operation.message = message
+
+
 def set_api_spec_channels_subscribes(
     spec: Specification, channels_subscribes: Optional[str]
 ) -> None:
@@ -172,6 +231,7 @@ def set_api_spec_channels_subscribes(
                     bindings=channel.publish.bindings,
                     traits=channel.publish.traits,
                     message=channel.publish.message,
+                    extensions=channel.publish.extensions,
                 )
 
                 if subscribe_channel_name == channel_name:
@@ -194,6 +254,7 @@ def build_api_from_spec(
     server_name: Optional[str],
     republish_errors: Optional[bool],
     republish_errors_channels: Optional[str],
+    channels_concurrency: Optional[str] = None,
 ) -> AsyncApi:
     if spec.servers is None or not spec.servers:
         raise EmptyServersError()
@@ -215,11 +276,11 @@ def build_api_from_spec(
         logger = AsyncApi.logger
 
     operations = build_channel_operations(spec, module_name)
+    bindings = (
+        server.bindings.get(server.protocol, {}) if server.bindings else {}
+    )
     events_handler = EventsHandler(
-        url=f'{server.protocol.value}://{server.url}',
-        bindings=server.bindings.get(server.protocol, {})
-        if server.bindings
-        else {},
+        url=f'{server.protocol.value}://{server.url}', bindings=bindings,
     )
 
     republish_errors_channels_dict: Optional[Dict[str, str]]
@@ -231,10 +292,44 @@ def build_api_from_spec(
     else:
         republish_errors_channels_dict = None
 
-    if republish_errors is not None:
-        kwargs = dict(republish_error_messages=republish_errors)
+    channels_concurrency_dict: Optional[Dict[str, int]]
+    if channels_concurrency is not None:
+        channels_concurrency_dict = {}
+
+        for channel_str in channels_concurrency.split(';'):
+            try:
+                channel_id, concurrency = channel_str.split('=')
+                channels_concurrency_dict[channel_id] = int(concurrency)
+            except ValueError:
+                raise InvalidChannelsConcurrencyError(channel_str)
     else:
-        kwargs = {}
+        channels_concurrency_dict = None
+
+    kwargs: Dict[str, Any] = {}
+
+    if republish_errors is not None:
+        kwargs['republish_error_messages'] = republish_errors
+
+    if 'operations_concurrency' in bindings:
+        kwargs['operations_concurrency'] = int(
+            bindings['operations_concurrency']
+        )
+
+    if 'payload_compression' in bindings:
+        kwargs['payload_compression'] = bindings['payload_compression']
+
+    for int_binding in (
+        'thread_pool_max_workers',
+        'process_pool_max_workers',
+        'retry_max_attempts',
+        'retry_backoff_ms',
+        'retry_max_backoff_ms',
+        'deduplication_max_size',
+        'deduplication_ttl',
+        'payload_compression_threshold',
+    ):
+        if int_binding in bindings:
+            kwargs[int_binding] = int(bindings[int_binding])
 
     return AsyncApi(
         spec,
@@ -242,6 +337,7 @@ def build_api_from_spec(
         events_handler,
         republish_error_messages_channels=republish_errors_channels_dict,
         logger=logger,
+        channels_concurrency=channels_concurrency_dict,
         **kwargs,
     )
 
@@ -288,11 +384,17 @@ def load_spec_dict(path: str) -> Dict[str, Any]:
     return spec
 
 
-def build_spec(spec: Dict[str, Any]) -> Specification:
+def build_spec(
+    spec: Dict[str, Any], payload_engine: Optional[str] = None
+) -> Specification:
     fill_refs(spec)
-    validate_content_type(spec.get('defaultContentType', DEFAULT_CONTENT_TYPE))
+    default_content_type = spec.get('defaultContentType', DEFAULT_CONTENT_TYPE)
+    validate_content_type(default_content_type)
     validate_asyncapi_version(spec.get('asyncapi', ASYNCAPI_VERSION))
 
+    if payload_engine is None:
+        payload_engine = spec.get(PAYLOAD_ENGINE_EXTENSION, JSONDAORA_ENGINE)
+
     return Specification(
         info=Info(**spec['info']),
         servers={
@@ -301,9 +403,12 @@ def build_spec(spec: Dict[str, Any]) -> Specification:
         }
         if 'servers' in spec
         else None,
-        channels=build_channels(spec),
-        components=build_components(spec.get('components')),
+        channels=build_channels(spec, payload_engine),
+        components=build_components(
+            spec.get('components'), payload_engine
+        ),
         tags=build_tags(spec.get('tags')),
+        default_content_type=default_content_type,
     )
 
 
@@ -346,9 +451,17 @@ def build_server_bindings(
 
 
 def validate_content_type(content_type: str) -> None:
-    if content_type != DEFAULT_CONTENT_TYPE:
+    if content_type not in content_types():
         raise InvalidContentTypeError(
-            content_type, f'valid content types: {DEFAULT_CONTENT_TYPE}'
+            content_type, f'valid content types: {", ".join(content_types())}'
+        )
+
+
+def validate_payload_engine(payload_engine: str) -> None:
+    if payload_engine not in PAYLOAD_ENGINES:
+        raise InvalidPayloadEngineError(
+            payload_engine,
+            f'valid payload engines: {", ".join(PAYLOAD_ENGINES)}',
         )
 
 
@@ -363,7 +476,9 @@ def validate_asyncapi_version(asyncapi_version: str) -> None:
         )
 
 
-def build_channels(spec: Dict[str, Any]) -> Dict[str, Channel]:
+def build_channels(
+    spec: Dict[str, Any], payload_engine: str = JSONDAORA_ENGINE
+) -> Dict[str, Channel]:
     channels = {}
     messages = spec.get('components', {}).get('messages', {})
 
@@ -371,10 +486,10 @@ def build_channels(spec: Dict[str, Any]) -> Dict[str, Channel]:
         channels[channel_name] = Channel(
             name=channel_name,
             subscribe=build_operation(
-                channel_spec.pop('subscribe', None), messages
+                channel_spec.pop('subscribe', None), messages, payload_engine
             ),
             publish=build_operation(
-                channel_spec.pop('publish', None), messages
+                channel_spec.pop('publish', None), messages, payload_engine
             ),
             **channel_spec,
         )
@@ -383,7 +498,9 @@ def build_channels(spec: Dict[str, Any]) -> Dict[str, Channel]:
 
 
 def build_operation(
-    operation_spec: Optional[Dict[str, Any]], messages: Dict[str, Any],
+    operation_spec: Optional[Dict[str, Any]],
+    messages: Dict[str, Any],
+    payload_engine: str = JSONDAORA_ENGINE,
 ) -> Optional[Operation]:
     if operation_spec is None:
         return None
@@ -397,41 +514,60 @@ def build_operation(
                 break
 
     return Operation(
-        message=build_message(message_spec) if message_spec else None,
+        message=(
+            build_message(message_spec, payload_engine)
+            if message_spec
+            else None
+        ),
         operation_id=operation_spec.get('operationId'),
         tags=build_tags(operation_spec.get('tags')),
+        extensions=build_extensions(operation_spec),
     )
 
 
-def build_message(message_spec: Dict[str, Any]) -> Message:
+def build_extensions(spec: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    extensions = {k: v for k, v in spec.items() if k.startswith('x-')}
+    return extensions or None
+
+
+def build_message(
+    message_spec: Dict[str, Any], payload_engine: str = JSONDAORA_ENGINE
+) -> Message:
     content_type = message_spec.get('contentType')
+    payload_engine = message_spec.get(PAYLOAD_ENGINE_EXTENSION, payload_engine)
 
     if content_type:
         validate_content_type(content_type)
 
+    validate_payload_engine(payload_engine)
+
     return Message(
         content_type=content_type,
-        payload=jsonschema_asdataclass(
+        payload=build_payload_type(
             message_spec['name'].replace(' ', ''),
             message_spec.get('payload', {}),
+            payload_engine,
         ),
         **{
             k: v
             for k, v in message_spec.items()
-            if k != 'contentType' and k != 'payload'
+            if k != 'contentType'
+            and k != 'payload'
+            and k != PAYLOAD_ENGINE_EXTENSION
         },
     )
 
 
 def build_components(
-    components_spec: Optional[Dict[str, Any]]
+    components_spec: Optional[Dict[str, Any]],
+    payload_engine: str = JSONDAORA_ENGINE,
 ) -> Optional[Components]:
     if components_spec is None:
         return None
 
     return Components(
         messages={
-            msg_id: build_message(message_spec)
+            msg_id: build_message(message_spec, payload_engine)
             for msg_id, message_spec in components_spec['messages'].items()
         }
         if 'messages' in components_spec
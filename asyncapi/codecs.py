@@ -0,0 +1,93 @@
+import dataclasses
+from typing import Any, Callable, Dict, List, Tuple, Type
+
+import orjson
+
+from .exceptions import InvalidContentTypeError, PayloadDecodeError
+
+
+JSON_CONTENT_TYPE = 'application/json'
+MSGPACK_CONTENT_TYPE = 'application/msgpack'
+CBOR_CONTENT_TYPE = 'application/cbor'
+
+
+@dataclasses.dataclass(frozen=True)
+class Codec:
+    loads: Callable[[Any], Any]
+    dumps: Callable[[Any], bytes]
+
+
+CodecFactoryHint = Callable[[], Codec]
+DecodeErrorsHint = Tuple[Type[Exception], ...]
+
+
+def wrap_decode_errors(
+    loads: Callable[[Any], Any], errors: DecodeErrorsHint
+) -> Callable[[Any], Any]:
+    def wrapped_loads(message: Any) -> Any:
+        try:
+            return loads(message)
+        except errors as error:
+            raise PayloadDecodeError(f'{type(error).__name__}: {error}')
+
+    return wrapped_loads
+
+
+JSON_CODEC = Codec(
+    loads=wrap_decode_errors(orjson.loads, (orjson.JSONDecodeError,)),
+    dumps=orjson.dumps,
+)
+
+
+def msgpack_codec() -> Codec:
+    import msgpack
+
+    return Codec(
+        loads=wrap_decode_errors(
+            lambda message: msgpack.unpackb(message, raw=False),
+            (ValueError,),
+        ),
+        dumps=lambda message: msgpack.packb(message, use_bin_type=True),
+    )
+
+
+def cbor_codec() -> Codec:
+    import cbor2
+
+    return Codec(
+        loads=wrap_decode_errors(cbor2.loads, (cbor2.CBORDecodeError,)),
+        dumps=cbor2.dumps,
+    )
+
+
+_codecs: Dict[str, CodecFactoryHint] = {
+    JSON_CONTENT_TYPE: lambda: JSON_CODEC,
+    MSGPACK_CONTENT_TYPE: msgpack_codec,
+    'application/x-msgpack': msgpack_codec,
+    CBOR_CONTENT_TYPE: cbor_codec,
+}
+
+
+def register_codec(
+    content_type: str,
+    loads: Callable[[Any], Any],
+    dumps: Callable[[Any], bytes],
+    decode_errors: DecodeErrorsHint = (ValueError,),
+) -> None:
+    codec = Codec(
+        loads=wrap_decode_errors(loads, decode_errors), dumps=dumps
+    )
+    _codecs[content_type] = lambda: codec
+
+
+def get_codec(content_type: str) -> Codec:
+    try:
+        return _codecs[content_type]()
+    except KeyError:
+        raise InvalidContentTypeError(
+            content_type, f'valid content types: {", ".join(content_types())}'
+        )
+
+
+def content_types() -> List[str]:
+    return list(_codecs)
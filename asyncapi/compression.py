@@ -0,0 +1,90 @@
+import dataclasses
+import gzip
+import zlib
+from typing import Any, Callable, Dict, List
+
+from .exceptions import DecompressedSizeExceededError, InvalidCompressionError
+
+
+CONTENT_ENCODING_HEADER = 'content-encoding'
+GZIP_COMPRESSION = 'gzip'
+ZSTD_COMPRESSION = 'zstd'
+LZ4_COMPRESSION = 'lz4'
+
+
+@dataclasses.dataclass(frozen=True)
+class Compressor:
+    name: str
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[Any, int], bytes]
+
+
+def gzip_compressor() -> Compressor:
+    return Compressor(
+        name=GZIP_COMPRESSION,
+        compress=lambda data: gzip.compress(data, compresslevel=6),
+        decompress=gzip_decompress,
+    )
+
+
+def gzip_decompress(data: Any, max_size: int) -> bytes:
+    decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+    return check_size(decompressor.decompress(data, max_size + 1), max_size)
+
+
+def zstd_compressor() -> Compressor:
+    import zstandard
+
+    compressor = zstandard.ZstdCompressor()
+    decompressor = zstandard.ZstdDecompressor()
+
+    return Compressor(
+        name=ZSTD_COMPRESSION,
+        compress=compressor.compress,
+        decompress=lambda data, max_size: check_size(
+            decompressor.stream_reader(bytes(data)).read(max_size + 1),
+            max_size,
+        ),
+    )
+
+
+def lz4_compressor() -> Compressor:
+    import lz4.frame
+
+    return Compressor(
+        name=LZ4_COMPRESSION,
+        compress=lz4.frame.compress,
+        decompress=lambda data, max_size: check_size(
+            lz4.frame.LZ4FrameDecompressor().decompress(
+                data, max_length=max_size + 1
+            ),
+            max_size,
+        ),
+    )
+
+
+def check_size(data: bytes, max_size: int) -> bytes:
+    if len(data) > max_size:
+        raise DecompressedSizeExceededError(f'max_size={max_size}')
+
+    return data
+
+
+_compressors: Dict[str, Callable[[], Compressor]] = {
+    GZIP_COMPRESSION: gzip_compressor,
+    ZSTD_COMPRESSION: zstd_compressor,
+    LZ4_COMPRESSION: lz4_compressor,
+}
+
+
+def get_compressor(name: str) -> Compressor:
+    try:
+        return _compressors[name]()
+    except KeyError:
+        raise InvalidCompressionError(
+            name, f'valid compressions: {", ".join(compressions())}'
+        )
+
+
+def compressions() -> List[str]:
+    return list(_compressors)
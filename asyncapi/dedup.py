@@ -0,0 +1,85 @@
+import abc
+import dataclasses
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class DeduplicationStore(abc.ABC):
+    @abc.abstractmethod
+    async def add(self, key: str) -> bool:
+        ...
+
+    @abc.abstractmethod
+    async def discard(self, key: str) -> None:
+        ...
+
+
+class LRUDeduplicationStore(DeduplicationStore):
+    def __init__(self, max_size: int, ttl: float):
+        self._keys: 'OrderedDict[str, float]' = OrderedDict()
+        self._max_size = max_size
+        self._ttl = ttl
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    async def add(self, key: str) -> bool:
+        now = time.monotonic()
+        expires_at = self._keys.get(key)
+
+        if expires_at is not None and expires_at > now:
+            self._keys.move_to_end(key)
+            return False
+
+        self._keys[key] = now + self._ttl
+        self._keys.move_to_end(key)
+
+        while len(self._keys) > self._max_size:
+            self._keys.popitem(last=False)
+
+        while self._keys and next(iter(self._keys.values())) <= now:
+            self._keys.popitem(last=False)
+
+        return True
+
+    async def discard(self, key: str) -> None:
+        self._keys.pop(key, None)
+
+
+@dataclasses.dataclass
+class DeduplicationStats:
+    hits: int
+    misses: int
+    size: Optional[int]
+
+
+class Deduplicator:
+    def __init__(self, store: DeduplicationStore):
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+
+    async def add(self, key: str) -> bool:
+        added = await self.store.add(key)
+
+        if added:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return added
+
+    async def discard(self, key: str) -> None:
+        await self.store.discard(key)
+
+    def stats(self) -> DeduplicationStats:
+        return DeduplicationStats(
+            hits=self.hits,
+            misses=self.misses,
+            size=(
+                len(self.store)
+                if isinstance(self.store, LRUDeduplicationStore)
+                else None
+            ),
+        )
@@ -0,0 +1,161 @@
+import dataclasses
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Optional,
+    Tuple,
+    Type,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+from jsondaora import asdataclass, dataclass_asjson, typed_dict_asjson
+
+from .codecs import JSON_CODEC, JSON_CONTENT_TYPE, Codec
+from .compression import Compressor
+from .exceptions import InvalidMessageError
+from .payloads import PayloadSpecHint
+from .retry import RetryPolicy
+
+
+DecoderHint = Callable[[Any], Any]
+EncoderHint = Callable[[Any], Any]
+JsonEncoderHint = Callable[[Dict[str, Any]], Any]
+
+
+@dataclasses.dataclass(frozen=True)
+class ChannelDispatcher:
+    channel_id: str
+    decoder: DecoderHint
+    encoder: Optional[EncoderHint] = None
+    json_encoder: Optional[JsonEncoderHint] = None
+    operation: Optional[Callable[..., Any]] = None
+    error_channel: Optional[str] = None
+    concurrency: int = 1
+    batch: Optional[Tuple[int, float]] = None
+    ordering_key: Optional[str] = None
+    ordering_header: Optional[str] = None
+    lane_depth: int = 1
+    execution_mode: str = 'inline'
+    retry: Optional[RetryPolicy] = None
+    dead_letter_channel: Optional[str] = None
+    deduplicate: bool = False
+    deduplication_key: Optional[str] = None
+    content_type: str = JSON_CONTENT_TYPE
+    compressor: Optional[Compressor] = None
+    compression_threshold: int = 0
+    partition_key: Optional[str] = None
+    operation_headers: bool = False
+    operation_key: bool = False
+    payload_spec: Optional[PayloadSpecHint] = None
+
+
+def operation_message_type(
+    operation: Callable[..., Any], unwrap_list: bool = False
+) -> Any:
+    try:
+        type_hints = get_type_hints(operation)
+    except TypeError:
+        return None
+
+    type_hints.pop('return', None)
+    message_type = type_hints.get(
+        'message', next(iter(type_hints.values()), None)
+    )
+
+    if unwrap_list and get_origin(message_type) is list:
+        return get_args(message_type)[0]
+
+    return message_type
+
+
+def payload_field(payload: Any, field_name: str) -> Any:
+    if isinstance(payload, dict):
+        return payload.get(field_name)
+
+    return getattr(payload, field_name, None)
+
+
+def build_decoder(
+    type_: Optional[Type[Any]], codec: Codec = JSON_CODEC
+) -> DecoderHint:
+    loads = codec.loads
+    decode = getattr(type_, '__decode__', None)
+
+    if decode is not None:
+        compiled_decode = decode
+
+        def compiled_decoder(message: Any) -> Any:
+            return compiled_decode(loads(message))
+
+        return compiled_decoder
+
+    if type_ and dataclasses.is_dataclass(type_):
+        payload_type = type_
+
+        def decoder(message: Any) -> Any:
+            return asdataclass(loads(message), payload_type)
+
+        return decoder
+
+    return loads
+
+
+def build_encoder(
+    type_: Optional[Type[Any]], codec: Codec = JSON_CODEC
+) -> EncoderHint:
+    if codec is not JSON_CODEC:
+        return build_codec_encoder(type_, codec)
+
+    if type_ is None:
+        return lambda message: message
+
+    payload_type = type_
+
+    if issubclass(payload_type, dict):
+        return lambda message: typed_dict_asjson(message, payload_type)
+
+    def encoder(message: Any) -> Any:
+        if not isinstance(message, payload_type):
+            raise InvalidMessageError(message, payload_type)
+
+        return dataclass_asjson(message)
+
+    return encoder
+
+
+def build_codec_encoder(
+    type_: Optional[Type[Any]], codec: Codec
+) -> EncoderHint:
+    dumps = codec.dumps
+
+    if type_ is None or issubclass(type_, dict):
+        return dumps
+
+    payload_type = type_
+
+    def encoder(message: Any) -> Any:
+        if not isinstance(message, payload_type):
+            raise InvalidMessageError(message, payload_type)
+
+        return dumps(dataclasses.asdict(message))
+
+    return encoder
+
+
+def build_json_encoder(
+    type_: Optional[Type[Any]], encoder: EncoderHint
+) -> JsonEncoderHint:
+    decode = getattr(type_, '__decode__', None)
+
+    if decode is not None:
+        compiled_decode = decode
+        return lambda message: encoder(compiled_decode(message))
+
+    if type_ and dataclasses.is_dataclass(type_):
+        payload_type = type_
+        return lambda message: encoder(asdataclass(message, payload_type))
+
+    return encoder
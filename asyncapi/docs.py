@@ -180,7 +180,12 @@ def _spec_asjson(generic_value: Any) -> Any:
                 getattr(generic_value, field.name, None)
             )
 
-            if field_value is not None and field_value != '':
+            if field_value is None or field_value == '':
+                continue
+
+            if field.name == 'extensions':
+                json_value.update(field_value)
+            else:
                 json_value[as_camel_case(field.name)] = field_value
 
     elif isinstance(generic_value, dict):
@@ -1,18 +1,52 @@
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
 from broadcaster import Event as BroadcasterEvent
 
 
+MESSAGE_PREVIEW_SIZE = 100
+PublishManyHint = Tuple[Any, Optional[Dict[str, str]], Optional[str]]
+
+
 class Event(BroadcasterEvent):
     def __init__(
         self,
         channel: str,
         message: Any,
         context: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        id: Optional[str] = None,
+        nack_func: Optional[Callable[[], Awaitable[Any]]] = None,
+        partition: Optional[Any] = None,
+        key: Optional[str] = None,
     ):
         super().__init__(channel, message)
 
         if context is None:
             context = {}
 
+        if headers is None:
+            headers = {}
+
         self.context = context
+        self.headers = headers
+        self.id = id
+        self.nack_func = nack_func
+        self.partition = partition
+        self.key = key
+
+
+def message_preview(message: Any, size: int = MESSAGE_PREVIEW_SIZE) -> str:
+    if isinstance(message, (bytes, bytearray, memoryview)):
+        return bytes(message[:size]).decode(errors='replace')
+
+    return str(message[:size])
+
+
+def message_bytes(message: Any) -> bytes:
+    if isinstance(message, bytes):
+        return message
+
+    if isinstance(message, str):
+        return message.encode()
+
+    return bytes(message)
@@ -0,0 +1,290 @@
+import asyncio
+import gzip
+from types import SimpleNamespace
+
+import asynctest
+import pytest
+
+from asyncapi import Event, EventsHandler
+from asyncapi.exceptions import ChannelDispatcherAlreadyRegisteredError
+
+
+class FakeBackend:
+    def __init__(self, message=b'fake', headers=None):
+        self.message = message
+        self.headers = headers
+        self.published_messages = []
+        self.published = 0
+        self.paused = 0
+        self.resumed = 0
+
+    async def connect(self):
+        ...
+
+    async def disconnect(self):
+        ...
+
+    async def subscribe(self, channel):
+        ...
+
+    async def unsubscribe(self, channel):
+        ...
+
+    async def next_published(self):
+        self.published += 1
+        await asyncio.sleep(0)
+        return Event('fake', self.message, headers=dict(self.headers or {}))
+
+    async def publish(self, channel, message, headers=None, key=None):
+        self.published_messages.append((channel, message, headers, key))
+
+    def pause(self):
+        self.paused += 1
+
+    def resume(self):
+        self.resumed += 1
+
+
+def build_handler(bindings, backend):
+    handler = EventsHandler('kafka://fake.fake', bindings)
+    handler._backend = backend
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_should_pause_backend_on_queue_high_watermark():
+    backend = FakeBackend()
+    handler = build_handler(
+        {
+            'subscriber_queue_high_watermark': '4',
+            'subscriber_queue_low_watermark': '1',
+        },
+        backend,
+    )
+
+    async with handler:
+        async with handler.subscribe('fake') as subscriber:
+            await asyncio.sleep(0.01)
+
+            assert backend.published == 4
+            assert backend.paused == 1
+
+            for _ in range(3):
+                await subscriber.get()
+
+            assert backend.resumed == 1
+
+            await asyncio.sleep(0.01)
+
+            assert backend.published == 7
+
+
+@pytest.mark.asyncio
+async def test_should_pause_backend_on_channel_max_inflight_bytes():
+    backend = FakeBackend(message=b'x' * 6)
+    handler = build_handler({'channel_max_inflight_bytes': '10'}, backend)
+
+    async with handler:
+        async with handler.subscribe('fake') as subscriber:
+            await asyncio.sleep(0.01)
+
+            assert backend.published == 2
+            assert backend.paused == 1
+
+            await subscriber.get()
+
+            assert backend.resumed == 1
+
+
+@pytest.mark.asyncio
+async def test_should_decompress_messages_by_content_encoding_header():
+    backend = FakeBackend(
+        gzip.compress(b'fake'), headers={'content-encoding': 'gzip'}
+    )
+    handler = build_handler({}, backend)
+
+    async with handler:
+        async with handler.subscribe('fake') as subscriber:
+            event = await subscriber.get()
+
+    assert event.message == b'fake'
+    assert event.headers == {}
+
+
+@pytest.mark.asyncio
+async def test_should_decompress_large_messages_in_executor():
+    backend = FakeBackend(
+        gzip.compress(b'fake'), headers={'content-encoding': 'gzip'}
+    )
+    handler = build_handler({'decompress_executor_bytes': '1'}, backend)
+
+    async with handler:
+        async with handler.subscribe('fake') as subscriber:
+            event = await subscriber.get()
+
+    assert event.message == b'fake'
+
+
+@pytest.mark.parametrize(
+    'bindings,message',
+    [
+        ({}, b'invalid'),
+        ({'max_decompressed_bytes': '3'}, gzip.compress(b'fake')),
+    ],
+)
+@pytest.mark.asyncio
+async def test_should_drop_and_ack_undecompressable_messages(
+    bindings, message
+):
+    backend = FakeBackend(message, headers={'content-encoding': 'gzip'})
+    handler = build_handler(bindings, backend)
+    handler._logger = SimpleNamespace(exception=lambda *args: ...)
+    acked = []
+    next_published = backend.next_published
+
+    async def next_published_with_ack():
+        event = await next_published()
+        event.context['ack_func'] = asynctest.CoroutineMock(
+            side_effect=lambda: acked.append(event)
+        )
+        return event
+
+    backend.next_published = next_published_with_ack
+
+    async with handler:
+        async with handler.subscribe('fake') as subscriber:
+            await asyncio.sleep(0.01)
+
+            assert subscriber._queue.empty()
+
+    assert acked
+    assert handler._inflight_bytes['fake'] == 0
+
+
+@pytest.mark.asyncio
+async def test_should_publish_headers_to_backend():
+    backend = FakeBackend()
+    handler = build_handler({}, backend)
+
+    await handler.publish('fake', b'fake', headers={'fake': 'header'})
+    await handler.publish('fake', b'fake', key='fake-key')
+    await handler.publish('fake', b'fake')
+
+    assert backend.published_messages == [
+        ('fake', b'fake', {'fake': 'header'}, None),
+        ('fake', b'fake', None, 'fake-key'),
+        ('fake', b'fake', None, None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_should_publish_many_through_single_publishes_as_fallback():
+    backend = FakeBackend()
+    handler = build_handler({}, backend)
+
+    errors = await handler.publish_many(
+        'fake',
+        [(b'fake1', {'fake': 'header'}, None), (b'fake2', None, 'fake-key')],
+    )
+
+    assert errors == [None, None]
+    assert backend.published_messages == [
+        ('fake', b'fake1', {'fake': 'header'}, None),
+        ('fake', b'fake2', None, 'fake-key'),
+    ]
+
+
+class FakeBatchBackend(FakeBackend):
+    fetch_many = True
+
+    async def next_published_many(self):
+        self.published += 1
+        await asyncio.sleep(0)
+        return [
+            Event('fake', b'fake1'),
+            Event('other', b'other'),
+            Event(
+                'fake',
+                gzip.compress(b'fake2'),
+                headers={'content-encoding': 'gzip'},
+            ),
+        ]
+
+
+@pytest.mark.asyncio
+async def test_should_forward_batches_to_subscribers():
+    backend = FakeBatchBackend()
+    handler = build_handler({'subscriber_queue_high_watermark': '2'}, backend)
+
+    async with handler:
+        async with handler.subscribe('fake') as subscriber:
+            await asyncio.sleep(0.01)
+
+            assert backend.published == 2
+            assert backend.paused == 1
+            assert handler._inflight_bytes['fake'] == 20
+
+            first = await subscriber.get()
+            events = await subscriber.get_many(10)
+
+    assert first.message == b'fake1'
+    assert [event.message for event in events] == [b'fake2']
+    assert handler._inflight_bytes['fake'] == 0
+
+
+@pytest.mark.asyncio
+async def test_should_release_subscriber_on_error():
+    backend = FakeBackend()
+    handler = build_handler(
+        {
+            'subscriber_queue_high_watermark': '4',
+            'channel_max_inflight_bytes': '12',
+        },
+        backend,
+    )
+    backend.unsubscribe = asynctest.CoroutineMock()
+
+    async with handler:
+        with pytest.raises(RuntimeError):
+            async with handler.subscribe('fake'):
+                await asyncio.sleep(0.01)
+
+                assert backend.paused == 1
+                assert handler._inflight_bytes['fake'] == 12
+
+                raise RuntimeError()
+
+        assert 'fake' not in handler._subscribers
+        assert handler._inflight_bytes['fake'] == 0
+        assert backend.resumed == 1
+        backend.unsubscribe.assert_awaited_once_with('fake')
+
+
+@pytest.mark.asyncio
+async def test_should_dispatch_events_directly():
+    backend = FakeBackend(
+        gzip.compress(b'fake'), headers={'content-encoding': 'gzip'}
+    )
+    handler = build_handler({'subscriber_direct_dispatch': 'true'}, backend)
+    dispatched = []
+
+    async def dispatcher(event):
+        dispatched.append(event.message)
+
+        if len(dispatched) == 2:
+            raise RuntimeError('fake')
+
+    await handler.connect()
+    task = asyncio.create_task(handler.dispatch('fake', dispatcher))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(ChannelDispatcherAlreadyRegisteredError):
+        await handler.dispatch('fake', dispatcher)
+
+    await handler.disconnect()
+    await task
+
+    assert handler.direct_dispatch
+    assert len(dispatched) > 2
+    assert set(dispatched) == {b'fake'}
+    assert not handler._dispatchers
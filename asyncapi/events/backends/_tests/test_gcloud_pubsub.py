@@ -0,0 +1,726 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import pytest
+
+from asyncapi import (
+    GCloudPubSubConsumerDisconnectError,
+    GCloudPubSubInvalidConsumerModeError,
+    GCloudPubSubPublishTimeoutError,
+    GCloudPubSubReservedAttributeError,
+)
+from asyncapi.events.backends.gcloud_pubsub import (
+    AckBatcher,
+    BatchSettings,
+    FlowControl,
+    GCloudPubSubBackend,
+    LeaseManager,
+    LimitExceededBehavior,
+    PublishFlowControl,
+    PublisherOptions,
+)
+
+
+class FakeProducer:
+    def __init__(self, **kwargs):
+        self.futures = []
+        self.published = []
+        self.resumed = []
+
+    def topic_path(self, project, channel):
+        return f'projects/{project}/topics/{channel}'
+
+    def publish(self, topic, message, ordering_key='', **attrs):
+        if ordering_key:
+            attrs['ordering_key'] = ordering_key
+
+        future = Future()
+        self.futures.append(future)
+        self.published.append((topic, message, attrs))
+        return future
+
+    def resume_publish(self, topic, ordering_key):
+        self.resumed.append((topic, ordering_key))
+
+    def stop(self):
+        ...
+
+
+class FakeConsumer:
+    def __init__(self):
+        self.streaming_pulls = {}
+        self.pull_responses = []
+        self.subscriptions_pull_responses = {}
+        self.pulls = []
+        self.modified_ack_deadlines = []
+        self.acknowledged = []
+
+    def subscription_path(self, project, channel):
+        return f'projects/{project}/subscriptions/{channel}'
+
+    def subscribe(self, subscription, callback, flow_control):
+        streaming_pull = Future()
+        self.streaming_pulls[subscription] = (
+            streaming_pull,
+            callback,
+            flow_control,
+        )
+        return streaming_pull
+
+    def pull(self, subscription, max_messages, return_immediately):
+        self.pulls.append((subscription, max_messages))
+        pull_responses = self.subscriptions_pull_responses.get(
+            subscription, self.pull_responses
+        )
+        received_messages = pull_responses.pop(0) if pull_responses else []
+        return SimpleNamespace(received_messages=received_messages)
+
+    def acknowledge(self, subscription, ack_ids):
+        self.acknowledged.append((subscription, ack_ids))
+
+    def modify_ack_deadline(self, subscription, ack_ids, seconds):
+        self.modified_ack_deadlines.append((subscription, ack_ids, seconds))
+
+    def close(self):
+        ...
+
+
+class FakeMessage:
+    def __init__(
+        self, data, attributes=None, message_id='fake-id', ordering_key=''
+    ):
+        self.data = data
+        self.attributes = attributes or {}
+        self.message_id = message_id
+        self.ordering_key = ordering_key
+        self.acked = 0
+
+    def ack(self):
+        self.acked += 1
+
+
+def received_message(data):
+    return SimpleNamespace(
+        ack_id=f'ack-{data.decode()}',
+        message=SimpleNamespace(
+            data=data,
+            attributes={},
+            message_id=data.decode(),
+            ordering_key='',
+        ),
+    )
+
+
+@pytest.fixture(autouse=True)
+def fake_pubsub(mocker):
+    pubsub = mocker.patch(
+        'asyncapi.events.backends.gcloud_pubsub.pubsub_v1'
+    )
+    pubsub.PublisherClient.side_effect = FakeProducer
+    pubsub.SubscriberClient.side_effect = FakeConsumer
+    return pubsub
+
+
+@pytest.fixture
+def backend():
+    return GCloudPubSubBackend(
+        'gcloud-pubsub://fake-project',
+        bindings={
+            'publish_timeout': '0.05',
+            'publish_retries': '3',
+            'publish_retry_backoff': '0.001',
+            'publish_max_inflight': '2',
+            'consumer_lease_interval': '0',
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_should_publish_without_blocking_the_loop(backend):
+    await backend.connect()
+    task = asyncio.create_task(
+        backend.publish('fake', b'fake', headers={'fake': 'header'})
+    )
+    await asyncio.sleep(0)
+
+    assert not task.done()
+    assert backend._producer.published == [
+        ('projects/fake-project/topics/fake', b'fake', {'fake': 'header'})
+    ]
+
+    backend._producer.futures[0].set_result('fake-id')
+    await task
+
+
+@pytest.mark.asyncio
+async def test_should_publish_key_as_ordering_key():
+    backend = GCloudPubSubBackend(
+        'gcloud-pubsub://fake-project',
+        bindings={'publish_message_ordering': 'true'},
+    )
+    await backend.connect()
+    task = asyncio.create_task(
+        backend.publish('fake', b'fake', headers={'a': 'b'}, key='fake-key')
+    )
+    await asyncio.sleep(0)
+    backend._producer.futures[0].set_result('fake-id')
+    await task
+
+    assert backend._publisher_options.enable_message_ordering
+    assert backend._producer.published == [
+        (
+            'projects/fake-project/topics/fake',
+            b'fake',
+            {'a': 'b', 'ordering_key': 'fake-key'},
+        )
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('attribute', ['ordering_key', 'retry', 'timeout'])
+async def test_should_not_publish_reserved_attributes(backend, attribute):
+    await backend.connect()
+
+    with pytest.raises(GCloudPubSubReservedAttributeError):
+        await backend.publish('fake', b'fake', headers={attribute: 'fake'})
+
+    assert backend._producer.published == []
+
+
+@pytest.mark.asyncio
+async def test_should_resume_ordering_key_on_publish_error():
+    backend = GCloudPubSubBackend(
+        'gcloud-pubsub://fake-project',
+        bindings={'publish_message_ordering': 'true'},
+    )
+    await backend.connect()
+    task = asyncio.create_task(
+        backend.publish('fake', b'fake', key='fake-key')
+    )
+    await asyncio.sleep(0)
+    backend._producer.futures[0].set_exception(RuntimeError())
+
+    with pytest.raises(RuntimeError):
+        await task
+
+    assert backend._producer.resumed == [
+        ('projects/fake-project/topics/fake', 'fake-key')
+    ]
+
+
+@pytest.mark.asyncio
+async def test_should_not_publish_ordering_key_without_message_ordering(
+    backend,
+):
+    await backend.connect()
+    task = asyncio.create_task(
+        backend.publish('fake', b'fake', key='fake-key')
+    )
+    await asyncio.sleep(0)
+    backend._producer.futures[0].set_result('fake-id')
+    await task
+
+    assert backend._producer.published == [
+        ('projects/fake-project/topics/fake', b'fake', {})
+    ]
+
+
+@pytest.mark.asyncio
+async def test_should_limit_inflight_publishes(backend):
+    await backend.connect()
+    tasks = [
+        asyncio.create_task(backend.publish('fake', b'fake'))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+
+    assert len(backend._producer.futures) == 2
+
+    backend._producer.futures[0].set_result('fake-id')
+    await asyncio.sleep(0.01)
+
+    assert len(backend._producer.futures) == 3
+
+    for future in backend._producer.futures[1:]:
+        future.set_result('fake-id')
+
+    await asyncio.gather(*tasks)
+
+
+@pytest.mark.asyncio
+async def test_should_retry_publish_on_timeout(backend):
+    await backend.connect()
+    with pytest.raises(GCloudPubSubPublishTimeoutError):
+        await backend.publish('fake', b'fake')
+
+    assert len(backend._producer.futures) == 3
+
+
+@pytest.mark.asyncio
+async def test_should_raise_publish_error(backend):
+    await backend.connect()
+    task = asyncio.create_task(backend.publish('fake', b'fake'))
+    await asyncio.sleep(0)
+    backend._producer.futures[0].set_exception(ValueError('fake'))
+
+    with pytest.raises(ValueError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_should_publish_many_with_per_message_errors(backend):
+    await backend.connect()
+    task = asyncio.create_task(
+        backend.publish_many(
+            'fake',
+            [(b'fake1', None, None), (b'fake2', {'fake': 'header'}, None)],
+        )
+    )
+    await asyncio.sleep(0.01)
+    backend._producer.futures[0].set_result('fake-id')
+    backend._producer.futures[1].set_exception(ValueError('fake'))
+
+    errors = await task
+
+    assert errors[0] is None
+    assert isinstance(errors[1], ValueError)
+    assert backend._producer.published[1][2] == {'fake': 'header'}
+
+
+@pytest.mark.asyncio
+async def test_should_connect_producer_with_batch_and_flow_control(
+    fake_pubsub, mocker
+):
+    backend = GCloudPubSubBackend(
+        'gcloud-pubsub://fake-project',
+        bindings={
+            'publish_batch_max_bytes': '1000',
+            'publish_batch_max_latency': '0.05',
+            'publish_batch_max_messages': '500',
+            'publish_flow_control_max_messages': '2000',
+            'publish_flow_control_max_bytes': '4000000',
+            'publish_flow_control_limit_exceeded': 'block',
+        },
+    )
+
+    await backend.connect()
+
+    assert fake_pubsub.PublisherClient.call_args_list == [
+        mocker.call(
+            batch_settings=BatchSettings(
+                max_bytes=1000, max_latency=0.05, max_messages=500
+            ),
+            publisher_options=PublisherOptions(
+                flow_control=PublishFlowControl(
+                    message_limit=2000,
+                    byte_limit=4000000,
+                    limit_exceeded_behavior=LimitExceededBehavior.BLOCK,
+                )
+            ),
+        )
+    ]
+
+
+@pytest.mark.asyncio
+async def test_should_publish_from_executor_when_flow_control_blocks(
+    fake_pubsub,
+):
+    backend = GCloudPubSubBackend(
+        'gcloud-pubsub://fake-project',
+        bindings={'publish_flow_control_limit_exceeded': 'block'},
+    )
+    await backend.connect()
+    task = asyncio.create_task(backend.publish('fake', b'fake'))
+    await asyncio.sleep(0.01)
+
+    backend._producer.futures[0].set_result('fake-id')
+    await task
+
+    assert backend._producer.published == [
+        ('projects/fake-project/topics/fake', b'fake', {})
+    ]
+
+
+@pytest.fixture
+def streaming_backend():
+    return GCloudPubSubBackend(
+        'gcloud-pubsub://fake-project',
+        bindings={
+            'consumer_mode': 'streaming-pull',
+            'consumer_max_outstanding_messages': '10',
+            'consumer_max_outstanding_bytes': '1000',
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_should_consume_from_streaming_pull(streaming_backend):
+    await streaming_backend.connect()
+    await streaming_backend.subscribe('fake')
+    (_, callback, flow_control) = streaming_backend._consumer.streaming_pulls[
+        'projects/fake-project/subscriptions/fake'
+    ]
+    message = FakeMessage(b'fake', {'fake': 'header'}, ordering_key='key')
+    thread = threading.Thread(target=callback, args=(message,))
+    thread.start()
+    thread.join()
+
+    event = await asyncio.wait_for(streaming_backend.next_published(), 1)
+
+    assert flow_control == FlowControl(max_messages=10, max_bytes=1000)
+    assert event.channel == 'fake'
+    assert event.message == b'fake'
+    assert event.headers == {'fake': 'header'}
+    assert event.id == 'fake-id'
+    assert event.key == 'key'
+    assert not message.acked
+
+    await event.context['ack_func']()
+
+    assert message.acked == 1
+
+
+@pytest.mark.asyncio
+async def test_should_restart_failed_streaming_pull(streaming_backend):
+    streaming_backend._logger = SimpleNamespace(
+        error=lambda *args, **kwargs: ..., info=lambda *args: ...
+    )
+    await streaming_backend.connect()
+    await streaming_backend.subscribe('fake')
+    consumer = streaming_backend._consumer
+    subscription = 'projects/fake-project/subscriptions/fake'
+    (streaming_pull, _, _) = consumer.streaming_pulls[subscription]
+
+    streaming_pull.set_exception(RuntimeError())
+    await asyncio.sleep(0.05)
+
+    (restarted_pull, _, _) = consumer.streaming_pulls[subscription]
+
+    assert restarted_pull is not streaming_pull
+    assert streaming_backend._streaming_pulls['fake'] is restarted_pull
+    assert streaming_backend._streaming_pull_restarts == {'fake': 1}
+
+    await streaming_backend.disconnect()
+
+    assert restarted_pull.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_should_not_restart_unsubscribed_streaming_pull(
+    streaming_backend,
+):
+    streaming_backend._logger = SimpleNamespace(
+        error=lambda *args, **kwargs: ..., info=lambda *args: ...
+    )
+    await streaming_backend.connect()
+    await streaming_backend.subscribe('fake')
+    consumer = streaming_backend._consumer
+    subscription = 'projects/fake-project/subscriptions/fake'
+    (streaming_pull, _, _) = consumer.streaming_pulls[subscription]
+
+    streaming_pull.set_exception(RuntimeError())
+    await streaming_backend.unsubscribe('fake')
+    await asyncio.sleep(0.05)
+
+    assert consumer.streaming_pulls[subscription][0] is streaming_pull
+    assert not streaming_backend._streaming_pulls
+
+    await streaming_backend.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_should_stop_streaming_pull_on_disconnect(streaming_backend):
+    await streaming_backend.connect()
+    await streaming_backend.subscribe('fake')
+    consumer = streaming_backend._consumer
+    (streaming_pull, _, _) = consumer.streaming_pulls[
+        'projects/fake-project/subscriptions/fake'
+    ]
+
+    await streaming_backend.disconnect()
+
+    assert streaming_pull.cancelled()
+
+    with pytest.raises(GCloudPubSubConsumerDisconnectError):
+        await streaming_backend.next_published()
+
+
+def test_should_not_build_backend_for_invalid_consumer_mode():
+    with pytest.raises(GCloudPubSubInvalidConsumerModeError):
+        GCloudPubSubBackend(
+            'gcloud-pubsub://fake-project', bindings={'consumer_mode': 'fake'}
+        )
+
+
+def build_pull_backend(**bindings):
+    return GCloudPubSubBackend(
+        'gcloud-pubsub://fake-project',
+        bindings={
+            'consumer_wait_time': '0.001',
+            'pull_message_wait_time': '0',
+            'consumer_lease_interval': '0',
+            **bindings,
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_should_drain_prefetched_messages_before_pulling():
+    backend = build_pull_backend(consumer_max_messages='3')
+    await backend.connect()
+    await backend.subscribe('fake')
+    backend._consumer.pull_responses.append(
+        [received_message(b'1'), received_message(b'2')]
+    )
+
+    events = [await backend.next_published() for _ in range(2)]
+
+    assert [event.message for event in events] == [b'1', b'2']
+    assert backend._consumer.pulls == [
+        ('projects/fake-project/subscriptions/fake', 3)
+    ]
+
+    await backend.unsubscribe('fake')
+    await backend.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_should_refill_prefetch_buffer_below_threshold():
+    backend = build_pull_backend(
+        consumer_max_messages='2',
+        consumer_prefetch_size='4',
+        consumer_prefetch_refill_threshold='2',
+    )
+    await backend.connect()
+    await backend.subscribe('fake')
+    backend._consumer.pull_responses.extend(
+        [
+            [received_message(b'1'), received_message(b'2')],
+            [received_message(b'3'), received_message(b'4')],
+        ]
+    )
+
+    event = await backend.next_published()
+    await asyncio.sleep(0.01)
+
+    assert event.message == b'1'
+    assert [message for _, message in backend._consumer.pulls] == [2, 2]
+    assert [
+        message.message.data for _, message in backend._prefetched['fake']
+    ] == [b'2', b'3', b'4']
+
+    await backend.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_should_expire_prefetched_messages_near_ack_deadline():
+    backend = build_pull_backend(
+        consumer_max_messages='2', consumer_prefetch_max_age='0.01'
+    )
+    await backend.connect()
+    await backend.subscribe('fake')
+    backend._consumer.pull_responses.extend(
+        [
+            [received_message(b'1'), received_message(b'2')],
+            [received_message(b'3')],
+        ]
+    )
+
+    first_event = await backend.next_published()
+    await asyncio.sleep(0.02)
+    second_event = await backend.next_published()
+    await asyncio.sleep(0.01)
+
+    assert first_event.message == b'1'
+    assert second_event.message == b'3'
+    assert backend._consumer.modified_ack_deadlines == [
+        ('projects/fake-project/subscriptions/fake', ['ack-2'], 0)
+    ]
+
+    await backend.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_should_coalesce_acks_into_one_request():
+    backend = build_pull_backend(
+        consumer_max_messages='3', consumer_ack_batch_latency='0.01'
+    )
+    await backend.connect()
+    await backend.subscribe('fake')
+    backend._consumer.pull_responses.append(
+        [received_message(b'1'), received_message(b'2')]
+    )
+    events = [await backend.next_published() for _ in range(2)]
+
+    futures = [await event.context['ack_func']() for event in events]
+
+    assert backend._consumer.acknowledged == []
+    assert await asyncio.gather(*futures) == [True, True]
+    assert backend._consumer.acknowledged == [
+        ('projects/fake-project/subscriptions/fake', ['ack-1', 'ack-2'])
+    ]
+
+    await backend.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_should_flush_acks_on_disconnect():
+    backend = build_pull_backend(consumer_ack_batch_latency='60')
+    await backend.connect()
+    await backend.subscribe('fake')
+    backend._consumer.pull_responses.append([received_message(b'1')])
+    event = await backend.next_published()
+    future = await event.context['ack_func']()
+    consumer = backend._consumer
+
+    await backend.disconnect()
+
+    assert future.result()
+    assert consumer.acknowledged == [
+        ('projects/fake-project/subscriptions/fake', ['ack-1'])
+    ]
+
+
+@pytest.mark.asyncio
+async def test_should_flush_ack_batcher_on_max_size():
+    batches = []
+
+    async def acknowledge(ack_ids):
+        batches.append(ack_ids)
+        return True
+
+    batcher = AckBatcher(acknowledge, max_size=2, max_latency=60)
+
+    futures = [batcher.add(ack_id) for ack_id in ('1', '2', '3')]
+    await asyncio.gather(*futures[:2])
+
+    assert batches == [['1', '2']]
+    assert len(batcher) == 1
+
+    await batcher.close()
+
+    assert batches == [['1', '2'], ['3']]
+    assert futures[2].result()
+
+
+@pytest.mark.asyncio
+async def test_should_resolve_ack_futures_as_failed_on_error():
+    async def acknowledge(ack_ids):
+        raise RuntimeError()
+
+    batcher = AckBatcher(acknowledge, max_size=1, max_latency=60)
+
+    assert not await batcher.add('1')
+
+
+@pytest.mark.asyncio
+async def test_should_lease_until_ack_and_nack_on_failure():
+    backend = build_pull_backend(consumer_max_messages='2')
+    await backend.connect()
+    await backend.subscribe('fake')
+    backend._consumer.pull_responses.append(
+        [received_message(b'1'), received_message(b'2')]
+    )
+    acked_event = await backend.next_published()
+    nacked_event = await backend.next_published()
+
+    assert len(backend._lease_manager) == 2
+
+    await acked_event.context['ack_func']()
+    await nacked_event.nack_func()
+
+    assert len(backend._lease_manager) == 0
+    assert backend._consumer.modified_ack_deadlines == [
+        ('projects/fake-project/subscriptions/fake', ['ack-2'], 0)
+    ]
+
+    await backend.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_should_extend_leases_near_deadline_in_batches():
+    extended = []
+
+    async def extend(pubsub_channel, ack_ids, seconds):
+        extended.append((pubsub_channel, ack_ids, seconds))
+
+    lease_manager = LeaseManager(
+        extend, ack_deadline=10, interval=1, max_lease=60, batch_size=2
+    )
+    now = time.monotonic()
+
+    for ack_id in ('1', '2', '3'):
+        lease_manager.lease('fake', ack_id, now - 9)
+
+    lease_manager.lease('fake', '4', now)
+    lease_manager.lease('fake', '5', now - 60)
+
+    await lease_manager.extend()
+
+    assert extended == [('fake', ['1', '2'], 10), ('fake', ['3'], 10)]
+    assert len(lease_manager) == 4
+
+    extended.clear()
+    await lease_manager.extend()
+
+    assert extended == []
+
+
+@pytest.mark.asyncio
+async def test_should_not_delay_hot_channel_on_empty_channels():
+    backend = build_pull_backend(consumer_wait_time='10')
+    await backend.connect()
+    await backend.subscribe('cold')
+    await asyncio.sleep(0.01)
+    await backend.subscribe('hot')
+    backend._consumer.subscriptions_pull_responses[
+        'projects/fake-project/subscriptions/hot'
+    ] = [[received_message(b'1')], [received_message(b'2')]]
+
+    events = [
+        await asyncio.wait_for(backend.next_published(), 0.5)
+        for _ in range(2)
+    ]
+
+    assert [event.channel for event in events] == ['hot', 'hot']
+
+    await backend.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_should_back_off_pulls_on_empty_channel():
+    backend = build_pull_backend(
+        consumer_min_wait_time='0.01', consumer_wait_time='0.04'
+    )
+    await backend.connect()
+    await backend.subscribe('fake')
+
+    await asyncio.sleep(0.15)
+
+    assert 3 <= len(backend._consumer.pulls) <= 6
+
+    await backend.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_should_dispatch_channels_by_weight():
+    backend = build_pull_backend(
+        consumer_max_messages='10', **{'consumer_weight.heavy': '3'}
+    )
+    await backend.connect()
+
+    for channel in ('heavy', 'light'):
+        backend._consumer.subscriptions_pull_responses[
+            f'projects/fake-project/subscriptions/{channel}'
+        ] = [[received_message(channel.encode()) for _ in range(10)]]
+        await backend.subscribe(channel)
+
+    await asyncio.sleep(0.01)
+    events = [await backend.next_published() for _ in range(8)]
+
+    assert [event.channel for event in events].count('heavy') == 6
+
+    await backend.disconnect()
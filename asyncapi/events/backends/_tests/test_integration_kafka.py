@@ -12,7 +12,7 @@ async def test_kafka_two_urls():
     ) as events_handler:
         async with events_handler.subscribe('chatroom') as subscriber:
             await asyncio.sleep(1)
-            await events_handler.publish('chatroom', 'hello')
+            await events_handler.publish('chatroom', b'hello')
             event = await subscriber.get()
             assert event.channel == 'chatroom'
-            assert event.message == 'hello'
+            assert event.message == b'hello'
@@ -0,0 +1,450 @@
+from types import SimpleNamespace
+
+import asynctest
+import pytest
+from aiokafka import TopicPartition
+
+from asyncapi import KafkaInvalidCommitModeError
+from asyncapi.events.backends.kafka import (
+    KafkaBackend,
+    KafkaRebalanceListener,
+    PartitionOffsets,
+)
+
+
+@pytest.fixture(autouse=True)
+def fake_producer_cls(mocker):
+    producer_cls = mocker.patch(
+        'asyncapi.events.backends.kafka.AIOKafkaProducer'
+    )
+    producer_cls.return_value.start = asynctest.CoroutineMock()
+    producer_cls.return_value.stop = asynctest.CoroutineMock()
+    return producer_cls
+
+
+@pytest.fixture(autouse=True)
+def fake_consumer_cls(mocker):
+    consumer_cls = mocker.patch(
+        'asyncapi.events.backends.kafka.AIOKafkaConsumer'
+    )
+    consumer_cls.return_value.start = asynctest.CoroutineMock()
+    consumer_cls.return_value.stop = asynctest.CoroutineMock()
+    consumer_cls.return_value.commit = asynctest.CoroutineMock()
+    return consumer_cls
+
+
+@pytest.mark.asyncio
+async def test_should_connect_producer_with_bindings(
+    fake_producer_cls, mocker
+):
+    backend = KafkaBackend(
+        'kafka://fake1:9092,fake2:9092',
+        bindings={
+            'linger_ms': '5',
+            'max_batch_size': '65536',
+            'compression_type': 'gzip',
+            'acks': 'all',
+            'consumer_wait_time': '1',
+        },
+    )
+
+    await backend.connect()
+
+    assert fake_producer_cls.call_args_list == [
+        mocker.call(
+            bootstrap_servers=['fake1:9092', 'fake2:9092'],
+            linger_ms=5,
+            max_batch_size=65536,
+            compression_type='gzip',
+            acks='all',
+        )
+    ]
+
+
+@pytest.mark.asyncio
+async def test_should_connect_producer_with_numeric_acks(fake_producer_cls):
+    backend = KafkaBackend('kafka://fake:9092', bindings={'acks': '1'})
+
+    await backend.connect()
+
+    assert fake_producer_cls.call_args_list[0][1]['acks'] == 1
+
+
+def consumer_record(partition, offset):
+    return SimpleNamespace(
+        topic='fake',
+        partition=partition,
+        offset=offset,
+        key=None,
+        value=b'{}',
+        headers=None,
+    )
+
+
+def build_at_least_once_backend(**bindings):
+    return KafkaBackend(
+        'kafka://fake:9092',
+        bindings={
+            'group_id': 'fake-group',
+            'consumer_commit_mode': 'at-least-once',
+            'consumer_commit_interval': '60',
+            **bindings,
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_should_connect_consumer_with_bindings(
+    fake_consumer_cls, mocker
+):
+    backend = KafkaBackend(
+        'kafka://fake:9092',
+        bindings={
+            'group_id': 'fake-group',
+            'auto_offset_reset': 'earliest',
+            'fetch_max_bytes': '1048576',
+            'fetch_min_bytes': '1024',
+            'fetch_max_wait_ms': '100',
+            'max_partition_fetch_bytes': '262144',
+            'max_poll_records': '500',
+            'enable_auto_commit': 'false',
+            'linger_ms': '5',
+        },
+    )
+
+    await backend.connect()
+
+    assert fake_consumer_cls.call_args_list == [
+        mocker.call(
+            bootstrap_servers=['fake:9092'],
+            group_id='fake-group',
+            auto_offset_reset='earliest',
+            fetch_max_bytes=1048576,
+            fetch_min_bytes=1024,
+            fetch_max_wait_ms=100,
+            max_partition_fetch_bytes=262144,
+            max_poll_records=500,
+            enable_auto_commit=False,
+        )
+    ]
+
+
+def test_should_raise_error_on_invalid_commit_mode():
+    with pytest.raises(KafkaInvalidCommitModeError):
+        KafkaBackend(
+            'kafka://fake:9092', bindings={'consumer_commit_mode': 'invalid'}
+        )
+
+
+def test_should_require_group_id_on_at_least_once_commit_mode():
+    with pytest.raises(KafkaInvalidCommitModeError):
+        KafkaBackend(
+            'kafka://fake:9092',
+            bindings={'consumer_commit_mode': 'at-least-once'},
+        )
+
+
+def test_should_disable_auto_commit_on_at_least_once_commit_mode():
+    backend = build_at_least_once_backend(enable_auto_commit='true')
+
+    assert backend._consumer_config['enable_auto_commit'] is False
+
+
+def test_should_hold_watermark_on_out_of_order_offsets():
+    offsets = PartitionOffsets()
+
+    for offset in range(10, 14):
+        offsets.track(offset)
+
+    offsets.done(12)
+    offsets.done(11)
+
+    assert offsets.uncommitted() == 10
+
+    offsets.done(10)
+
+    assert offsets.uncommitted() == 13
+
+    offsets.done(13)
+    offsets.committed = 14
+
+    assert offsets.uncommitted() is None
+    assert not offsets
+
+
+def test_should_compact_done_offsets():
+    offsets = PartitionOffsets()
+
+    for offset in range(100):
+        offsets.track(offset)
+
+    for offset in range(1, 100):
+        offsets.done(offset)
+
+    assert offsets.uncommitted() == 0
+    assert offsets._pending_heap == [0]
+
+
+@pytest.mark.asyncio
+async def test_should_not_set_ack_func_on_auto_commit_mode(
+    fake_consumer_cls,
+):
+    fake_consumer_cls.return_value.getone = asynctest.CoroutineMock(
+        return_value=consumer_record(0, 1)
+    )
+    backend = KafkaBackend('kafka://fake:9092')
+    await backend.connect()
+
+    event = await backend.next_published()
+
+    assert 'ack_func' not in event.context
+
+
+@pytest.mark.asyncio
+async def test_should_commit_acked_offsets_in_batches(
+    fake_consumer_cls, mocker
+):
+    consumer = fake_consumer_cls.return_value
+    consumer.getone = asynctest.CoroutineMock(
+        side_effect=[
+            consumer_record(0, 5),
+            consumer_record(0, 6),
+            consumer_record(1, 3),
+            consumer_record(0, 7),
+        ]
+    )
+    backend = build_at_least_once_backend(consumer_commit_batch_size='2')
+    await backend.connect()
+    events = [await backend.next_published() for _ in range(4)]
+
+    await events[1].context['ack_func']()
+    await events[2].context['ack_func']()
+
+    await events[3].context['ack_func']()
+    await events[0].context['ack_func']()
+
+    assert consumer.commit.call_args_list == [
+        mocker.call(
+            {
+                TopicPartition('fake', 0): 5,
+                TopicPartition('fake', 1): 4,
+            }
+        ),
+        mocker.call({TopicPartition('fake', 0): 8}),
+    ]
+
+    await backend.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_should_commit_revoked_partitions(
+    fake_consumer_cls, mocker
+):
+    consumer = fake_consumer_cls.return_value
+    consumer.getone = asynctest.CoroutineMock(
+        side_effect=[consumer_record(0, 5), consumer_record(1, 3)]
+    )
+    backend = build_at_least_once_backend()
+    await backend.connect()
+    events = [await backend.next_published() for _ in range(2)]
+
+    for event in events:
+        await event.context['ack_func']()
+
+    await KafkaRebalanceListener(backend).on_partitions_revoked(
+        {TopicPartition('fake', 0)}
+    )
+    await events[0].context['ack_func']()
+
+    assert consumer.commit.call_args_list == [
+        mocker.call({TopicPartition('fake', 0): 6})
+    ]
+    assert list(backend._offsets) == [TopicPartition('fake', 1)]
+
+    await backend.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_should_commit_pending_offsets_on_disconnect(
+    fake_consumer_cls, mocker
+):
+    consumer = fake_consumer_cls.return_value
+    consumer.getone = asynctest.CoroutineMock(
+        return_value=consumer_record(0, 5)
+    )
+    backend = build_at_least_once_backend()
+    await backend.connect()
+    event = await backend.next_published()
+    await event.context['ack_func']()
+
+    await backend.disconnect()
+
+    assert consumer.commit.call_args_list == [
+        mocker.call({TopicPartition('fake', 0): 6})
+    ]
+
+
+@pytest.mark.asyncio
+async def test_should_set_event_partition(fake_consumer_cls):
+    fake_consumer_cls.return_value.getone = asynctest.CoroutineMock(
+        return_value=consumer_record(3, 1)
+    )
+    backend = KafkaBackend(
+        'kafka://fake:9092', bindings={'consumer_partition_lanes': 'true'}
+    )
+    await backend.connect()
+
+    event = await backend.next_published()
+
+    assert backend.partition_lanes
+    assert event.partition == TopicPartition('fake', 3)
+
+
+@pytest.mark.asyncio
+async def test_should_pause_and_resume_assigned_partitions(
+    fake_consumer_cls,
+):
+    consumer = fake_consumer_cls.return_value
+    assigned = TopicPartition('fake', 0)
+    consumer.assignment.return_value = {assigned}
+    consumer.paused.return_value = {assigned}
+    backend = KafkaBackend('kafka://fake:9092')
+    await backend.connect()
+
+    backend.pause_partition(assigned)
+    backend.pause_partition(TopicPartition('fake', 1))
+    backend.resume()
+
+    assert consumer.pause.call_args_list == [((assigned,),)]
+    assert consumer.resume.call_args_list == [((),)]
+
+    backend.resume_partition(assigned)
+
+    assert consumer.resume.call_args_list == [((),), ((assigned,),)]
+
+
+@pytest.mark.asyncio
+async def test_should_call_revoke_callbacks(fake_consumer_cls):
+    backend = KafkaBackend('kafka://fake:9092')
+    revoked = []
+    assigned = []
+
+    async def revoke(partitions):
+        revoked.append(partitions)
+
+    backend.add_revoke_callback(revoke)
+    backend.add_assign_callback(assigned.append)
+    await backend.connect()
+
+    await KafkaRebalanceListener(backend).on_partitions_revoked(
+        {TopicPartition('fake', 0)}
+    )
+    await KafkaRebalanceListener(backend).on_partitions_assigned(
+        {TopicPartition('fake', 0)}
+    )
+    backend.remove_revoke_callback(revoke)
+    backend.remove_assign_callback(assigned.append)
+    await KafkaRebalanceListener(backend).on_partitions_revoked(
+        {TopicPartition('fake', 1)}
+    )
+    await KafkaRebalanceListener(backend).on_partitions_assigned(
+        {TopicPartition('fake', 1)}
+    )
+
+    assert revoked == [{TopicPartition('fake', 0)}]
+    assert assigned == [{TopicPartition('fake', 0)}]
+
+
+@pytest.mark.asyncio
+async def test_should_fetch_many_records(fake_consumer_cls, mocker):
+    consumer = fake_consumer_cls.return_value
+    consumer.getmany = asynctest.CoroutineMock(
+        return_value={
+            TopicPartition('fake', 0): [
+                consumer_record(0, 1),
+                consumer_record(0, 2),
+            ],
+            TopicPartition('fake', 1): [consumer_record(1, 1)],
+        }
+    )
+    backend = KafkaBackend(
+        'kafka://fake:9092',
+        bindings={
+            'consumer_fetch_many': 'true',
+            'consumer_max_records': '100',
+            'consumer_fetch_timeout_ms': '50',
+        },
+    )
+    await backend.connect()
+
+    events = await backend.next_published_many()
+
+    assert backend.fetch_many
+    assert consumer.getmany.call_args_list == [
+        mocker.call(timeout_ms=50, max_records=100)
+    ]
+    assert [event.id for event in events] == [
+        'fake:0:1',
+        'fake:0:2',
+        'fake:1:1',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_should_publish_key_and_headers(fake_producer_cls, mocker):
+    producer = fake_producer_cls.return_value
+    producer.send_and_wait = asynctest.CoroutineMock()
+    backend = KafkaBackend('kafka://fake:9092')
+    await backend.connect()
+
+    await backend.publish(
+        'fake', b'fake', headers={'fake': 'header'}, key='fake-key'
+    )
+
+    assert producer.send_and_wait.call_args_list == [
+        mocker.call(
+            'fake',
+            b'fake',
+            key=b'fake-key',
+            headers=[('fake', b'header')],
+        )
+    ]
+
+
+@pytest.mark.asyncio
+async def test_should_set_event_key(fake_consumer_cls):
+    record = consumer_record(0, 1)
+    record.key = b'fake-key'
+    fake_consumer_cls.return_value.getone = asynctest.CoroutineMock(
+        return_value=record
+    )
+    backend = KafkaBackend('kafka://fake:9092')
+    await backend.connect()
+
+    event = await backend.next_published()
+
+    assert event.key == 'fake-key'
+
+    record.key = b'\xfffake'
+    event = await backend.next_published()
+
+    assert event.key == '\ufffdfake'
+
+
+@pytest.mark.asyncio
+async def test_should_set_event_headers(fake_consumer_cls):
+    record = consumer_record(0, 1)
+    record.headers = [
+        ('fake', b'header'),
+        ('empty', None),
+        ('invalid', b'\xff'),
+    ]
+    fake_consumer_cls.return_value.getone = asynctest.CoroutineMock(
+        return_value=record
+    )
+    backend = KafkaBackend('kafka://fake:9092')
+    await backend.connect()
+
+    event = await backend.next_published()
+
+    assert event.headers == {'fake': 'header', 'invalid': '\ufffd'}
@@ -1,22 +1,48 @@
 import asyncio
+import dataclasses
 import functools
-import secrets
-from concurrent.futures import ThreadPoolExecutor
-from concurrent.futures import TimeoutError as FutureTimeoutError
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from logging import Logger, getLogger
-from typing import TYPE_CHECKING, Any, Dict, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    DefaultDict,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 from urllib.parse import urlparse
 
 from broadcaster._backends.base import BroadcastBackend
 from google.cloud import pubsub_v1
-from google.cloud.pubsub_v1.types import PullResponse, ReceivedMessage
+from google.cloud.pubsub_v1.subscriber.futures import StreamingPullFuture
+from google.cloud.pubsub_v1.subscriber.message import Message
+from google.cloud.pubsub_v1.types import (
+    BatchSettings,
+    FlowControl,
+    LimitExceededBehavior,
+    PublishFlowControl,
+    PublisherOptions,
+    PullResponse,
+    ReceivedMessage,
+)
 
 from asyncapi import (
     GCloudPubSubConsumerDisconnectError,
+    GCloudPubSubInvalidConsumerModeError,
     GCloudPubSubPublishTimeoutError,
+    GCloudPubSubReservedAttributeError,
 )
 
-from .. import Event
+from .. import Event, PublishManyHint, message_bytes, message_preview
 
 
 if TYPE_CHECKING:
@@ -25,6 +51,26 @@ else:
     AsyncFutureHint = asyncio.Future
 
 
+StreamedHint = Tuple[str, Message]
+PrefetchedHint = Tuple[float, ReceivedMessage]
+PULL_CONSUMER_MODE = 'pull'
+STREAMING_PULL_CONSUMER_MODE = 'streaming-pull'
+CONSUMER_MODES = (PULL_CONSUMER_MODE, STREAMING_PULL_CONSUMER_MODE)
+CONSUMER_WEIGHT_BINDING_PREFIX = 'consumer_weight.'
+# keyword arguments of the publisher client publish method
+RESERVED_ATTRIBUTES = frozenset(
+    ('data', 'ordering_key', 'retry', 'timeout', 'topic')
+)
+
+
+@dataclasses.dataclass
+class PullLoop:
+    weight: int
+    current_weight: int = 0
+    consumed: asyncio.Event = dataclasses.field(default_factory=asyncio.Event)
+    task: Optional['asyncio.Task[None]'] = None
+
+
 class GCloudPubSubBackend(BroadcastBackend):
     def __init__(
         self,
@@ -36,19 +82,69 @@ class GCloudPubSubBackend(BroadcastBackend):
         self._project = url_parsed.netloc
         self._consumer_channels: Dict[str, str] = {}
         self._producer_channels: Dict[str, str] = {}
-        self._channel_index = 0
+        self._streaming_pulls: Dict[str, StreamingPullFuture] = {}
+        self._streaming_pull_restarts: Dict[str, int] = {}
+        self._restart_tasks: Set['asyncio.Task[None]'] = set()
+        self._prefetched: DefaultDict[str, Deque[PrefetchedHint]] = (
+            defaultdict(deque)
+        )
+        self._pull_loops: Dict[str, PullLoop] = {}
+        self._ack_batchers: Dict[str, AckBatcher] = {}
         self._logger = logger
         self._set_consumer_config(bindings)
+        self._set_producer_config(bindings)
+        self._lease_manager = LeaseManager(
+            self._extend_leases,
+            self._consumer_ack_deadline,
+            self._consumer_lease_interval,
+            self._consumer_max_lease,
+            self._consumer_lease_batch_size,
+            self._logger,
+        )
         self._disconnected = True
         self._executor = ThreadPoolExecutor(self._consumer_max_workers)
 
     async def connect(self) -> None:
-        self._producer = pubsub_v1.PublisherClient()
+        self._producer = pubsub_v1.PublisherClient(
+            batch_settings=self._publish_batch_settings,
+            publisher_options=self._publisher_options,
+        )
         self._consumer = pubsub_v1.SubscriberClient()
+        self._publish_window = asyncio.Semaphore(self._publish_max_inflight)
+        self._streamed_messages: 'asyncio.Queue[Optional[StreamedHint]]' = (
+            asyncio.Queue()
+        )
+        self._prefetched_ready = asyncio.Event()
         self._disconnected = False
 
+        if (
+            self._consumer_lease_interval
+            and self._consumer_mode == PULL_CONSUMER_MODE
+        ):
+            self._lease_manager.start()
+
     async def disconnect(self) -> None:
         self._disconnected = True
+        await self._lease_manager.close()
+
+        for channel in list(self._streaming_pulls):
+            self._stop_streaming_pull(channel)
+
+        for task in self._restart_tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._restart_tasks, return_exceptions=True)
+
+        for channel in list(self._pull_loops):
+            await self._stop_pull_loop(channel)
+
+        self._prefetched_ready.set()
+
+        await asyncio.gather(
+            *(batcher.close() for batcher in self._ack_batchers.values())
+        )
+        self._ack_batchers.clear()
+        self._streamed_messages.put_nowait(None)
         self._producer.stop()
         self._consumer.close()
         del self._producer
@@ -60,11 +156,33 @@ class GCloudPubSubBackend(BroadcastBackend):
         )
         self._consumer_channels[channel] = pubsub_channel
 
+        if self._consumer_mode == STREAMING_PULL_CONSUMER_MODE:
+            self._start_streaming_pull(channel, pubsub_channel)
+        else:
+            self._start_pull_loop(channel, pubsub_channel)
+
     async def unsubscribe(self, channel: str) -> None:
-        self._consumer_channels.pop(channel)
+        pubsub_channel = self._consumer_channels.pop(channel)
+
+        if channel in self._pull_loops:
+            await self._stop_pull_loop(channel)
+
+        prefetched = self._prefetched.pop(channel, None)
+
+        if prefetched:
+            self._expire_prefetched(
+                pubsub_channel, [message for _, message in prefetched]
+            )
+
+        if channel in self._streaming_pulls:
+            self._stop_streaming_pull(channel)
 
     async def publish(
-        self, channel: str, message: Any, retries_counter: int = 1
+        self,
+        channel: str,
+        message: Any,
+        headers: Optional[Dict[str, str]] = None,
+        key: Optional[str] = None,
     ) -> None:
         producer_channel = self._producer_channels.get(channel)
 
@@ -74,138 +192,546 @@ class GCloudPubSubBackend(BroadcastBackend):
             )
             self._producer_channels[channel] = producer_channel
 
-        future = self._producer.publish(producer_channel, message.encode())
+        data = message_bytes(message)
+        attributes = headers or {}
+        reserved = ', '.join(
+            sorted(RESERVED_ATTRIBUTES.intersection(attributes))
+        )
+
+        if reserved:
+            raise GCloudPubSubReservedAttributeError(
+                f'reserved attributes: {reserved}; channel={channel}'
+            )
+
+        ordering_key = (
+            key if key is not None and self._publish_message_ordering else ''
+        )
+
+        async with self._publish_window:
+            for retries_counter in range(1, self._publish_retries + 1):
+                try:
+                    future = await self._publish_future(
+                        producer_channel, data, ordering_key, attributes
+                    )
+                    await asyncio.wait_for(
+                        asyncio.wrap_future(future),
+                        timeout=self._publish_timeout,
+                    )
+                    return
+
+                except asyncio.TimeoutError:
+                    if retries_counter < self._publish_retries:
+                        await asyncio.sleep(
+                            self._publish_retry_backoff
+                            * 2 ** (retries_counter - 1)
+                        )
+
+                except Exception:
+                    if ordering_key:
+                        self._resume_publish(producer_channel, ordering_key)
+
+                    raise
 
+        raise GCloudPubSubPublishTimeoutError(
+            f'publish timeout; channel={channel}; '
+            f'message={message_preview(message)}...'
+        )
+
+    def _resume_publish(self, producer_channel: str, key: str) -> None:
         try:
-            future.result(timeout=self._publish_timeout)
-        except FutureTimeoutError:
-            if retries_counter >= self._publish_retries:
-                raise GCloudPubSubPublishTimeoutError(
-                    f'publish timeout; channel={channel}; '
-                    f'message={message[:100]}...'
-                )
-            else:
-                await self.publish(channel, message, retries_counter + 1)
+            self._producer.resume_publish(producer_channel, key)
+        except (RuntimeError, ValueError):
+            self._logger.exception(
+                f'resume publish error; channel={producer_channel}; '
+                f'key={key}'
+            )
+
+    async def _publish_future(
+        self,
+        producer_channel: str,
+        data: bytes,
+        ordering_key: str,
+        attributes: Dict[str, str],
+    ) -> 'Future[Any]':
+        publish = functools.partial(
+            self._producer.publish,
+            producer_channel,
+            data,
+            ordering_key=ordering_key,
+            **attributes,
+        )
+
+        if self._publish_flow_control_blocks:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, publish
+            )
+
+        return publish()
+
+    async def publish_many(
+        self, channel: str, messages: Sequence[PublishManyHint],
+    ) -> List[Optional[BaseException]]:
+        return await asyncio.gather(
+            *(
+                self.publish(channel, message, headers, key)
+                for message, headers, key in messages
+            ),
+            return_exceptions=True,
+        )
 
     async def next_published(self) -> Event:
+        if self._consumer_mode == STREAMING_PULL_CONSUMER_MODE:
+            return await self._next_streamed()
+
         (
             received_message,
             channel_id,
             pubsub_channel,
+            received_at,
         ) = await self._pull_message_from_consumer()
-        event = Event(channel_id, received_message.message.data.decode())
+        event = Event(
+            channel_id,
+            received_message.message.data,
+            headers=dict(received_message.message.attributes),
+            id=received_message.message.message_id,
+            key=received_message.message.ordering_key or None,
+        )
 
         if self._consumer_ack_messages:
             await self.wait_ack(received_message, pubsub_channel)
         else:
+            self._lease_manager.lease(
+                pubsub_channel, received_message.ack_id, received_at
+            )
             event.context['ack_func'] = functools.partial(
                 self.wait_ack, received_message, pubsub_channel,
             )
+            event.nack_func = functools.partial(
+                self.nack, received_message, pubsub_channel
+            )
 
         return event
 
-    async def _pull_message_from_consumer(
+    async def _next_streamed(self) -> Event:
+        streamed = None
+
+        if not self._disconnected:
+            streamed = await self._streamed_messages.get()
+
+        if streamed is None:
+            raise GCloudPubSubConsumerDisconnectError()
+
+        channel, message = streamed
+        self._streaming_pull_restarts.pop(channel, None)
+        event = Event(
+            channel,
+            message.data,
+            headers=dict(message.attributes),
+            key=message.ordering_key or None,
+            id=message.message_id,
+        )
+
+        if self._consumer_ack_messages:
+            message.ack()
+        else:
+            event.context['ack_func'] = functools.partial(
+                ack_streamed_message, message
+            )
+            event.nack_func = functools.partial(
+                nack_streamed_message, message
+            )
+
+        return event
+
+    def _start_streaming_pull(self, channel: str, pubsub_channel: str) -> None:
+        loop = asyncio.get_running_loop()
+        self._streaming_pulls[channel] = streaming_pull = (
+            self._consumer.subscribe(
+                pubsub_channel,
+                callback=functools.partial(
+                    self._message_streamed, loop, channel,
+                ),
+                flow_control=self._consumer_flow_control,
+            )
+        )
+        streaming_pull.add_done_callback(
+            functools.partial(
+                self._streaming_pull_done, loop, channel, pubsub_channel
+            )
+        )
+
+    def _stop_streaming_pull(self, channel: str) -> None:
+        self._streaming_pulls.pop(channel).cancel()
+
+    def _message_streamed(
         self,
-    ) -> Tuple[ReceivedMessage, str, str]:
-        channel_index = (
-            secrets.choice(range(len(self._consumer_channels)))
-            if self._consumer_channels
-            else 0
+        loop: asyncio.AbstractEventLoop,
+        channel: str,
+        message: Message,
+    ) -> None:
+        loop.call_soon_threadsafe(
+            self._streamed_messages.put_nowait, (channel, message)
         )
 
-        while not self._disconnected:
-            channels = list(self._consumer_channels.items())
+    def _streaming_pull_done(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        channel: str,
+        pubsub_channel: str,
+        streaming_pull: StreamingPullFuture,
+    ) -> None:
+        if streaming_pull.cancelled() or self._disconnected:
+            return
 
-            if not len(channels):
-                await asyncio.sleep(self._consumer_wait_time)
-                continue
+        self._logger.error(
+            f'streaming pull stopped; channel={channel}',
+            exc_info=streaming_pull.exception(),
+        )
+        loop.call_soon_threadsafe(
+            self._schedule_streaming_pull_restart,
+            channel,
+            pubsub_channel,
+            streaming_pull,
+        )
 
-            if channel_index >= len(channels):
-                channel_index = 0
+    def _schedule_streaming_pull_restart(
+        self,
+        channel: str,
+        pubsub_channel: str,
+        streaming_pull: StreamingPullFuture,
+    ) -> None:
+        task = asyncio.create_task(
+            self._restart_streaming_pull(
+                channel, pubsub_channel, streaming_pull
+            )
+        )
+        self._restart_tasks.add(task)
+        task.add_done_callback(self._restart_tasks.discard)
 
-            channel_id, pubsub_channel = channels[channel_index]
-            pull_message_future: AsyncFutureHint
-            pull_message_future = asyncio.get_running_loop().run_in_executor(  # type: ignore
-                self._executor,
-                functools.partial(
-                    self._consumer.pull,
-                    pubsub_channel,
-                    max_messages=1,
-                    return_immediately=True,
-                ),
+    async def _restart_streaming_pull(
+        self,
+        channel: str,
+        pubsub_channel: str,
+        streaming_pull: StreamingPullFuture,
+    ) -> None:
+        restarts = self._streaming_pull_restarts.get(channel, 0)
+        self._streaming_pull_restarts[channel] = restarts + 1
+        await asyncio.sleep(
+            min(
+                self._consumer_min_wait_time * 2 ** restarts,
+                self._consumer_wait_time,
             )
+        )
 
-            try:
-                response = await asyncio.wait_for(
-                    pull_message_future, self._consumer_pull_message_timeout
-                )
+        if (
+            self._disconnected
+            or self._streaming_pulls.get(channel) is not streaming_pull
+        ):
+            return
 
-            except asyncio.TimeoutError:
-                channel_index += 1
-                await asyncio.sleep(self._consumer_wait_time)
+        self._logger.info(f'restarting streaming pull; channel={channel}')
+        self._start_streaming_pull(channel, pubsub_channel)
+
+    async def _pull_message_from_consumer(
+        self,
+    ) -> Tuple[ReceivedMessage, str, str, float]:
+        while not self._disconnected:
+            channel_id = self._choose_prefetched_channel()
+
+            if channel_id is None:
+                self._prefetched_ready.clear()
+                await self._prefetched_ready.wait()
                 continue
 
-            else:
-                if not response.received_messages:
-                    channel_index += 1
-                    await asyncio.sleep(self._consumer_wait_time)
-                    continue
+            pubsub_channel = self._consumer_channels[channel_id]
+            prefetched = self._pop_prefetched(channel_id, pubsub_channel)
 
-                await asyncio.sleep(self._pull_message_wait_time)
+            if prefetched is not None:
+                received_at, received_message = prefetched
                 return (
-                    response.received_messages[0],
+                    received_message,
                     channel_id,
                     pubsub_channel,
+                    received_at,
                 )
 
         raise GCloudPubSubConsumerDisconnectError()
 
-    async def wait_ack(
-        self,
-        message: ReceivedMessage,
-        pubsub_channel: str,
-        retries_counter: int = 1,
+    def _choose_prefetched_channel(self) -> Optional[str]:
+        chosen: Optional[Tuple[str, PullLoop]] = None
+        total_weight = 0
+
+        for channel_id, pull_loop in self._pull_loops.items():
+            if not self._prefetched.get(channel_id):
+                continue
+
+            pull_loop.current_weight += pull_loop.weight
+            total_weight += pull_loop.weight
+
+            if (
+                chosen is None
+                or pull_loop.current_weight > chosen[1].current_weight
+            ):
+                chosen = (channel_id, pull_loop)
+
+        if chosen is None:
+            return None
+
+        chosen[1].current_weight -= total_weight
+        return chosen[0]
+
+    def _start_pull_loop(self, channel_id: str, pubsub_channel: str) -> None:
+        pull_loop = self._pull_loops[channel_id] = PullLoop(
+            weight=self._consumer_channels_weights.get(channel_id, 1)
+        )
+        pull_loop.task = asyncio.create_task(
+            self._run_pull_loop(channel_id, pubsub_channel, pull_loop)
+        )
+
+    async def _stop_pull_loop(self, channel_id: str) -> None:
+        pull_loop = self._pull_loops.pop(channel_id)
+
+        if pull_loop.task is not None:
+            pull_loop.task.cancel()
+            await asyncio.gather(pull_loop.task, return_exceptions=True)
+
+    async def _run_pull_loop(
+        self, channel_id: str, pubsub_channel: str, pull_loop: PullLoop
+    ) -> None:
+        prefetched = self._prefetched[channel_id]
+        refill_size = max(
+            min(
+                self._consumer_prefetch_refill_threshold,
+                self._consumer_prefetch_size,
+            ),
+            1,
+        )
+        min_wait_time = min(
+            self._consumer_min_wait_time, self._consumer_wait_time
+        )
+        wait_time = min_wait_time
+
+        # a cancellation swallowed by wait_for must not keep a stopped loop
+        # running, so it also checks if it is still the channel pull loop
+        while (
+            not self._disconnected
+            and self._pull_loops.get(channel_id) is pull_loop
+        ):
+            if len(prefetched) >= refill_size:
+                pull_loop.consumed.clear()
+                await pull_loop.consumed.wait()
+                continue
+
+            try:
+                pulled = await self._pull_prefetched(
+                    channel_id, pubsub_channel
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._logger.exception(f'pull error; channel={channel_id}')
+                pulled = False
+
+            if pulled:
+                wait_time = min_wait_time
+                self._prefetched_ready.set()
+                await asyncio.sleep(self._pull_message_wait_time)
+
+            else:
+                await asyncio.sleep(wait_time)
+                wait_time = min(wait_time * 2, self._consumer_wait_time)
+
+    def _pop_prefetched(
+        self, channel_id: str, pubsub_channel: str
+    ) -> Optional[PrefetchedHint]:
+        prefetched = self._prefetched.get(channel_id)
+
+        if not prefetched:
+            return None
+
+        expires_at = time.monotonic() - self._consumer_prefetch_max_age
+        expired = []
+
+        while prefetched and prefetched[0][0] <= expires_at:
+            expired.append(prefetched.popleft()[1])
+
+        if expired:
+            self._expire_prefetched(pubsub_channel, expired)
+
+        message = prefetched.popleft() if prefetched else None
+        pull_loop = self._pull_loops.get(channel_id)
+
+        if pull_loop is not None:
+            pull_loop.consumed.set()
+
+        return message
+
+    def _expire_prefetched(
+        self, pubsub_channel: str, messages: List[ReceivedMessage]
     ) -> None:
-        future = asyncio.get_running_loop().run_in_executor(
+        self._logger.warning(
+            f'prefetched messages expired; channel={pubsub_channel}; '
+            f'messages={len(messages)}'
+        )
+        self._modify_ack_deadline(
+            pubsub_channel, [message.ack_id for message in messages], 0
+        )
+
+    def _modify_ack_deadline(
+        self, pubsub_channel: str, ack_ids: List[str], seconds: int
+    ) -> 'asyncio.Future[None]':
+        return asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            functools.partial(
+                self._consumer.modify_ack_deadline,
+                pubsub_channel,
+                ack_ids,
+                seconds,
+            ),
+        )
+
+    async def _pull_prefetched(
+        self, channel_id: str, pubsub_channel: str
+    ) -> bool:
+        prefetched = self._prefetched[channel_id]
+        max_messages = min(
+            self._consumer_max_messages,
+            self._consumer_prefetch_size - len(prefetched),
+        )
+
+        if max_messages <= 0:
+            return True
+
+        pull_message_future: AsyncFutureHint
+        pull_message_future = asyncio.get_running_loop().run_in_executor(
             self._executor,
             functools.partial(
-                self._consumer.acknowledge, pubsub_channel, [message.ack_id],
+                self._consumer.pull,
+                pubsub_channel,
+                max_messages=max_messages,
+                return_immediately=True,
             ),
         )
 
         try:
-            await asyncio.wait_for(future, timeout=self._consumer_ack_timeout)
+            response = await asyncio.wait_for(
+                pull_message_future, self._consumer_pull_message_timeout
+            )
+        except asyncio.TimeoutError:
+            return False
+
+        received_at = time.monotonic()
+        prefetched.extend(
+            (received_at, received_message)
+            for received_message in response.received_messages
+        )
+
+        return bool(response.received_messages)
+
+    async def wait_ack(
+        self, message: ReceivedMessage, pubsub_channel: str
+    ) -> 'asyncio.Future[bool]':
+        self._lease_manager.release(message.ack_id)
+        batcher = self._ack_batchers.get(pubsub_channel)
+
+        if batcher is None:
+            batcher = self._ack_batchers[pubsub_channel] = AckBatcher(
+                functools.partial(self._acknowledge, pubsub_channel),
+                self._consumer_ack_batch_size,
+                self._consumer_ack_batch_latency,
+                self._logger,
+            )
+
+        return batcher.add(message.ack_id)
+
+    async def nack(
+        self, message: ReceivedMessage, pubsub_channel: str
+    ) -> None:
+        self._lease_manager.release(message.ack_id)
+
+        try:
+            await asyncio.wait_for(
+                self._modify_ack_deadline(pubsub_channel, [message.ack_id], 0),
+                timeout=self._consumer_ack_timeout,
+            )
         except asyncio.TimeoutError:
-            if retries_counter >= self._consumer_ack_retries:
-                self._logger.warning(
-                    f'ack timeout {self._consumer_ack_timeout}; '
-                    f'message={message.message.data.decode()[:100]}...'
-                )
-            else:
-                await self.wait_ack(
-                    message, pubsub_channel, retries_counter + 1
-                )
-        except asyncio.CancelledError:
             self._logger.warning(
-                'ack cancelled; '
-                f'message={message.message.data.decode()[:100]}...'
+                f'nack timeout {self._consumer_ack_timeout}; '
+                f'message={message_preview(message.message.data)}...'
+            )
+
+    async def _extend_leases(
+        self, pubsub_channel: str, ack_ids: List[str], seconds: int
+    ) -> None:
+        await asyncio.wait_for(
+            self._modify_ack_deadline(pubsub_channel, ack_ids, seconds),
+            timeout=self._consumer_ack_timeout,
+        )
+
+    async def _acknowledge(
+        self, pubsub_channel: str, ack_ids: List[str]
+    ) -> bool:
+        for _ in range(self._consumer_ack_retries):
+            future = asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                functools.partial(
+                    self._consumer.acknowledge, pubsub_channel, ack_ids,
+                ),
             )
 
+            try:
+                await asyncio.wait_for(
+                    future, timeout=self._consumer_ack_timeout
+                )
+                return True
+            except asyncio.TimeoutError:
+                continue
+
+        self._logger.warning(
+            f'ack timeout {self._consumer_ack_timeout}; '
+            f'channel={pubsub_channel}; messages={len(ack_ids)}'
+        )
+        return False
+
     def _set_consumer_config(self, bindings: Dict[str, str]) -> None:
         consumer_wait_time = 1.0
+        consumer_min_wait_time = 0.01
+        consumer_channels_weights: Dict[str, int] = {}
         consumer_ack_messages = False
         consumer_ack_timeout = 1.0
         consumer_ack_retries = 3
+        consumer_ack_batch_size = 100
+        consumer_ack_batch_latency = 0.05
         consumer_pull_message_timeout = 1.0
         consumer_max_workers = 10
         publish_timeout = 5.0
         publish_retries = 3
+        publish_retry_backoff = 0.1
+        publish_max_inflight = 100
         pull_message_wait_time = 0.1
+        consumer_mode = PULL_CONSUMER_MODE
+        consumer_flow_control: Dict[str, int] = {}
+        consumer_max_messages = 1
+        consumer_prefetch_size = None
+        consumer_prefetch_refill_threshold = 0
+        consumer_ack_deadline = 10.0
+        consumer_prefetch_max_age = None
+        consumer_lease_interval = 1.0
+        consumer_max_lease = 3600.0
+        consumer_lease_batch_size = 1000
 
         for config_name, config_value in bindings.items():
             if config_name == 'consumer_wait_time':
                 consumer_wait_time = float(config_value)
 
+            elif config_name == 'consumer_min_wait_time':
+                consumer_min_wait_time = float(config_value)
+
+            elif config_name.startswith(CONSUMER_WEIGHT_BINDING_PREFIX):
+                consumer_channels_weights[
+                    config_name[len(CONSUMER_WEIGHT_BINDING_PREFIX):]
+                ] = int(config_value)
+
             elif config_name == 'consumer_ack_messages':
                 consumer_ack_messages = config_value in (
                     '1',
@@ -222,6 +748,12 @@ class GCloudPubSubBackend(BroadcastBackend):
             elif config_name == 'consumer_ack_retries':
                 consumer_ack_retries = int(config_value)
 
+            elif config_name == 'consumer_ack_batch_size':
+                consumer_ack_batch_size = int(config_value)
+
+            elif config_name == 'consumer_ack_batch_latency':
+                consumer_ack_batch_latency = float(config_value)
+
             elif config_name == 'consumer_max_workers':
                 consumer_max_workers = int(config_value)
 
@@ -234,15 +766,303 @@ class GCloudPubSubBackend(BroadcastBackend):
             elif config_name == 'publish_retries':
                 publish_retries = int(config_value)
 
+            elif config_name == 'publish_retry_backoff':
+                publish_retry_backoff = float(config_value)
+
+            elif config_name == 'publish_max_inflight':
+                publish_max_inflight = int(config_value)
+
             elif config_name == 'pull_message_wait_time':
                 pull_message_wait_time = float(config_value)
 
+            elif config_name == 'consumer_mode':
+                consumer_mode = config_value
+
+                if consumer_mode not in CONSUMER_MODES:
+                    raise GCloudPubSubInvalidConsumerModeError(
+                        consumer_mode,
+                        f'valid consumer modes: {", ".join(CONSUMER_MODES)}',
+                    )
+
+            elif config_name == 'consumer_max_outstanding_messages':
+                consumer_flow_control['max_messages'] = int(config_value)
+
+            elif config_name == 'consumer_max_outstanding_bytes':
+                consumer_flow_control['max_bytes'] = int(config_value)
+
+            elif config_name == 'consumer_max_messages':
+                consumer_max_messages = int(config_value)
+
+            elif config_name == 'consumer_prefetch_size':
+                consumer_prefetch_size = int(config_value)
+
+            elif config_name == 'consumer_prefetch_refill_threshold':
+                consumer_prefetch_refill_threshold = int(config_value)
+
+            elif config_name == 'consumer_ack_deadline':
+                consumer_ack_deadline = float(config_value)
+
+            elif config_name == 'consumer_prefetch_max_age':
+                consumer_prefetch_max_age = float(config_value)
+
+            elif config_name == 'consumer_lease_interval':
+                consumer_lease_interval = float(config_value)
+
+            elif config_name == 'consumer_max_lease':
+                consumer_max_lease = float(config_value)
+
+            elif config_name == 'consumer_lease_batch_size':
+                consumer_lease_batch_size = int(config_value)
+
         self._consumer_wait_time = consumer_wait_time
+        self._consumer_min_wait_time = consumer_min_wait_time
+        self._consumer_channels_weights = consumer_channels_weights
         self._consumer_ack_messages = consumer_ack_messages
         self._consumer_ack_timeout = consumer_ack_timeout
         self._consumer_ack_retries = consumer_ack_retries
+        self._consumer_ack_batch_size = consumer_ack_batch_size
+        self._consumer_ack_batch_latency = consumer_ack_batch_latency
         self._consumer_pull_message_timeout = consumer_pull_message_timeout
         self._consumer_max_workers = consumer_max_workers
         self._publish_timeout = publish_timeout
         self._publish_retries = publish_retries
+        self._publish_retry_backoff = publish_retry_backoff
+        self._publish_max_inflight = publish_max_inflight
         self._pull_message_wait_time = pull_message_wait_time
+        self._consumer_mode = consumer_mode
+        self._consumer_flow_control = FlowControl(**consumer_flow_control)
+        self._consumer_max_messages = consumer_max_messages
+        self._consumer_prefetch_size = (
+            consumer_max_messages
+            if consumer_prefetch_size is None
+            else consumer_prefetch_size
+        )
+        self._consumer_prefetch_refill_threshold = (
+            consumer_prefetch_refill_threshold
+        )
+        self._consumer_ack_deadline = consumer_ack_deadline
+        self._consumer_lease_interval = consumer_lease_interval
+        self._consumer_max_lease = consumer_max_lease
+        self._consumer_lease_batch_size = consumer_lease_batch_size
+        self._consumer_prefetch_max_age = (
+            consumer_ack_deadline * 0.8
+            if consumer_prefetch_max_age is None
+            else consumer_prefetch_max_age
+        )
+
+    def _set_producer_config(self, bindings: Dict[str, str]) -> None:
+        batch_settings: Dict[str, Any] = {}
+        flow_control: Dict[str, Any] = {}
+        publish_message_ordering = False
+
+        for config_name, config_value in bindings.items():
+            if config_name == 'publish_batch_max_bytes':
+                batch_settings['max_bytes'] = int(config_value)
+
+            elif config_name == 'publish_batch_max_latency':
+                batch_settings['max_latency'] = float(config_value)
+
+            elif config_name == 'publish_batch_max_messages':
+                batch_settings['max_messages'] = int(config_value)
+
+            elif config_name == 'publish_flow_control_max_messages':
+                flow_control['message_limit'] = int(config_value)
+
+            elif config_name == 'publish_flow_control_max_bytes':
+                flow_control['byte_limit'] = int(config_value)
+
+            elif config_name == 'publish_message_ordering':
+                publish_message_ordering = config_value in (
+                    '1',
+                    'true',
+                    't',
+                    'True',
+                    'y',
+                    'yes',
+                )
+
+            elif config_name == 'publish_flow_control_limit_exceeded':
+                flow_control['limit_exceeded_behavior'] = (
+                    LimitExceededBehavior(config_value)
+                )
+
+        self._publish_batch_settings = BatchSettings(**batch_settings)
+        self._publisher_options = PublisherOptions(
+            enable_message_ordering=publish_message_ordering,
+            flow_control=PublishFlowControl(**flow_control),
+        )
+        self._publish_message_ordering = publish_message_ordering
+        self._publish_flow_control_blocks = (
+            flow_control.get('limit_exceeded_behavior')
+            == LimitExceededBehavior.BLOCK
+        )
+
+
+async def ack_streamed_message(message: Message) -> 'asyncio.Future[bool]':
+    message.ack()
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(True)
+    return future
+
+
+async def nack_streamed_message(message: Message) -> None:
+    message.nack()
+
+
+class AckBatcher:
+    def __init__(
+        self,
+        acknowledge: Callable[[List[str]], Awaitable[bool]],
+        max_size: int,
+        max_latency: float,
+        logger: Logger = getLogger(__name__),
+    ):
+        self._acknowledge = acknowledge
+        self._max_size = max_size
+        self._max_latency = max_latency
+        self._logger = logger
+        self._pending: Dict[str, 'asyncio.Future[bool]'] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flushes: Set['asyncio.Task[None]'] = set()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, ack_id: str) -> 'asyncio.Future[bool]':
+        loop = asyncio.get_running_loop()
+        future = self._pending.get(ack_id)
+
+        if future is None:
+            future = self._pending[ack_id] = loop.create_future()
+
+        if len(self._pending) >= self._max_size:
+            self.flush()
+
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._max_latency, self.flush)
+
+        return future
+
+    def flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        flush = asyncio.create_task(self._flush(pending))
+        self._flushes.add(flush)
+        flush.add_done_callback(self._flushes.discard)
+
+    async def close(self) -> None:
+        self.flush()
+
+        if self._flushes:
+            await asyncio.wait(self._flushes)
+
+    async def _flush(self, pending: Dict[str, 'asyncio.Future[bool]']) -> None:
+        try:
+            acked = await self._acknowledge(list(pending))
+        except Exception:
+            self._logger.exception(f'ack error; messages={len(pending)}')
+            acked = False
+
+        for future in pending.values():
+            if not future.done():
+                future.set_result(acked)
+
+
+class LeaseManager:
+    def __init__(
+        self,
+        extend: Callable[[str, List[str], int], Awaitable[None]],
+        ack_deadline: float,
+        interval: float,
+        max_lease: float,
+        batch_size: int,
+        logger: Logger = getLogger(__name__),
+    ):
+        self._extend = extend
+        self._ack_deadline = ack_deadline
+        self._interval = interval
+        self._max_lease = max_lease
+        self._batch_size = batch_size
+        self._logger = logger
+        self._leases: Dict[str, Tuple[str, float, float]] = {}
+        self._task: Optional['asyncio.Task[None]'] = None
+
+    def __len__(self) -> int:
+        return len(self._leases)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        self._leases.clear()
+
+    def lease(
+        self, pubsub_channel: str, ack_id: str, leased_at: float
+    ) -> None:
+        self._leases[ack_id] = (
+            pubsub_channel,
+            leased_at,
+            leased_at + self._ack_deadline,
+        )
+
+    def release(self, ack_id: str) -> None:
+        self._leases.pop(ack_id, None)
+
+    async def extend(self) -> None:
+        now = time.monotonic()
+        extend_until = now + 2 * self._interval
+        expires_at = now + self._ack_deadline
+        channels_ack_ids: DefaultDict[str, List[str]] = defaultdict(list)
+
+        for ack_id, (pubsub_channel, leased_at, deadline) in list(
+            self._leases.items()
+        ):
+            if now - leased_at >= self._max_lease:
+                self._logger.warning(
+                    f'max lease {self._max_lease} reached; '
+                    f'channel={pubsub_channel}; ack_id={ack_id}'
+                )
+                del self._leases[ack_id]
+
+            elif deadline <= extend_until:
+                channels_ack_ids[pubsub_channel].append(ack_id)
+                self._leases[ack_id] = (pubsub_channel, leased_at, expires_at)
+
+        await asyncio.gather(
+            *(
+                self._extend_batch(
+                    pubsub_channel, ack_ids[index:index + self._batch_size]
+                )
+                for pubsub_channel, ack_ids in channels_ack_ids.items()
+                for index in range(0, len(ack_ids), self._batch_size)
+            )
+        )
+
+    async def _extend_batch(
+        self, pubsub_channel: str, ack_ids: List[str]
+    ) -> None:
+        try:
+            await self._extend(
+                pubsub_channel, ack_ids, int(self._ack_deadline)
+            )
+        except Exception:
+            self._logger.exception(
+                f'lease extension error; channel={pubsub_channel}; '
+                f'messages={len(ack_ids)}'
+            )
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            await self.extend()
@@ -1,21 +1,477 @@
 import asyncio
-from typing import Dict
+import functools
+import heapq
+from logging import Logger, getLogger
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 from urllib.parse import urlparse
 
+from aiokafka import (
+    AIOKafkaConsumer,
+    AIOKafkaProducer,
+    ConsumerRebalanceListener,
+    ConsumerRecord,
+    TopicPartition,
+)
 from broadcaster._backends.kafka import KafkaBackend as BroadcasterKafkaBackend
 
+from asyncapi import KafkaInvalidCommitModeError
+
+from .. import Event, PublishManyHint, message_bytes
+
+
+AUTO_COMMIT_MODE = 'auto'
+AT_LEAST_ONCE_COMMIT_MODE = 'at-least-once'
+COMMIT_MODES = (AUTO_COMMIT_MODE, AT_LEAST_ONCE_COMMIT_MODE)
+RevokeCallbackHint = Callable[[Set[TopicPartition]], Awaitable[None]]
+AssignCallbackHint = Callable[[Set[TopicPartition]], None]
+
+
+class PartitionOffsets:
+    def __init__(self) -> None:
+        self._pending: Set[int] = set()
+        self._pending_heap: List[int] = []
+        self._next_offset: Optional[int] = None
+        self.committed: Optional[int] = None
+
+    def track(self, offset: int) -> None:
+        self._pending.add(offset)
+        heapq.heappush(self._pending_heap, offset)
+        self._next_offset = offset + 1
+
+    def done(self, offset: int) -> None:
+        self._pending.discard(offset)
+
+    def watermark(self) -> Optional[int]:
+        while self._pending_heap and (
+            self._pending_heap[0] not in self._pending
+        ):
+            heapq.heappop(self._pending_heap)
+
+        if self._pending_heap:
+            return self._pending_heap[0]
+
+        return self._next_offset
+
+    def compact(self) -> None:
+        if len(self._pending_heap) > 2 * len(self._pending):
+            self._pending_heap = sorted(self._pending)
+
+    def uncommitted(self) -> Optional[int]:
+        self.compact()
+        watermark = self.watermark()
+
+        if watermark is None or watermark == self.committed:
+            return None
+
+        return watermark
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
 
 class KafkaBackend(BroadcasterKafkaBackend):
-    def __init__(self, url: str, bindings: Dict[str, str] = {}):
+    def __init__(
+        self,
+        url: str,
+        bindings: Dict[str, str] = {},
+        logger: Logger = getLogger(__name__),
+    ):
         super().__init__(url)
         self._servers = urlparse(url).netloc.split(',')
+        self._offsets: Dict[TopicPartition, PartitionOffsets] = {}
+        self._uncommitted_acks = 0
+        self._commit_task: Optional['asyncio.Task[None]'] = None
+        self._lane_paused: Set[TopicPartition] = set()
+        self._revoke_callbacks: List[RevokeCallbackHint] = []
+        self._assign_callbacks: List[AssignCallbackHint] = []
+        self._logger = logger
+        self._set_consumer_config(bindings)
+        self._set_producer_config(bindings)
+
+    async def connect(self) -> None:
+        self._producer = AIOKafkaProducer(
+            bootstrap_servers=self._servers, **self._producer_config
+        )
+        self._consumer = AIOKafkaConsumer(
+            bootstrap_servers=self._servers, **self._consumer_config
+        )
+        self._commit_lock = asyncio.Lock()
+        await self._producer.start()
+        await self._consumer.start()
+
+        if self._commit_mode == AT_LEAST_ONCE_COMMIT_MODE:
+            self._commit_task = asyncio.create_task(self._run_commit_loop())
+
+    async def subscribe(self, channel: str) -> None:
+        self._consumer_channels.add(channel)
+        self._consumer.subscribe(
+            topics=self._consumer_channels,
+            listener=KafkaRebalanceListener(self),
+        )
 
     async def unsubscribe(self, channel: str) -> None:
         self._consumer.unsubscribe()
 
     async def disconnect(self) -> None:
         await self._producer.stop()
+
+        if self._commit_task is not None:
+            self._commit_task.cancel()
+            self._commit_task = None
+            await self.commit()
+
         try:
             await asyncio.wait_for(self._consumer.stop(), timeout=1)
         except asyncio.TimeoutError:
             await self._consumer._client.close()
+
+    def pause(self) -> None:
+        self._consumer.pause(*self._consumer.assignment())
+
+    def resume(self) -> None:
+        self._consumer.resume(*(self._consumer.paused() - self._lane_paused))
+
+    @property
+    def partition_lanes(self) -> bool:
+        return self._partition_lanes
+
+    def pause_partition(self, partition: TopicPartition) -> None:
+        if partition in self._consumer.assignment():
+            self._lane_paused.add(partition)
+            self._consumer.pause(partition)
+
+    def resume_partition(self, partition: TopicPartition) -> None:
+        self._lane_paused.discard(partition)
+
+        if partition in self._consumer.assignment():
+            self._consumer.resume(partition)
+
+    def add_revoke_callback(self, callback: RevokeCallbackHint) -> None:
+        self._revoke_callbacks.append(callback)
+
+    def remove_revoke_callback(self, callback: RevokeCallbackHint) -> None:
+        self._revoke_callbacks.remove(callback)
+
+    def add_assign_callback(self, callback: AssignCallbackHint) -> None:
+        self._assign_callbacks.append(callback)
+
+    def remove_assign_callback(self, callback: AssignCallbackHint) -> None:
+        self._assign_callbacks.remove(callback)
+
+    async def publish(
+        self,
+        channel: str,
+        message: Any,
+        headers: Optional[Dict[str, str]] = None,
+        key: Optional[str] = None,
+    ) -> None:
+        await self._producer.send_and_wait(
+            channel,
+            message_bytes(message),
+            key=kafka_key(key),
+            headers=kafka_headers(headers),
+        )
+
+    async def publish_many(
+        self, channel: str, messages: Sequence[PublishManyHint],
+    ) -> List[Optional[BaseException]]:
+        deliveries: List[Any] = []
+
+        for message, headers, key in messages:
+            try:
+                deliveries.append(
+                    await self._producer.send(
+                        channel,
+                        message_bytes(message),
+                        key=kafka_key(key),
+                        headers=kafka_headers(headers),
+                    )
+                )
+            except Exception as error:
+                deliveries.append(error)
+
+        await self._producer.flush()
+        errors: List[Optional[BaseException]] = []
+
+        for delivery in deliveries:
+            if isinstance(delivery, BaseException):
+                errors.append(delivery)
+                continue
+
+            try:
+                await delivery
+            except Exception as error:
+                errors.append(error)
+            else:
+                errors.append(None)
+
+        return errors
+
+    async def next_published(self) -> Event:
+        return self._record_event(await self._consumer.getone())
+
+    async def next_published_many(self) -> List[Event]:
+        partitions_records = await self._consumer.getmany(
+            timeout_ms=self._fetch_timeout_ms, max_records=self._max_records
+        )
+        return [
+            self._record_event(record)
+            for records in partitions_records.values()
+            for record in records
+        ]
+
+    @property
+    def fetch_many(self) -> bool:
+        return self._fetch_many
+
+    def _record_event(self, record: ConsumerRecord) -> Event:
+        partition = TopicPartition(record.topic, record.partition)
+        event = Event(
+            record.topic,
+            record.value,
+            headers=record_headers(record),
+            id=f'{record.topic}:{record.partition}:{record.offset}',
+            partition=partition,
+            key=(
+                None
+                if record.key is None
+                else record.key.decode(errors='replace')
+            ),
+        )
+
+        if self._commit_mode == AT_LEAST_ONCE_COMMIT_MODE:
+            offsets = self._offsets.get(partition)
+
+            if offsets is None:
+                offsets = self._offsets[partition] = PartitionOffsets()
+
+            offsets.track(record.offset)
+            event.context['ack_func'] = functools.partial(
+                self.ack_offset, partition, record.offset
+            )
+
+        return event
+
+    async def ack_offset(self, partition: TopicPartition, offset: int) -> None:
+        offsets = self._offsets.get(partition)
+
+        if offsets is None:
+            return
+
+        offsets.done(offset)
+        self._uncommitted_acks += 1
+
+        if self._uncommitted_acks >= self._commit_batch_size:
+            await self.commit()
+
+    async def commit(
+        self, partitions: Optional[Iterable[TopicPartition]] = None
+    ) -> None:
+        async with self._commit_lock:
+            self._uncommitted_acks = 0
+            commit_offsets: Dict[TopicPartition, int] = {}
+
+            for partition in (
+                self._offsets if partitions is None else partitions
+            ):
+                offsets = self._offsets.get(partition)
+                offset = None if offsets is None else offsets.uncommitted()
+
+                if offset is not None:
+                    commit_offsets[partition] = offset
+
+            if not commit_offsets:
+                return
+
+            try:
+                await self._consumer.commit(commit_offsets)
+            except Exception:
+                self._logger.exception(
+                    f'commit error; partitions={len(commit_offsets)}'
+                )
+                return
+
+            for partition, offset in commit_offsets.items():
+                offsets = self._offsets.get(partition)
+
+                if offsets is not None:
+                    offsets.committed = offset
+
+    async def revoke_partitions(self, partitions: Set[TopicPartition]) -> None:
+        for callback in list(self._revoke_callbacks):
+            await callback(partitions)
+
+        self._lane_paused -= partitions
+
+        if self._commit_mode == AT_LEAST_ONCE_COMMIT_MODE:
+            await self.commit(partitions)
+
+        for partition in partitions:
+            self._offsets.pop(partition, None)
+
+    def assign_partitions(self, partitions: Set[TopicPartition]) -> None:
+        for callback in list(self._assign_callbacks):
+            callback(partitions)
+
+    async def _run_commit_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._commit_interval)
+            await self.commit()
+
+    def _set_consumer_config(self, bindings: Dict[str, str]) -> None:
+        consumer_config: Dict[str, Any] = {}
+        commit_mode = AUTO_COMMIT_MODE
+        commit_batch_size = 100
+        commit_interval = 1.0
+        partition_lanes = False
+        fetch_many = False
+        max_records = 500
+        fetch_timeout_ms = 1000
+
+        for config_name, config_value in bindings.items():
+            if config_name in ('group_id', 'auto_offset_reset'):
+                consumer_config[config_name] = config_value
+
+            elif config_name in (
+                'fetch_max_bytes',
+                'fetch_min_bytes',
+                'fetch_max_wait_ms',
+                'max_partition_fetch_bytes',
+                'max_poll_records',
+                'auto_commit_interval_ms',
+            ):
+                consumer_config[config_name] = int(config_value)
+
+            elif config_name == 'enable_auto_commit':
+                consumer_config[config_name] = config_value in (
+                    '1',
+                    'true',
+                    't',
+                    'True',
+                    'y',
+                    'yes',
+                )
+
+            elif config_name == 'consumer_partition_lanes':
+                partition_lanes = config_value in (
+                    '1',
+                    'true',
+                    't',
+                    'True',
+                    'y',
+                    'yes',
+                )
+
+            elif config_name == 'consumer_fetch_many':
+                fetch_many = config_value in (
+                    '1',
+                    'true',
+                    't',
+                    'True',
+                    'y',
+                    'yes',
+                )
+
+            elif config_name == 'consumer_max_records':
+                max_records = int(config_value)
+
+            elif config_name == 'consumer_fetch_timeout_ms':
+                fetch_timeout_ms = int(config_value)
+
+            elif config_name == 'consumer_commit_mode':
+                commit_mode = config_value
+
+                if commit_mode not in COMMIT_MODES:
+                    raise KafkaInvalidCommitModeError(
+                        commit_mode,
+                        f'valid commit modes: {", ".join(COMMIT_MODES)}',
+                    )
+
+            elif config_name == 'consumer_commit_batch_size':
+                commit_batch_size = int(config_value)
+
+            elif config_name == 'consumer_commit_interval':
+                commit_interval = float(config_value)
+
+        if commit_mode == AT_LEAST_ONCE_COMMIT_MODE:
+            if 'group_id' not in consumer_config:
+                raise KafkaInvalidCommitModeError(
+                    commit_mode, 'group_id binding is required'
+                )
+
+            consumer_config['enable_auto_commit'] = False
+
+        self._consumer_config = consumer_config
+        self._commit_mode = commit_mode
+        self._commit_batch_size = commit_batch_size
+        self._commit_interval = commit_interval
+        self._partition_lanes = partition_lanes
+        self._fetch_many = fetch_many
+        self._max_records = max_records
+        self._fetch_timeout_ms = fetch_timeout_ms
+
+    def _set_producer_config(self, bindings: Dict[str, str]) -> None:
+        producer_config: Dict[str, Any] = {}
+
+        for config_name, config_value in bindings.items():
+            if config_name in ('linger_ms', 'max_batch_size'):
+                producer_config[config_name] = int(config_value)
+
+            elif config_name == 'compression_type':
+                producer_config[config_name] = config_value
+
+            elif config_name == 'acks':
+                producer_config[config_name] = (
+                    config_value
+                    if config_value == 'all'
+                    else int(config_value)
+                )
+
+        self._producer_config = producer_config
+
+
+class KafkaRebalanceListener(ConsumerRebalanceListener):
+    def __init__(self, backend: KafkaBackend):
+        self._backend = backend
+
+    async def on_partitions_revoked(
+        self, revoked: Set[TopicPartition]
+    ) -> None:
+        await self._backend.revoke_partitions(revoked)
+
+    async def on_partitions_assigned(
+        self, assigned: Set[TopicPartition]
+    ) -> None:
+        self._backend.assign_partitions(assigned)
+
+
+def kafka_key(key: Optional[str]) -> Optional[bytes]:
+    return None if key is None else key.encode()
+
+
+def record_headers(record: ConsumerRecord) -> Dict[str, str]:
+    return {
+        name: value.decode(errors='replace')
+        for name, value in record.headers or ()
+        if value is not None
+    }
+
+
+def kafka_headers(
+    headers: Optional[Dict[str, str]]
+) -> Optional[List[Tuple[str, bytes]]]:
+    if not headers:
+        return None
+
+    return [(name, value.encode()) for name, value in headers.items()]
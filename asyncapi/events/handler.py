@@ -1,17 +1,48 @@
+import asyncio
+import contextlib
 import itertools
-from typing import Any, Dict
+import logging
+from collections import defaultdict, deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    DefaultDict,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+)
 from urllib.parse import urlparse
 
-from broadcaster import Broadcast
+from broadcaster import Broadcast, Event
 from broadcaster._backends.base import BroadcastBackend
+from broadcaster._base import Subscriber as BroadcasterSubscriber
 
-from ..exceptions import GCloudPubSubConsumerDisconnectError
+from ..compression import CONTENT_ENCODING_HEADER, Compressor, get_compressor
+from ..exceptions import (
+    ChannelDispatcherAlreadyRegisteredError,
+    GCloudPubSubConsumerDisconnectError,
+)
+from . import PublishManyHint
+
+
+DispatcherHint = Callable[[Event], Awaitable[None]]
+DEFAULT_MAX_DECOMPRESSED_BYTES = 64 * 1024 * 1024
+DEFAULT_DECOMPRESS_EXECUTOR_BYTES = 256 * 1024
 
 
 class EventsHandler(Broadcast):
     _backend: BroadcastBackend
 
-    def __init__(self, url: str, bindings: Dict[str, Any] = {}):
+    def __init__(
+        self,
+        url: str,
+        bindings: Dict[str, Any] = {},
+        logger: logging.Logger = logging.getLogger(__name__),
+    ):
         super().__init__(url)
 
         parsed_url = urlparse(url)
@@ -26,14 +57,424 @@ class EventsHandler(Broadcast):
 
             self._backend = GCloudPubSubBackend(url, bindings)
 
+        self._set_flow_control_config(bindings)
+        self._dispatchers: Dict[str, DispatcherHint] = {}
+        self._inflight_bytes: DefaultDict[str, int] = defaultdict(int)
+        self._decompressors: Dict[str, Compressor] = {}
+        self._logger = logger
+
+    async def connect(self) -> None:
+        self._flow_resumed = asyncio.Event()
+        self._flow_resumed.set()
+        await super().connect()
+
+    async def publish(
+        self,
+        channel: str,
+        message: Any,
+        headers: Optional[Dict[str, str]] = None,
+        key: Optional[str] = None,
+    ) -> None:
+        kwargs: Dict[str, Any] = {}
+
+        if headers:
+            kwargs['headers'] = headers
+
+        if key is not None:
+            kwargs['key'] = key
+
+        await self._backend.publish(channel, message, **kwargs)
+
+    async def publish_many(
+        self, channel: str, messages: Sequence[PublishManyHint],
+    ) -> List[Optional[BaseException]]:
+        publish_many = getattr(self._backend, 'publish_many', None)
+
+        if publish_many is not None:
+            return await publish_many(  # type: ignore
+                channel, messages
+            )
+
+        return await asyncio.gather(
+            *(
+                self.publish(channel, message, headers, key)
+                for message, headers, key in messages
+            ),
+            return_exceptions=True,
+        )
+
+    @property
+    def direct_dispatch(self) -> bool:
+        return self._direct_dispatch
+
+    async def dispatch(self, channel: str, dispatcher: DispatcherHint) -> None:
+        if channel in self._dispatchers:
+            raise ChannelDispatcherAlreadyRegisteredError(channel)
+
+        self._dispatchers[channel] = dispatcher
+
+        try:
+            if not self._subscribers.get(channel):
+                await self._backend.subscribe(channel)
+
+            await asyncio.wait({self._listener_task})
+        finally:
+            del self._dispatchers[channel]
+
+            if (
+                not self._subscribers.get(channel)
+                and not self._listener_task.done()
+            ):
+                await self._backend.unsubscribe(channel)
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator['Subscriber']:
+        queue: 'asyncio.Queue[Any]' = asyncio.Queue(
+            maxsize=self._queue_high_watermark
+        )
+
+        subscriber = Subscriber(queue, self._event_consumed)
+
+        try:
+            if not self._subscribers.get(channel):
+                if channel not in self._dispatchers:
+                    await self._backend.subscribe(channel)
+
+                self._subscribers[channel] = set([queue])
+            else:
+                self._subscribers[channel].add(queue)
+
+            yield subscriber
+
+        finally:
+            self._subscribers.get(channel, set()).discard(queue)
+
+            for event in subscriber.drain():
+                self._inflight_bytes[channel] -= len(event.message)
+
+            if not self._subscribers.get(channel):
+                self._subscribers.pop(channel, None)
+                self._inflight_bytes.pop(channel, None)
+
+                if channel not in self._dispatchers:
+                    await self._backend.unsubscribe(channel)
+
+            with contextlib.suppress(asyncio.QueueFull):
+                queue.put_nowait(None)
+
+            if not self._flow_resumed.is_set() and self._can_resume():
+                self._resume()
+
     async def _listener(self) -> None:
+        next_published_many = (
+            getattr(self._backend, 'next_published_many', None)
+            if getattr(self._backend, 'fetch_many', False)
+            else None
+        )
+
         while True:
+            if not self._flow_resumed.is_set():
+                await self._flow_resumed.wait()
+
             try:
-                event = await self._backend.next_published()
+                if next_published_many is None:
+                    event = await self._backend.next_published()
+                else:
+                    events = await next_published_many()
             except GCloudPubSubConsumerDisconnectError:
                 for queue in itertools.chain(*self._subscribers.values()):
                     queue.clear()
                     return
             else:
-                for queue in list(self._subscribers.get(event.channel, [])):
-                    await queue.put(event)
+                if next_published_many is None:
+                    dispatcher = self._dispatchers.get(event.channel)
+
+                    if dispatcher is None:
+                        await self._forward(event.channel, [event])
+                    else:
+                        await self._dispatch(dispatcher, [event])
+
+                    continue
+
+                channels_events: DefaultDict[str, List[Event]] = defaultdict(
+                    list
+                )
+
+                for event in events:
+                    channels_events[event.channel].append(event)
+
+                for channel, channel_events in channels_events.items():
+                    dispatcher = self._dispatchers.get(channel)
+
+                    if dispatcher is None:
+                        await self._forward(
+                            channel, channel_events, batch=True
+                        )
+                    else:
+                        await self._dispatch(dispatcher, channel_events)
+
+    async def _dispatch(
+        self, dispatcher: DispatcherHint, events: List[Event]
+    ) -> None:
+        for event in await self._decompress_events(events):
+            try:
+                await dispatcher(event)
+            except Exception:
+                self._logger.exception(
+                    f'dispatch error; channel={event.channel}'
+                )
+
+    async def _forward(
+        self, channel: str, events: List[Event], batch: bool = False
+    ) -> None:
+        events = await self._decompress_events(events)
+
+        if not events:
+            return
+
+        item = events if batch else events[0]
+        message_size = sum(len(event.message) for event in events)
+        queues = list(self._subscribers.get(channel, []))
+
+        for queue in queues:
+            await queue.put(item)
+            self._inflight_bytes[channel] += message_size
+
+        if self._should_pause(channel):
+            self._pause()
+
+    @property
+    def partition_lanes(self) -> bool:
+        return bool(getattr(self._backend, 'partition_lanes', False))
+
+    def pause_partition(self, partition: Any) -> None:
+        self._backend.pause_partition(partition)  # type: ignore
+
+    def resume_partition(self, partition: Any) -> None:
+        self._backend.resume_partition(partition)  # type: ignore
+
+    def add_revoke_callback(
+        self, callback: Callable[[Any], Awaitable[None]]
+    ) -> None:
+        self._backend.add_revoke_callback(callback)  # type: ignore
+
+    def remove_revoke_callback(
+        self, callback: Callable[[Any], Awaitable[None]]
+    ) -> None:
+        self._backend.remove_revoke_callback(callback)  # type: ignore
+
+    def add_assign_callback(self, callback: Callable[[Any], None]) -> None:
+        self._backend.add_assign_callback(callback)  # type: ignore
+
+    def remove_assign_callback(
+        self, callback: Callable[[Any], None]
+    ) -> None:
+        self._backend.remove_assign_callback(callback)  # type: ignore
+
+    async def _decompress_events(self, events: List[Event]) -> List[Event]:
+        decompressed = []
+
+        for event in events:
+            headers = getattr(event, 'headers', None)
+
+            if (
+                headers
+                and CONTENT_ENCODING_HEADER in headers
+                and not await self._decompress(
+                    event, headers.pop(CONTENT_ENCODING_HEADER)
+                )
+            ):
+                continue
+
+            decompressed.append(event)
+
+        return decompressed
+
+    async def _decompress(self, event: Event, encoding: str) -> bool:
+        try:
+            decompressor = self._decompressors.get(encoding)
+
+            if decompressor is None:
+                decompressor = self._decompressors[encoding] = get_compressor(
+                    encoding
+                )
+
+            if len(event.message) < self._decompress_executor_bytes:
+                event.message = decompressor.decompress(
+                    event.message, self._max_decompressed_bytes
+                )
+            else:
+                loop = asyncio.get_running_loop()
+                event.message = await loop.run_in_executor(
+                    None,
+                    decompressor.decompress,
+                    event.message,
+                    self._max_decompressed_bytes,
+                )
+
+            return True
+
+        except Exception:
+            self._logger.exception(
+                f'decompress error; channel={event.channel}; '
+                f'{CONTENT_ENCODING_HEADER}={encoding}'
+            )
+
+        # the compressed message can't be decoded by the operations,
+        # so it is dropped like the undecodable payloads
+        ack_func = getattr(event, 'context', {}).get('ack_func')
+
+        if ack_func is not None:
+            try:
+                await ack_func()
+            except Exception:
+                self._logger.exception(
+                    f'ack error; channel={event.channel}'
+                )
+
+        return False
+
+    def _event_consumed(self, event: Event) -> None:
+        self._inflight_bytes[event.channel] -= len(event.message)
+
+        if not self._flow_resumed.is_set() and self._can_resume():
+            self._resume()
+
+    def _should_pause(self, channel: str) -> bool:
+        if (
+            self._channel_max_inflight_bytes
+            and self._inflight_bytes[channel]
+            >= self._channel_max_inflight_bytes
+        ):
+            return True
+
+        return bool(self._queue_high_watermark) and any(
+            queue.qsize() >= self._queue_high_watermark
+            for queue in self._subscribers.get(channel, [])
+        )
+
+    def _can_resume(self) -> bool:
+        if self._channel_max_inflight_bytes and any(
+            inflight_bytes >= self._channel_max_inflight_bytes
+            for inflight_bytes in self._inflight_bytes.values()
+        ):
+            return False
+
+        return all(
+            queue.qsize() <= self._queue_low_watermark
+            for queue in itertools.chain(*self._subscribers.values())
+        )
+
+    def _pause(self) -> None:
+        self._flow_resumed.clear()
+        pause = getattr(self._backend, 'pause', None)
+
+        if pause:
+            pause()
+
+    def _resume(self) -> None:
+        self._flow_resumed.set()
+        resume = getattr(self._backend, 'resume', None)
+
+        if resume:
+            resume()
+
+    def _set_flow_control_config(self, bindings: Dict[str, Any]) -> None:
+        queue_high_watermark = 1000
+        queue_low_watermark = None
+        channel_max_inflight_bytes = 0
+        direct_dispatch = False
+        max_decompressed_bytes = DEFAULT_MAX_DECOMPRESSED_BYTES
+        decompress_executor_bytes = DEFAULT_DECOMPRESS_EXECUTOR_BYTES
+
+        for config_name, config_value in bindings.items():
+            if config_name == 'subscriber_queue_high_watermark':
+                queue_high_watermark = int(config_value)
+
+            elif config_name == 'subscriber_queue_low_watermark':
+                queue_low_watermark = int(config_value)
+
+            elif config_name == 'channel_max_inflight_bytes':
+                channel_max_inflight_bytes = int(config_value)
+
+            elif config_name == 'max_decompressed_bytes':
+                max_decompressed_bytes = int(config_value)
+
+            elif config_name == 'decompress_executor_bytes':
+                decompress_executor_bytes = int(config_value)
+
+            elif config_name == 'subscriber_direct_dispatch':
+                direct_dispatch = config_value in (
+                    '1',
+                    'true',
+                    't',
+                    'True',
+                    'y',
+                    'yes',
+                )
+
+        self._queue_high_watermark = queue_high_watermark
+        self._queue_low_watermark = (
+            queue_high_watermark // 2
+            if queue_low_watermark is None
+            else queue_low_watermark
+        )
+        self._channel_max_inflight_bytes = channel_max_inflight_bytes
+        self._direct_dispatch = direct_dispatch
+        self._max_decompressed_bytes = max_decompressed_bytes
+        self._decompress_executor_bytes = decompress_executor_bytes
+
+
+class Subscriber(BroadcasterSubscriber):
+    def __init__(
+        self,
+        queue: 'asyncio.Queue[Any]',
+        event_consumed: Callable[[Event], None],
+    ):
+        super().__init__(queue)
+        self._event_consumed = event_consumed
+        self._buffered: Deque[Event] = deque()
+
+    async def get(self) -> Event:
+        if not self._buffered:
+            await self._fill()
+
+        event = self._buffered.popleft()
+        self._event_consumed(event)
+        return event
+
+    async def get_many(self, max_size: int) -> List[Event]:
+        if not self._buffered:
+            await self._fill()
+
+        events = [
+            self._buffered.popleft()
+            for _ in range(min(max_size, len(self._buffered)))
+        ]
+
+        for event in events:
+            self._event_consumed(event)
+
+        return events
+
+    def drain(self) -> List[Event]:
+        events = list(self._buffered)
+        self._buffered.clear()
+
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+
+            if isinstance(item, list):
+                events.extend(item)
+            elif item is not None:
+                events.append(item)
+
+        return events
+
+    async def _fill(self) -> None:
+        item = await super().get()
+
+        if isinstance(item, list):
+            self._buffered.extend(item)
+        else:
+            self._buffered.append(item)
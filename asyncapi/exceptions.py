@@ -42,6 +42,18 @@ class InvalidContentTypeError(AsyncApiError):
     ...
 
 
+class InvalidPayloadEngineError(AsyncApiError):
+    ...
+
+
+class InvalidCompressionError(AsyncApiError):
+    ...
+
+
+class DecompressedSizeExceededError(AsyncApiError):
+    ...
+
+
 class InvalidAsyncApiVersionError(AsyncApiError):
     ...
 
@@ -58,13 +70,41 @@ class InvalidChannelsSubscribersError(AsyncApiError):
     ...
 
 
+class InvalidChannelsConcurrencyError(AsyncApiError):
+    ...
+
+
 class ChannelPublishNotFoundError(AsyncApiError):
     ...
 
 
+class ChannelDispatcherAlreadyRegisteredError(AsyncApiError):
+    ...
+
+
 class GCloudPubSubPublishTimeoutError(AsyncApiError):
     ...
 
 
 class GCloudPubSubConsumerDisconnectError(AsyncApiError):
     ...
+
+
+class GCloudPubSubInvalidConsumerModeError(AsyncApiError):
+    ...
+
+
+class GCloudPubSubReservedAttributeError(AsyncApiError):
+    ...
+
+
+class KafkaInvalidCommitModeError(AsyncApiError):
+    ...
+
+
+class InvalidExecutionModeError(AsyncApiError):
+    ...
+
+
+class PayloadDecodeError(AsyncApiError):
+    ...
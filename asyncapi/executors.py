@@ -0,0 +1,73 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from jsondaora import DeserializationError
+
+from .codecs import JSON_CONTENT_TYPE, get_codec
+from .dispatch import DecoderHint, build_decoder
+from .events import message_preview
+from .exceptions import PayloadDecodeError
+from .payloads import PayloadSpecHint, build_payload_type, schema_hash
+
+
+INLINE_EXECUTION = 'inline'
+THREAD_EXECUTION = 'thread'
+PROCESS_EXECUTION = 'process'
+EXECUTION_MODES = (INLINE_EXECUTION, THREAD_EXECUTION, PROCESS_EXECUTION)
+
+_process_decoders: Dict[Tuple[Hashable, str], DecoderHint] = {}
+_process_loop: Optional[asyncio.AbstractEventLoop] = None
+logger = logging.getLogger(__name__)
+
+
+def process_operation(
+    operation: Callable[..., Any],
+    message: Any,
+    context: Dict[str, Any],
+    content_type: str = JSON_CONTENT_TYPE,
+    payload_spec: Optional[PayloadSpecHint] = None,
+) -> None:
+    global _process_loop
+
+    key = (
+        None
+        if payload_spec is None
+        else (schema_hash(*payload_spec[:2]), payload_spec[2]),
+        content_type,
+    )
+    decoder = _process_decoders.get(key)
+
+    if decoder is None:
+        decoder = _process_decoders[key] = build_decoder(
+            build_payload_type(*payload_spec) if payload_spec else None,
+            get_codec(content_type),
+        )
+
+    if isinstance(message, list):
+        payload = []
+
+        for item in message:
+            try:
+                payload.append(decoder(item))
+            except (PayloadDecodeError, DeserializationError):
+                logger.exception(f'message={message_preview(item)}')
+
+        if not payload:
+            return
+
+    else:
+        # raised as an asyncapi error because the decode errors may not
+        # be pickled back to the parent process
+        try:
+            payload = decoder(message)
+        except DeserializationError as error:
+            raise PayloadDecodeError(f'{type(error).__name__}: {error}')
+
+    result = operation(payload, **context)
+
+    if asyncio.iscoroutine(result):
+        if _process_loop is None:
+            _process_loop = asyncio.new_event_loop()
+
+        _process_loop.run_until_complete(result)
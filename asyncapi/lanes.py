@@ -0,0 +1,214 @@
+import asyncio
+import dataclasses
+import itertools
+import logging
+import zlib
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+)
+
+
+LaneJobHint = Callable[[], Awaitable[None]]
+PartitionFlowHint = Callable[[Any], None]
+
+
+@dataclasses.dataclass
+class LanesStats:
+    lanes: int
+    depth: int
+    occupancy: List[int]
+    max_occupancy: List[int]
+    processed: List[int]
+
+
+class Lanes:
+    def __init__(
+        self,
+        size: int,
+        depth: int,
+        logger: logging.Logger = logging.getLogger(__name__),
+    ):
+        self._queues: List['asyncio.Queue[Optional[LaneJobHint]]'] = [
+            asyncio.Queue(maxsize=depth) for _ in range(size)
+        ]
+        self._tasks: List['asyncio.Task[None]'] = []
+        self._max_occupancy = [0] * size
+        self._processed = [0] * size
+        self._round_robin = itertools.cycle(range(size))
+        self._depth = depth
+        self._logger = logger
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._worker(index))
+            for index in range(len(self._queues))
+        ]
+
+    async def put(self, key: Any, job: LaneJobHint) -> None:
+        index = self.lane_index(key)
+        queue = self._queues[index]
+        await queue.put(job)
+
+        if queue.qsize() > self._max_occupancy[index]:
+            self._max_occupancy[index] = queue.qsize()
+
+    async def close(self) -> None:
+        for queue in self._queues:
+            await queue.put(None)
+
+        await asyncio.gather(*self._tasks)
+
+    def lane_index(self, key: Any) -> int:
+        if key is None:
+            return next(self._round_robin)
+
+        if not isinstance(key, bytes):
+            key = str(key).encode()
+
+        return zlib.crc32(key) % len(self._queues)
+
+    def stats(self) -> LanesStats:
+        return LanesStats(
+            lanes=len(self._queues),
+            depth=self._depth,
+            occupancy=[queue.qsize() for queue in self._queues],
+            max_occupancy=list(self._max_occupancy),
+            processed=list(self._processed),
+        )
+
+    async def _worker(self, index: int) -> None:
+        queue = self._queues[index]
+
+        while True:
+            job = await queue.get()
+
+            if job is None:
+                return
+
+            try:
+                await job()
+            except Exception:
+                self._logger.exception(f'lane={index}')
+
+            self._processed[index] += 1
+
+
+@dataclasses.dataclass
+class PartitionLane:
+    queue: 'asyncio.Queue[Optional[LaneJobHint]]' = dataclasses.field(
+        default_factory=asyncio.Queue
+    )
+    task: Optional['asyncio.Task[None]'] = None
+    paused: bool = False
+    max_occupancy: int = 0
+    processed: int = 0
+
+
+class PartitionLanes:
+    def __init__(
+        self,
+        depth: int,
+        pause: PartitionFlowHint,
+        resume: PartitionFlowHint,
+        logger: logging.Logger = logging.getLogger(__name__),
+    ):
+        self._lanes: Dict[Any, PartitionLane] = {}
+        self._revoked: Set[Any] = set()
+        self._tasks: Set['asyncio.Task[None]'] = set()
+        self._depth = depth
+        self._resume_size = depth // 2
+        self._pause = pause
+        self._resume = resume
+        self._logger = logger
+
+    async def put(self, partition: Any, job: LaneJobHint) -> None:
+        if partition in self._revoked:
+            return
+
+        lane = self._lanes.get(partition)
+
+        if lane is None:
+            lane = self._lanes[partition] = PartitionLane()
+            lane.task = asyncio.create_task(self._worker(partition, lane))
+            self._tasks.add(lane.task)
+            lane.task.add_done_callback(self._tasks.discard)
+
+        lane.queue.put_nowait(job)
+        occupancy = lane.queue.qsize()
+
+        if occupancy > lane.max_occupancy:
+            lane.max_occupancy = occupancy
+
+        if occupancy >= self._depth and not lane.paused:
+            lane.paused = True
+            self._pause(partition)
+
+    async def revoke(self, partitions: Iterable[Any]) -> None:
+        tasks = []
+
+        for partition in partitions:
+            self._revoked.add(partition)
+            lane = self._lanes.pop(partition, None)
+
+            if lane is None:
+                continue
+
+            lane.paused = False
+
+            while not lane.queue.empty():
+                lane.queue.get_nowait()
+
+            lane.queue.put_nowait(None)
+
+            if lane.task is not None:
+                tasks.append(lane.task)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    def assign(self, partitions: Iterable[Any]) -> None:
+        self._revoked.difference_update(partitions)
+
+    async def close(self) -> None:
+        for lane in self._lanes.values():
+            lane.queue.put_nowait(None)
+
+        self._lanes.clear()
+
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
+
+    def stats(self) -> LanesStats:
+        lanes = list(self._lanes.values())
+        return LanesStats(
+            lanes=len(lanes),
+            depth=self._depth,
+            occupancy=[lane.queue.qsize() for lane in lanes],
+            max_occupancy=[lane.max_occupancy for lane in lanes],
+            processed=[lane.processed for lane in lanes],
+        )
+
+    async def _worker(self, partition: Any, lane: PartitionLane) -> None:
+        while True:
+            job = await lane.queue.get()
+
+            if job is None:
+                return
+
+            try:
+                await job()
+            except Exception:
+                self._logger.exception(f'partition={partition}')
+
+            lane.processed += 1
+
+            if lane.paused and lane.queue.qsize() <= self._resume_size:
+                lane.paused = False
+                self._resume(partition)
@@ -0,0 +1,258 @@
+import copy
+import dataclasses
+import hashlib
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+import orjson
+from jsondaora import DeserializationError, jsonschema_asdataclass
+
+
+JSONDAORA_ENGINE = 'jsondaora'
+COMPILED_ENGINE = 'compiled'
+PAYLOAD_ENGINES = (JSONDAORA_ENGINE, COMPILED_ENGINE)
+
+Converter = Callable[[str, Any], Any]
+PayloadSpecHint = Tuple[str, Dict[str, Any], str]
+
+_compiled_types: Dict[str, Type[Any]] = {}
+
+
+def build_payload_type(
+    id_: str, schema: Dict[str, Any], payload_engine: str = JSONDAORA_ENGINE
+) -> Type[Any]:
+    type_ = (
+        compiled_asdataclass(id_, schema)
+        if payload_engine == COMPILED_ENGINE
+        else jsonschema_asdataclass(id_, schema)
+    )
+    # keeps the type inputs so that the process pool workers, which can't
+    # unpickle the generated types, are able to build them again
+    type_.__payload_spec__ = (id_, schema, payload_engine)
+    return type_
+
+
+def compiled_asdataclass(id_: str, schema: Dict[str, Any]) -> Type[Any]:
+    key = schema_hash(id_, schema)
+    type_ = _compiled_types.get(key)
+
+    if type_ is None:
+        type_ = _compiled_types[key] = compile_payload_type(id_, schema)
+
+    return type_
+
+
+def schema_hash(id_: str, schema: Dict[str, Any]) -> str:
+    return hashlib.sha1(
+        orjson.dumps([id_, schema], option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()
+
+
+def compile_payload_type(id_: str, schema: Dict[str, Any]) -> Type[Any]:
+    properties: Dict[str, Dict[str, Any]] = schema.get('properties', {})
+    required = set(schema.get('required', []))
+    annotations: Dict[str, Any] = {}
+    fields: List[Tuple[str, Any, Converter, bool, Any]] = []
+
+    for name, prop in properties.items():
+        type_, convert = compile_property(f'{id_}_{name}', prop)
+        annotations[name] = type_ if name in required else Optional[type_]
+        fields.append(
+            (
+                name,
+                type_,
+                convert,
+                name in required and 'default' not in prop,
+                prop.get('default'),
+            )
+        )
+
+    names = tuple(properties)
+    defaults = {name: default for name, *_, default in fields}
+    namespace: Dict[str, Any] = {
+        '__annotations__': annotations,
+        '__init__': compile_init(id_, names, defaults),
+        '__repr__': compile_repr(id_, names),
+        '__eq__': compile_eq(names),
+        '__hash__': None,
+        '__module__': __name__,
+    }
+
+    if all(name.isidentifier() for name in names):
+        namespace['__slots__'] = names
+
+    # repr and eq are generated by dataclass from the field names, which
+    # come from the spec and may not be valid python identifiers
+    cls: Type[Any] = dataclasses.dataclass(init=False, repr=False, eq=False)(
+        type(id_, (), namespace)
+    )
+
+    def decode(data: Any) -> Any:
+        if type(data) is not dict:
+            raise DeserializationError(id_, dict, data)
+
+        payload = object.__new__(cls)
+
+        for name, type_, convert, is_required, default in fields:
+            value = data.get(name)
+
+            if value is None:
+                if is_required:
+                    raise DeserializationError(name, type_, value)
+
+                value = default_value(default)
+            else:
+                value = convert(name, value)
+
+            setattr(payload, name, value)
+
+        return payload
+
+    cls.__decode__ = staticmethod(decode)
+    cls.__additional_properties__ = schema.get('additionalProperties', False)
+
+    return cls
+
+
+def compile_init(
+    id_: str, names: Tuple[str, ...], defaults: Dict[str, Any]
+) -> Callable[..., None]:
+    def __init__(self: Any, *args: Any, **kwargs: Any) -> None:
+        if len(args) > len(names):
+            raise TypeError(
+                f'{id_} takes {len(names)} positional arguments '
+                f'but {len(args)} were given'
+            )
+
+        for name, value in zip(names, args):
+            if name in kwargs:
+                raise TypeError(f'{id_} got multiple values for {name!r}')
+
+            setattr(self, name, value)
+
+        for name in names[len(args):]:
+            if name in kwargs:
+                setattr(self, name, kwargs.pop(name))
+            else:
+                setattr(self, name, default_value(defaults[name]))
+
+        if kwargs:
+            raise TypeError(
+                f'{id_} got unexpected arguments: {", ".join(kwargs)}'
+            )
+
+    return __init__
+
+
+def compile_repr(id_: str, names: Tuple[str, ...]) -> Callable[[Any], str]:
+    def __repr__(self: Any) -> str:
+        values = ', '.join(
+            f'{name}={getattr(self, name)!r}' for name in names
+        )
+        return f'{id_}({values})'
+
+    return __repr__
+
+
+def compile_eq(names: Tuple[str, ...]) -> Callable[[Any, Any], Any]:
+    def __eq__(self: Any, other: Any) -> Any:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+
+        return all(
+            getattr(self, name) == getattr(other, name) for name in names
+        )
+
+    return __eq__
+
+
+def default_value(default: Any) -> Any:
+    if isinstance(default, (list, dict)):
+        return copy.deepcopy(default)
+
+    return default
+
+
+def compile_property(id_: str, prop: Dict[str, Any]) -> Tuple[Any, Converter]:
+    if prop.get('type') == 'array':
+        item_type, item_convert = compile_value(id_, prop.get('items', {}))
+
+        def convert(name: str, value: Any) -> Any:
+            if type(value) is list:
+                return [item_convert(name, item) for item in value]
+
+            return as_list(name, value)
+
+        return List[item_type], convert  # type: ignore
+
+    return compile_value(id_, prop)
+
+
+def compile_value(id_: str, prop: Dict[str, Any]) -> Tuple[Any, Converter]:
+    prop_type = prop.get('type')
+
+    if prop_type == 'object':
+        nested = compiled_asdataclass(id_, prop)
+        decode = nested.__decode__
+        return nested, lambda name, value: decode(value)
+
+    if prop_type in SCALARS:
+        scalar, converter = SCALARS[prop_type]
+        return scalar, compile_scalar(scalar, converter)
+
+    return Any, lambda name, value: value
+
+
+def compile_scalar(scalar: Type[Any], converter: Converter) -> Converter:
+    def convert(name: str, value: Any) -> Any:
+        if type(value) is scalar:
+            return value
+
+        return converter(name, value)
+
+    return convert
+
+
+def as_int(name: str, value: Any) -> int:
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+
+    if isinstance(value, (int, str)) and not isinstance(value, bool):
+        try:
+            return int(value)
+        except ValueError:
+            ...
+
+    raise DeserializationError(name, int, value)
+
+
+def as_float(name: str, value: Any) -> float:
+    if isinstance(value, (int, str)) and not isinstance(value, bool):
+        try:
+            return float(value)
+        except ValueError:
+            ...
+
+    raise DeserializationError(name, float, value)
+
+
+def as_str(name: str, value: Any) -> str:
+    raise DeserializationError(name, str, value)
+
+
+def as_bool(name: str, value: Any) -> bool:
+    if type(value) is int and value in (0, 1):
+        return bool(value)
+
+    raise DeserializationError(name, bool, value)
+
+
+def as_list(name: str, value: Any) -> List[Any]:
+    raise DeserializationError(name, list, value)
+
+
+SCALARS: Dict[str, Tuple[Type[Any], Converter]] = {
+    'boolean': (bool, as_bool),
+    'string': (str, as_str),
+    'integer': (int, as_int),
+    'number': (float, as_float),
+}
@@ -0,0 +1,110 @@
+import asyncio
+import dataclasses
+import heapq
+import itertools
+import logging
+import random
+from typing import Any, Callable, Coroutine, List, Optional, Set, Tuple
+
+
+RetryJobHint = Callable[[], Coroutine[Any, Any, None]]
+ATTEMPT_HEADER = 'retry-attempt'
+
+
+@dataclasses.dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int
+    backoff: float
+    max_backoff: float
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        )
+
+
+class RetryScheduler:
+    def __init__(self, logger: logging.Logger = logging.getLogger(__name__)):
+        self._heap: List[
+            Tuple[float, int, RetryJobHint, Optional[RetryJobHint]]
+        ] = []
+        self._counter = itertools.count()
+        self._running: Set['asyncio.Task[None]'] = set()
+        self._task: Optional['asyncio.Task[None]'] = None
+        self._wakeup = asyncio.Event()
+        self._logger = logger
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    def schedule(
+        self,
+        delay: float,
+        job: RetryJobHint,
+        fallback: Optional[RetryJobHint] = None,
+    ) -> None:
+        due = asyncio.get_running_loop().time() + delay
+        heapq.heappush(self._heap, (due, next(self._counter), job, fallback))
+        self._wakeup.set()
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        if self._running:
+            await asyncio.wait(self._running)
+
+        pending = sorted(self._heap)
+        self._heap.clear()
+        dropped = 0
+
+        for *_, fallback in pending:
+            if fallback is None:
+                dropped += 1
+                continue
+
+            try:
+                await fallback()
+            except Exception:
+                self._logger.exception('retry fallback failed')
+
+        if dropped:
+            self._logger.warning(f'dropped pending retries={dropped}')
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            self._wakeup.clear()
+
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            timeout = self._heap[0][0] - loop.time()
+
+            if timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+                continue
+
+            _, _, job, _ = heapq.heappop(self._heap)
+            task = asyncio.create_task(job())
+            self._running.add(task)
+            task.add_done_callback(self._job_done)
+
+    def _job_done(self, task: 'asyncio.Task[None]') -> None:
+        self._running.discard(task)
+
+        if not task.cancelled() and task.exception() is not None:
+            self._logger.exception(
+                'retry failed', exc_info=task.exception()
+            )
@@ -1,11 +1,38 @@
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Type, get_type_hints
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Type,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
 
 
 DEFAULT_CONTENT_TYPE = 'application/json'
 ASYNCAPI_VERSION = '2.0.0'
 ASYNCAPI_PYTHON_VERSION = '2.1.0'
+CONCURRENCY_EXTENSION = 'x-concurrency'
+BATCH_SIZE_EXTENSION = 'x-batch-size'
+BATCH_LINGER_MS_EXTENSION = 'x-batch-linger-ms'
+ORDERING_KEY_EXTENSION = 'x-ordering-key'
+ORDERING_HEADER_EXTENSION = 'x-ordering-header'
+ORDERING_LANE_DEPTH_EXTENSION = 'x-ordering-lane-depth'
+EXECUTION_MODE_EXTENSION = 'x-execution-mode'
+RETRY_MAX_ATTEMPTS_EXTENSION = 'x-retry-max-attempts'
+RETRY_BACKOFF_MS_EXTENSION = 'x-retry-backoff-ms'
+RETRY_MAX_BACKOFF_MS_EXTENSION = 'x-retry-max-backoff-ms'
+DEAD_LETTER_CHANNEL_EXTENSION = 'x-dead-letter-channel'
+DEDUPLICATION_EXTENSION = 'x-deduplication'
+DEDUPLICATION_KEY_EXTENSION = 'x-deduplication-key'
+PAYLOAD_ENGINE_EXTENSION = 'x-payload-engine'
+PARTITION_KEY_EXTENSION = 'x-partition-key'
+CONTEXT_HEADERS_EXTENSION = 'x-context-headers'
+CONTEXT_KEY_EXTENSION = 'x-context-key'
 
 
 @dataclass
@@ -48,6 +75,18 @@ class AutoSpec(Specification):
         message_name: str = '',
         message_title: str = '',
         message_summary: str = '',
+        batch_size: Optional[int] = None,
+        linger_ms: Optional[int] = None,
+        ordering_key: Optional[str] = None,
+        execution_mode: Optional[str] = None,
+        retry_max_attempts: Optional[int] = None,
+        dead_letter_channel: Optional[str] = None,
+        deduplicate: bool = False,
+        deduplication_key: Optional[str] = None,
+        content_type: Optional[str] = None,
+        partition_key: Optional[str] = None,
+        context_headers: bool = False,
+        context_key: bool = False,
     ) -> Callable[..., Callable[..., Any]]:
         if not message_name:
             message_name = channel_name
@@ -60,18 +99,63 @@ class AutoSpec(Specification):
 
         def decorator(subscbriber: Callable[..., Any]) -> Callable[..., Any]:
             message_type = get_type_hints(subscbriber).get('message')
+            extensions: Dict[str, Any] = {}
+
+            if get_origin(message_type) is list:
+                message_type = get_args(message_type)[0]
+
+            if batch_size is not None:
+                extensions[BATCH_SIZE_EXTENSION] = batch_size
+
+            if linger_ms is not None:
+                extensions[BATCH_LINGER_MS_EXTENSION] = linger_ms
+
+            if ordering_key is not None:
+                extensions[ORDERING_KEY_EXTENSION] = ordering_key
+
+            if execution_mode is not None:
+                extensions[EXECUTION_MODE_EXTENSION] = execution_mode
+
+            if retry_max_attempts is not None:
+                extensions[RETRY_MAX_ATTEMPTS_EXTENSION] = retry_max_attempts
+
+            if dead_letter_channel is not None:
+                extensions[DEAD_LETTER_CHANNEL_EXTENSION] = dead_letter_channel
+
+            if deduplicate:
+                extensions[DEDUPLICATION_EXTENSION] = True
+
+            if deduplication_key is not None:
+                extensions[DEDUPLICATION_KEY_EXTENSION] = deduplication_key
+
+            if context_headers:
+                extensions[CONTEXT_HEADERS_EXTENSION] = True
+
+            if context_key:
+                extensions[CONTEXT_KEY_EXTENSION] = True
+
             message = Message(
                 name=message_name,
                 title=message_title,
                 summary=message_summary,
                 payload=message_type,
+                content_type=content_type,
             )
             self.channels[channel_name] = subscbriber.__channel__ = Channel(  # type: ignore
                 description=channel_description,
                 subscribe=Operation(
-                    operation_id=subscbriber.__name__, message=message,
+                    operation_id=subscbriber.__name__,
+                    message=message,
+                    extensions=extensions or None,
+                ),
+                publish=Operation(
+                    message=message,
+                    extensions=(
+                        {PARTITION_KEY_EXTENSION: partition_key}
+                        if partition_key is not None
+                        else None
+                    ),
                 ),
-                publish=Operation(message=message),
                 name=channel_name,
             )
             if self.components and self.components.messages:
@@ -216,6 +300,7 @@ class Operation:
     bindings: Optional[Dict[ProtocolType, Any]] = None
     traits: Optional[List[OperationTrait]] = None
     message: Optional[Message] = None
+    extensions: Optional[Dict[str, Any]] = None
 
 
 @dataclass
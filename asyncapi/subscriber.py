@@ -32,6 +32,12 @@ def main(
     republish_errors_channels: Optional[str] = typer.Option(
         None, envvar='ASYNCAPI_REPUBLISH_ERRORS_CHANNELS'
     ),
+    channels_concurrency: Optional[str] = typer.Option(
+        None, envvar='ASYNCAPI_CHANNELS_CONCURRENCY'
+    ),
+    payload_engine: Optional[str] = typer.Option(
+        None, envvar='ASYNCAPI_PAYLOAD_ENGINE'
+    ),
 ) -> None:
 
     if url is None:
@@ -45,6 +51,8 @@ def main(
             republish_errors=republish_errors,
             channels_subscribes=channels_subscribes,
             republish_errors_channels=republish_errors_channels,
+            channels_concurrency=channels_concurrency,
+            payload_engine=payload_engine,
         )
 
     else:
@@ -56,6 +64,8 @@ def main(
             republish_errors=republish_errors,
             channels_subscribes=channels_subscribes,
             republish_errors_channels=republish_errors_channels,
+            channels_concurrency=channels_concurrency,
+            payload_engine=payload_engine,
         )
 
     fork_app(workers)
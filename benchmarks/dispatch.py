@@ -0,0 +1,71 @@
+"""
+Per-message overhead of the spec lookups path against the
+precompiled channel dispatchers.
+
+Usage: PYTHONPATH=. python benchmarks/dispatch.py
+"""
+import timeit
+from dataclasses import dataclass
+
+import orjson
+
+from asyncapi import AsyncApi, AutoSpec, EventsHandler
+
+
+NUMBER = 100_000
+
+spec = AutoSpec('Benchmark API', development='kafka://localhost:9092')
+
+
+@dataclass
+class UserUpdate:
+    id: str
+    name: str
+    age: int
+
+
+@spec.subscribe(channel_name='user/update')
+async def receive_user_update(message: UserUpdate) -> None:
+    ...
+
+
+def main() -> None:
+    api = AsyncApi(
+        spec,
+        {('user/update', 'receive_user_update'): receive_user_update},
+        EventsHandler('kafka://localhost:9092'),
+    )
+    dispatcher = api.build_dispatcher('user/update')
+    raw = orjson.dumps({'id': 'fake-user', 'name': 'Fake User', 'age': 33})
+    payload = UserUpdate('fake-user', 'Fake User', 33)
+
+    def lookup_decode() -> None:
+        operation_id = api.subscribe_operation('user/update').operation_id
+        operation = api.operations[
+            ('user/update', operation_id)  # type: ignore
+        ]
+        operation(
+            api.subscriber_payload('user/update', **orjson.loads(raw))
+        ).close()
+
+    def dispatch_decode() -> None:
+        dispatcher.operation(dispatcher.decoder(raw)).close()  # type: ignore
+
+    def lookup_encode() -> None:
+        api.parse_message('user/update', payload)
+
+    def dispatch_encode() -> None:
+        dispatcher.encoder(payload)  # type: ignore
+
+    for name, func in (
+        ('subscribe lookups', lookup_decode),
+        ('subscribe dispatcher', dispatch_decode),
+        ('publish lookups', lookup_encode),
+        ('publish dispatcher', dispatch_encode),
+    ):
+        seconds = min(timeit.repeat(func, number=NUMBER, repeat=3))
+        print(f'{name:<24}{seconds / NUMBER * 1e9:>10.0f} ns/message')
+
+
+if __name__ == '__main__':
+    main()
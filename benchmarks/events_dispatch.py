@@ -0,0 +1,78 @@
+"""
+Consume throughput of the subscriber queues path against the direct
+dispatch of the events handler to the channel dispatchers.
+
+Usage: PYTHONPATH=. python benchmarks/events_dispatch.py
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict
+
+import orjson
+
+from asyncapi import AsyncApi, AutoSpec, EventsHandler
+
+
+NUMBER = 100_000
+CHANNEL = 'user/update'
+
+spec = AutoSpec('Benchmark API', development='kafka://localhost:9092')
+received = 0
+done: asyncio.Event
+
+
+@dataclass
+class UserUpdate:
+    id: str
+    name: str
+    age: int
+
+
+@spec.subscribe(channel_name=CHANNEL)
+async def receive_user_update(message: UserUpdate) -> None:
+    global received
+    received += 1
+
+    if received == NUMBER:
+        done.set()
+
+
+async def consume(bindings: Dict[str, str]) -> float:
+    global received, done
+    received = 0
+    done = asyncio.Event()
+    api = AsyncApi(
+        spec,
+        {(CHANNEL, 'receive_user_update'): receive_user_update},
+        EventsHandler('memory://', bindings),
+    )
+    message = orjson.dumps({'id': 'fake-user', 'name': 'Fake User', 'age': 33})
+    await api.connect()
+    listen = asyncio.create_task(api.listen(CHANNEL))
+    await asyncio.sleep(0.01)
+
+    start = time.perf_counter()
+
+    for _ in range(NUMBER):
+        await api.events_handler.publish(CHANNEL, message)
+
+    await done.wait()
+    elapsed = time.perf_counter() - start
+
+    listen.cancel()
+    await api.disconnect()
+    return elapsed
+
+
+async def main() -> None:
+    for name, bindings in (
+        ('subscriber queues', {}),
+        ('direct dispatch', {'subscriber_direct_dispatch': 'true'}),
+    ):
+        elapsed = await consume(bindings)
+        print(f'{name:>18}: {NUMBER / elapsed:,.0f} msgs/s')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+"""
+Publish throughput of sequential awaited publishes against pipelined
+publishes bounded by the in-flight window.
+
+Requires the Pub/Sub emulator (docker-compose up pubsub pubsub-init).
+
+Usage: PYTHONPATH=. python benchmarks/gcloud_pubsub_publish.py
+"""
+import asyncio
+import os
+import time
+
+from asyncapi.events.backends.gcloud_pubsub import GCloudPubSubBackend
+
+
+os.environ.setdefault('PUBSUB_EMULATOR_HOST', 'localhost:8086')
+
+URL = 'gcloud-pubsub://asyncapi-local'
+CHANNEL = 'chatroom'
+NUMBER = 2_000
+MAX_INFLIGHT = 100
+
+
+async def sequential(backend: GCloudPubSubBackend) -> None:
+    for _ in range(NUMBER):
+        await backend.publish(CHANNEL, b'hello')
+
+
+async def pipelined(backend: GCloudPubSubBackend) -> None:
+    await asyncio.gather(
+        *(backend.publish(CHANNEL, b'hello') for _ in range(NUMBER))
+    )
+
+
+async def main() -> None:
+    backend = GCloudPubSubBackend(
+        URL, bindings={'publish_max_inflight': str(MAX_INFLIGHT)}
+    )
+    await backend.connect()
+
+    try:
+        for benchmark in (sequential, pipelined):
+            start = time.perf_counter()
+            await benchmark(backend)
+            elapsed = time.perf_counter() - start
+            print(
+                f'{benchmark.__name__:>10}: {NUMBER / elapsed:,.0f} msgs/s'
+            )
+    finally:
+        await backend.disconnect()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,64 @@
+"""
+Per-message decode cost of the jsondaora payload dataclasses against the
+schema-compiled payload engine.
+
+Usage: PYTHONPATH=. python benchmarks/payloads.py
+"""
+import timeit
+
+import orjson
+from jsondaora import asdataclass, jsonschema_asdataclass
+
+from asyncapi.payloads import compiled_asdataclass
+
+
+NUMBER = 100_000
+
+schema = {
+    'type': 'object',
+    'properties': {
+        'id': {'type': 'string'},
+        'name': {'type': 'string'},
+        'age': {'type': 'integer'},
+        'scores': {'type': 'array', 'items': {'type': 'number'}},
+        'address': {
+            'type': 'object',
+            'properties': {
+                'street': {'type': 'string'},
+                'number': {'type': 'integer'},
+            },
+        },
+    },
+    'required': ['id', 'name'],
+}
+
+
+def main() -> None:
+    jsondaora_type = jsonschema_asdataclass('UserUpdate', schema)
+    compiled_type = compiled_asdataclass('UserUpdate', schema)
+    raw = orjson.dumps(
+        {
+            'id': 'fake-user',
+            'name': 'Fake User',
+            'age': 33,
+            'scores': [1.0, 2.5, 3.0],
+            'address': {'street': 'Fake Street', 'number': 10},
+        }
+    )
+
+    def jsondaora_decode() -> None:
+        asdataclass(orjson.loads(raw), jsondaora_type)
+
+    def compiled_decode() -> None:
+        compiled_type.__decode__(orjson.loads(raw))  # type: ignore
+
+    for name, func in (
+        ('jsondaora asdataclass', jsondaora_decode),
+        ('compiled decoder', compiled_decode),
+    ):
+        seconds = min(timeit.repeat(func, number=NUMBER, repeat=3))
+        print(f'{name:<24}{seconds / NUMBER * 1e9:>10.0f} ns/message')
+
+
+if __name__ == '__main__':
+    main()
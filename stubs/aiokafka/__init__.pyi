@@ -0,0 +1,24 @@
+from typing import Any, Set
+
+from broadcaster._backends.kafka import Consumer, Producer
+from broadcaster._backends.kafka import ConsumerRecord as ConsumerRecord
+from broadcaster._backends.kafka import TopicPartition as TopicPartition
+
+
+class AIOKafkaProducer(Producer):
+    def __init__(self, **configs: Any) -> None: ...
+
+
+class AIOKafkaConsumer(Consumer):
+    def __init__(self, *topics: str, **configs: Any) -> None: ...
+
+
+class ConsumerRebalanceListener:
+    async def on_partitions_revoked(
+        self, revoked: Set[TopicPartition]
+    ) -> None: ...
+
+    async def on_partitions_assigned(
+        self, assigned: Set[TopicPartition]
+    ) -> None: ...
+
@@ -1,4 +1,7 @@
-from typing import Any, Dict, AsyncGenerator, AsyncContextManager
+import asyncio
+from typing import Any, Dict, AsyncContextManager
+
+from ._base import Subscriber
 
 
 class Event:
@@ -10,14 +13,13 @@ class Event:
 
 class Broadcast:
     _subscribers: Dict[str, Any]
+    _listener_task: 'asyncio.Task[None]'
 
     def __init__(self, url: str): ...
 
-    async def publish(self, channel: str, message: str) -> None: ...
+    async def publish(self, channel: str, message: Any) -> None: ...
 
-    def subscribe(
-        self, channel: str
-    ) -> AsyncContextManager[AsyncGenerator[Event, None]]: ...
+    def subscribe(self, channel: str) -> AsyncContextManager[Subscriber]: ...
 
     async def connect(self) -> None: ...
 
@@ -1,5 +1,17 @@
+from typing import Any
+
 from .. import Event
 
 
 class BroadcastBackend:
+    async def connect(self) -> None: ...
+
+    async def disconnect(self) -> None: ...
+
+    async def subscribe(self, channel: str) -> None: ...
+
+    async def unsubscribe(self, channel: str) -> None: ...
+
+    async def publish(self, channel: str, message: Any) -> None: ...
+
     async def next_published(self) -> Event: ...
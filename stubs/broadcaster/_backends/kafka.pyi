@@ -1,3 +1,6 @@
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
 from .base import BroadcastBackend
 
 
@@ -5,20 +8,84 @@ class Client:
     async def close(self) -> None: ...
 
 
+class TopicPartition:
+    topic: str
+    partition: int
+
+    def __init__(self, topic: str, partition: int) -> None: ...
+
+
+class ConsumerRecord:
+    topic: str
+    partition: int
+    offset: int
+    key: Optional[bytes]
+    value: bytes
+    headers: Optional[Sequence[Tuple[str, bytes]]]
+
+
 class Consumer:
     _client: Client
 
+    async def start(self) -> None: ...
+
     def unsubscribe(self) -> None: ...
 
     async def stop(self) -> None: ...
 
+    async def getone(self) -> ConsumerRecord: ...
+
+    async def getmany(
+        self,
+        *partitions: TopicPartition,
+        timeout_ms: int = ...,
+        max_records: Optional[int] = ...,
+    ) -> Dict[TopicPartition, List[ConsumerRecord]]: ...
+
+    def subscribe(
+        self, topics: Iterable[str] = ..., listener: Any = ...
+    ) -> None: ...
+
+    async def commit(
+        self, offsets: Optional[Dict[TopicPartition, int]] = ...
+    ) -> None: ...
+
+    def assignment(self) -> Set[TopicPartition]: ...
+
+    def paused(self) -> Set[TopicPartition]: ...
+
+    def pause(self, *partitions: TopicPartition) -> None: ...
+
+    def resume(self, *partitions: TopicPartition) -> None: ...
+
 
 class Producer:
+    async def start(self) -> None: ...
+
     async def stop(self) -> None: ...
 
+    async def send_and_wait(
+        self,
+        topic: str,
+        value: bytes,
+        key: Optional[bytes] = ...,
+        headers: Optional[Sequence[Tuple[str, bytes]]] = ...,
+    ) -> Any: ...
+
+    async def send(
+        self,
+        topic: str,
+        value: bytes,
+        key: Optional[bytes] = ...,
+        headers: Optional[Sequence[Tuple[str, bytes]]] = ...,
+    ) -> 'asyncio.Future[Any]': ...
+
+    async def flush(self) -> None: ...
+
 
 class KafkaBackend(BroadcastBackend):
     _consumer: Consumer
-    _producer: Consumer
+    _consumer_channels: Set[str]
+    _producer: Producer
 
     def __init__(self, url: str): ...
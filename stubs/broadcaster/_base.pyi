@@ -0,0 +1,17 @@
+import asyncio
+from typing import Any, AsyncGenerator
+
+from . import Event
+
+
+class Unsubscribed(Exception): ...
+
+
+class Subscriber:
+    _queue: asyncio.Queue[Any]
+
+    def __init__(self, queue: asyncio.Queue[Any]): ...
+
+    def __aiter__(self) -> AsyncGenerator[Event, None]: ...
+
+    async def get(self) -> Event: ...
@@ -1,13 +1,29 @@
-from typing import List, Any
+from typing import Callable, List, Any
 from concurrent.futures import Future
 
-from .types import PullResponse
+from .subscriber.futures import StreamingPullFuture
+from .subscriber.message import Message
+from .types import BatchSettings, FlowControl, PublisherOptions, PullResponse
 
 
 class PublisherClient:
+    def __init__(
+        self,
+        batch_settings: BatchSettings = ...,
+        publisher_options: PublisherOptions = ...,
+    ) -> None: ...
+
     def topic_path(self, project: str, topic: str) -> str: ...
 
-    def publish(self, topic: str, message: bytes) -> Future[Any]: ...
+    def publish(
+        self,
+        topic: str,
+        message: bytes,
+        ordering_key: str = ...,
+        **attrs: str,
+    ) -> Future[Any]: ...
+
+    def resume_publish(self, topic: str, ordering_key: str) -> None: ...
 
     def stop(self) -> None: ...
 
@@ -21,4 +37,15 @@ class SubscriberClient:
 
     def acknowledge(self, subscription: str, ids: List[str]) -> None: ...
 
+    def modify_ack_deadline(
+        self, subscription: str, ack_ids: List[str], ack_deadline_seconds: int
+    ) -> None: ...
+
+    def subscribe(
+        self,
+        subscription: str,
+        callback: Callable[[Message], Any],
+        flow_control: FlowControl = ...,
+    ) -> StreamingPullFuture: ...
+
     def close(self) -> None: ...
@@ -0,0 +1,6 @@
+from concurrent.futures import Future
+from typing import Any
+
+
+class StreamingPullFuture(Future[Any]):
+    ...
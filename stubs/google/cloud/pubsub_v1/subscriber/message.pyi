@@ -0,0 +1,16 @@
+from typing import Dict
+
+
+class Message:
+    ack_id: str
+    data: bytes
+    attributes: Dict[str, str]
+    message_id: str
+    ordering_key: str
+    size: int
+
+    def ack(self) -> None: ...
+
+    def nack(self) -> None: ...
+
+    def modify_ack_deadline(self, seconds: int) -> None: ...
@@ -1,8 +1,42 @@
-from typing import List
+import enum
+from typing import Dict, List, NamedTuple
+
+
+class BatchSettings(NamedTuple):
+    max_bytes: int = ...
+    max_latency: float = ...
+    max_messages: int = ...
+
+
+class FlowControl(NamedTuple):
+    max_bytes: int = ...
+    max_messages: int = ...
+    max_lease_duration: int = ...
+    max_duration_per_lease_extension: int = ...
+
+
+class LimitExceededBehavior(str, enum.Enum):
+    IGNORE = 'ignore'
+    BLOCK = 'block'
+    ERROR = 'error'
+
+
+class PublishFlowControl(NamedTuple):
+    message_limit: int = ...
+    byte_limit: int = ...
+    limit_exceeded_behavior: LimitExceededBehavior = ...
+
+
+class PublisherOptions(NamedTuple):
+    enable_message_ordering: bool = ...
+    flow_control: PublishFlowControl = ...
 
 
 class PubsubMessage:
     data: bytes
+    attributes: Dict[str, str]
+    message_id: str
+    ordering_key: str
 
 
 class ReceivedMessage:
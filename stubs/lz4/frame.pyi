@@ -0,0 +1,8 @@
+def compress(data: bytes) -> bytes: ...
+
+
+def decompress(data: bytes) -> bytes: ...
+
+
+class LZ4FrameDecompressor:
+    def decompress(self, data: bytes, max_length: int = ...) -> bytes: ...